@@ -2,14 +2,20 @@
 from __future__ import annotations
 
 import io
+import mmap
 import os
 import struct
+import sys
+import threading
+from array import array
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, BinaryIO
+from collections import OrderedDict
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple
 
 from pykotor.common.geometry import Vector2, Vector3, Vector4
 from pykotor.common.language import LocalizedString
 from pykotor.tools.encoding import decode_bytes_with_fallbacks
+from pykotor.tools.path import CaseAwarePath
 from utility.path import Path
 
 if TYPE_CHECKING:
@@ -32,6 +38,59 @@ def _endian_char(
     return ">" if big else "<"
 
 
+def _compile_struct(
+    fmt: str,
+) -> tuple[struct.Struct, struct.Struct]:
+    """Returns the compiled little endian and big endian structs for the format, indexable by the 'big' flag."""
+    return struct.Struct(f"<{fmt}"), struct.Struct(f">{fmt}")
+
+
+_UINT8 = _compile_struct("B")
+_INT8 = _compile_struct("b")
+_UINT16 = _compile_struct("H")
+_INT16 = _compile_struct("h")
+_UINT32 = _compile_struct("I")
+_INT32 = _compile_struct("i")
+_UINT64 = _compile_struct("Q")
+_INT64 = _compile_struct("q")
+_SINGLE = _compile_struct("f")
+_DOUBLE = _compile_struct("d")
+_VECTOR2 = _compile_struct("2f")
+_VECTOR3 = _compile_struct("3f")
+_VECTOR4 = _compile_struct("4f")
+
+_STRUCT_CACHE: dict[tuple[str, bool], struct.Struct] = {}
+
+
+def _get_struct(
+    fmt: str | struct.Struct,
+    big: bool,
+) -> struct.Struct:
+    """Returns a cached compiled struct for the format.
+
+    If the format does not start with a byte order character, little endian or big endian is used depending on 'big'.
+    """
+    if isinstance(fmt, struct.Struct):
+        return fmt
+    compiled: struct.Struct | None = _STRUCT_CACHE.get((fmt, big))
+    if compiled is None:
+        compiled = struct.Struct(fmt if fmt[:1] in "<>!=@" else f"{_endian_char(big)}{fmt}")
+        _STRUCT_CACHE[(fmt, big)] = compiled
+    return compiled
+
+
+def _to_array(
+    typecode: str,
+    data: bytes | memoryview,
+    big: bool,
+) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if big != (sys.byteorder == "big"):
+        values.byteswap()
+    return values
+
+
 class ArrayHead:
     def __init__(
         self,
@@ -42,6 +101,242 @@ class ArrayHead:
         self.offset: int = array_offset
 
 
+class MemoryViewStream(io.RawIOBase):
+    """A read-only, seekable stream over a bytes-like object that does not copy the underlying buffer.
+
+    Unlike io.BytesIO, wrapping a memoryview or mmap does not copy the data; only the bytes returned by read() are.
+    """
+
+    def __init__(
+        self,
+        data: bytes | bytearray | memoryview | mmap.mmap,
+    ):
+        super().__init__()
+        self._view: memoryview = memoryview(data).cast("B")
+        self._position: int = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(
+        self,
+        offset: int,
+        whence: int = io.SEEK_SET,
+    ) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            msg = f"Invalid whence value: {whence}"
+            raise ValueError(msg)
+        if position < 0:
+            msg = f"Negative seek position {position}"
+            raise ValueError(msg)
+        self._position = position
+        return position
+
+    def read(
+        self,
+        size: int | None = -1,
+    ) -> bytes:
+        start: int = min(self._position, len(self._view))
+        end: int = len(self._view) if size is None or size < 0 else min(start + size, len(self._view))
+        self._position = end
+        return self._view[start:end].tobytes()
+
+    def readinto(
+        self,
+        buffer,
+    ) -> int:
+        data: bytes = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def getbuffer(self) -> memoryview:
+        return self._view
+
+    def close(self) -> None:
+        try:
+            self._view.release()
+        except BufferError:
+            pass  # a caller still holds a buffer exported from the view, it is released with the last reference.
+        super().close()
+
+
+class _MappedFile(NamedTuple):
+    mapping: mmap.mmap
+    size: int
+    mtime_ns: int
+
+
+class MappedFilePool:
+    """Pool of read-only memory maps of files, shared per file path, with least-recently-used eviction.
+
+    Views returned by the pool reference the mapped region directly, so reading many resources from the same BIF or
+    capsule does not require opening, seeking and reading the file for every resource. Each call checks the size and
+    modification time of the file with a single stat() and remaps it if it has changed.
+
+    Only view() maps files; read() copies the region straight from the file, so code that just needs the bytes never
+    keeps a map, and with it an open handle on Windows, that would stop the file from being deleted or replaced.
+
+    A map whose memoryviews are still in use cannot be closed. It is dropped from the pool and closed once the last of
+    its views is released. Until then the file must not be truncated, deleted or written in place, so code doing that
+    calls release() first, which reports whether every map of the file was closed, see BinaryWriter.to_file() and
+    write_capsule().
+    """
+
+    def __init__(
+        self,
+        max_open: int = 32,
+    ):
+        self.max_open: int = max_open
+        self._maps: OrderedDict[str, _MappedFile] = OrderedDict()
+        self._retired: dict[str, list[mmap.mmap]] = {}  # maps dropped while views of them were still in use
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._maps)
+
+    @staticmethod
+    def _key(path: os.PathLike | str) -> str:
+        return os.path.normcase(os.path.abspath(os.fspath(path)))  # noqa: PTH100
+
+    def view(
+        self,
+        path: os.PathLike | str,
+        offset: int = 0,
+        size: int | None = None,
+    ) -> memoryview:
+        """Returns a read-only memoryview of the specified region of the file.
+
+        Args:
+        ----
+            path: The path of the file.
+            offset: The offset into the file.
+            size: The number of bytes, if None the view extends to the end of the file.
+
+        Returns:
+        -------
+            A memoryview of the mapped region.
+        """
+        key: str = self._key(path)
+        stat_result: os.stat_result = os.stat(key)  # noqa: PTH116
+        file_size: int = stat_result.st_size
+        size = self._region_size(path, file_size, offset, size)
+        if size == 0:
+            return memoryview(b"")
+
+        with self._lock:
+            mapped: _MappedFile | None = self._maps.get(key)
+            if mapped is None or mapped.size != file_size or mapped.mtime_ns != stat_result.st_mtime_ns:
+                if mapped is not None:
+                    self._close(key, self._maps.pop(key).mapping)
+                with open(key, "rb") as file:  # noqa: PTH123
+                    mapped = _MappedFile(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ), file_size, stat_result.st_mtime_ns)
+                self._maps[key] = mapped
+                while len(self._maps) > self.max_open:
+                    evicted_key, evicted = self._maps.popitem(last=False)
+                    self._close(evicted_key, evicted.mapping)
+            else:
+                self._maps.move_to_end(key)
+            if self._retired:
+                self._close_retired()
+            return memoryview(mapped.mapping)[offset : offset + size]
+
+    def read(
+        self,
+        path: os.PathLike | str,
+        offset: int = 0,
+        size: int | None = None,
+    ) -> bytes:
+        """Returns a copy of the specified region of the file.
+
+        The region is read from the file directly rather than through a map, so the file can be deleted or replaced as
+        soon as this returns.
+        """
+        with open(self._key(path), "rb") as file:  # noqa: PTH123
+            size = self._region_size(path, os.fstat(file.fileno()).st_size, offset, size)
+            file.seek(offset)
+            return file.read(size)
+
+    @staticmethod
+    def _region_size(
+        path: os.PathLike | str,
+        file_size: int,
+        offset: int,
+        size: int | None,
+    ) -> int:
+        size = file_size - offset if size is None else size
+        if offset < 0 or size < 0 or offset + size > file_size:
+            msg = f"Region {offset}:{offset + size} exceeds the size of '{path}' ({file_size} bytes)."
+            raise OSError(msg)
+        return size
+
+    def release(
+        self,
+        path: os.PathLike | str | None = None,
+    ) -> bool:
+        """Drops the map of the specified file, or every map if no path is given.
+
+        Maps with views still in use are closed once the last of their views is released. Until then the file must not be
+        truncated or written in place, though replacing it with os.replace() is safe on POSIX systems, where the views
+        keep reading the old file.
+
+        Args:
+        ----
+            path: The path of the file.
+
+        Returns:
+        -------
+            True if every map of the file, including maps dropped earlier, is closed.
+        """
+        with self._lock:
+            keys: list[str] = list(self._maps.keys() | self._retired.keys()) if path is None else [self._key(path)]
+            for key in keys:
+                mapped: _MappedFile | None = self._maps.pop(key, None)
+                if mapped is not None:
+                    self._close(key, mapped.mapping)
+            self._close_retired()
+            return not any(key in self._retired for key in keys)
+
+    def _close(
+        self,
+        key: str,
+        mapping: mmap.mmap,
+    ) -> None:
+        try:
+            mapping.close()
+        except BufferError:
+            self._retired.setdefault(key, []).append(mapping)
+
+    def _close_retired(self) -> None:
+        """Closes the dropped maps whose views have all been released since."""
+        for key, mappings in list(self._retired.items()):
+            still_exported: list[mmap.mmap] = []
+            for mapping in mappings:
+                try:
+                    mapping.close()
+                except BufferError:
+                    still_exported.append(mapping)
+            if still_exported:
+                self._retired[key] = still_exported
+            else:
+                del self._retired[key]
+
+
+MAPPED_FILES = MappedFilePool()
+"""Process-wide pool of memory-mapped files, used by FileResource.view() and BinaryReader.from_mapped_file()."""
+
+
 class BinaryReader:
     """Used for easy reading of binary files."""
 
@@ -101,15 +396,41 @@ class BinaryReader:
         stream = resolved_path.open("rb")
         return BinaryReader(stream, offset, size)
 
+    @classmethod
+    def from_mapped_file(
+        cls,
+        path: os.PathLike | str,
+        offset: int = 0,
+        size: int | None = None,
+    ) -> BinaryReader:
+        """Returns a new BinaryReader over a memory-mapped region of the specified file.
+
+        The file is mapped through the shared MAPPED_FILES pool, so no data is copied until it is read.
+
+        Args:
+        ----
+            path: str or pathlike object of the file to open.
+            offset: The offset into the file of the region to read.
+            size: The size of the region. If not specified, extends to the end of the file.
+
+        Returns:
+        -------
+            A new BinaryReader instance.
+        """
+        return BinaryBufferReader(MAPPED_FILES.view(path, offset, size))
+
     @classmethod
     def from_bytes(
         cls,
-        data: bytes,
+        data: bytes | bytearray | memoryview | mmap.mmap,
         offset: int = 0,
         size: int | None = None,
     ) -> BinaryReader:
         """Returns a new BinaryReader with a stream established to the bytes stored in memory.
 
+        Values are unpacked directly from the buffer, see BinaryBufferReader. Bytes, memoryviews and mmaps are read in
+        place without copying the underlying buffer.
+
         Args:
         ----
             data: The bytes of data.
@@ -120,8 +441,7 @@ class BinaryReader:
         -------
             A new BinaryReader instance.
         """
-        stream = io.BytesIO(data)
-        return BinaryReader(stream, offset, size)
+        return BinaryBufferReader(data, offset, size)
 
     @classmethod
     def from_auto(
@@ -132,8 +452,10 @@ class BinaryReader:
     ):
         if isinstance(source, (os.PathLike, str)):  # is path
             reader = BinaryReader.from_file(source, offset, size)
-        elif isinstance(source, (bytes, bytearray)):  # is binary data
+        elif isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):  # is binary data
             reader = BinaryReader.from_bytes(source, offset, size)
+        elif isinstance(source, BinaryBufferReader):
+            reader = BinaryBufferReader(source._view, source._offset, source._size)
         elif isinstance(source, BinaryReader):
             reader = BinaryReader(source._stream, source._offset, source._size)
         else:
@@ -310,7 +632,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(1)
-        return struct.unpack(f"{_endian_char(big)}B", self._stream.read(1))[0]
+        return _UINT8[big].unpack(self._stream.read(1))[0]
 
     def read_int8(
         self,
@@ -328,7 +650,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(1)
-        return struct.unpack(f"{_endian_char(big)}b", self._stream.read(1))[0]
+        return _INT8[big].unpack(self._stream.read(1))[0]
 
     def read_uint16(
         self,
@@ -346,7 +668,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(2)
-        return struct.unpack(f"{_endian_char(big)}H", self._stream.read(2))[0]
+        return _UINT16[big].unpack(self._stream.read(2))[0]
 
     def read_int16(
         self,
@@ -364,7 +686,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(2)
-        return struct.unpack(f"{_endian_char(big)}h", self._stream.read(2))[0]
+        return _INT16[big].unpack(self._stream.read(2))[0]
 
     def read_uint32(
         self,
@@ -387,7 +709,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(4)
-        unpacked = struct.unpack(f"{_endian_char(big)}I", self._stream.read(4))[0]
+        unpacked = _UINT32[big].unpack(self._stream.read(4))[0]
 
         if unpacked == 0xFFFFFFFF and max_neg1:
             unpacked = -1
@@ -410,7 +732,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(4)
-        return struct.unpack(f"{_endian_char(big)}i", self._stream.read(4))[0]
+        return _INT32[big].unpack(self._stream.read(4))[0]
 
     def read_uint64(
         self,
@@ -428,7 +750,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(8)
-        return struct.unpack(f"{_endian_char(big)}Q", self._stream.read(8))[0]
+        return _UINT64[big].unpack(self._stream.read(8))[0]
 
     def read_int64(
         self,
@@ -446,7 +768,7 @@ class BinaryReader:
             An integer from the stream.
         """
         self.exceed_check(8)
-        return struct.unpack(f"{_endian_char(big)}q", self._stream.read(8))[0]
+        return _INT64[big].unpack(self._stream.read(8))[0]
 
     def read_single(
         self,
@@ -464,7 +786,7 @@ class BinaryReader:
             An float from the stream.
         """
         self.exceed_check(4)
-        return struct.unpack(f"{_endian_char(big)}f", self._stream.read(4))[0]
+        return _SINGLE[big].unpack(self._stream.read(4))[0]
 
     def read_double(
         self,
@@ -482,7 +804,7 @@ class BinaryReader:
             An float from the stream.
         """
         self.exceed_check(8)
-        return struct.unpack(f"{_endian_char(big)}d", self._stream.read(8))[0]
+        return _DOUBLE[big].unpack(self._stream.read(8))[0]
 
     def read_vector2(
         self,
@@ -500,8 +822,7 @@ class BinaryReader:
             A new Vector2 instance using floats read from the stream.
         """
         self.exceed_check(8)
-        x, y = self.read_single(big=big), self.read_single(big=big)
-        return Vector2(x, y)
+        return Vector2(*_VECTOR2[big].unpack(self._stream.read(8)))
 
     def read_vector3(
         self,
@@ -519,12 +840,7 @@ class BinaryReader:
             A new Vector3 instance using floats read from the stream.
         """
         self.exceed_check(12)
-        x, y, z = (
-            self.read_single(big=big),
-            self.read_single(big=big),
-            self.read_single(big=big),
-        )
-        return Vector3(x, y, z)
+        return Vector3(*_VECTOR3[big].unpack(self._stream.read(12)))
 
     def read_vector4(
         self,
@@ -542,13 +858,105 @@ class BinaryReader:
             A new Vector4 instance using floats read from the stream.
         """
         self.exceed_check(16)
-        x, y, z, w = (
-            self.read_single(big=big),
-            self.read_single(big=big),
-            self.read_single(big=big),
-            self.read_single(big=big),
-        )
-        return Vector4(x, y, z, w)
+        return Vector4(*_VECTOR4[big].unpack(self._stream.read(16)))
+
+    def read_struct(
+        self,
+        fmt: str | struct.Struct,
+        *,
+        big: bool = False,
+    ) -> tuple:
+        """Reads and unpacks several values at once, using a compiled struct that is cached per format.
+
+        Args:
+        ----
+            fmt: A struct format string (eg. "IIf") or a compiled struct. Unless the format starts with a byte order
+                character, the values are read as little endian or as big endian if 'big' is set.
+            big: Read the values as big endian.
+
+        Returns:
+        -------
+            A tuple of the unpacked values.
+        """
+        compiled: struct.Struct = _get_struct(fmt, big)
+        return compiled.unpack(self.read_bytes(compiled.size))
+
+    def read_struct_array(
+        self,
+        fmt: str | struct.Struct,
+        count: int,
+        *,
+        big: bool = False,
+    ) -> list[tuple]:
+        """Reads a table of count consecutive records with the same struct format.
+
+        Args:
+        ----
+            fmt: A struct format string or a compiled struct describing one record.
+            count: The number of records.
+            big: Read the values as big endian.
+
+        Returns:
+        -------
+            A list of tuples, one per record.
+        """
+        compiled: struct.Struct = _get_struct(fmt, big)
+        return list(compiled.iter_unpack(self.read_bytes(compiled.size * count)))
+
+    def read_uint16_array(
+        self,
+        count: int,
+        *,
+        big: bool = False,
+    ) -> array:
+        """Reads count unsigned 16-bit integers from the stream into an array."""
+        return _to_array("H", self.read_bytes(2 * count), big)
+
+    def read_uint32_array(
+        self,
+        count: int,
+        *,
+        big: bool = False,
+    ) -> array:
+        """Reads count unsigned 32-bit integers from the stream into an array."""
+        return _to_array("I", self.read_bytes(4 * count), big)
+
+    def read_int32_array(
+        self,
+        count: int,
+        *,
+        big: bool = False,
+    ) -> array:
+        """Reads count signed 32-bit integers from the stream into an array."""
+        return _to_array("i", self.read_bytes(4 * count), big)
+
+    def read_single_array(
+        self,
+        count: int,
+        *,
+        big: bool = False,
+    ) -> array:
+        """Reads count 32-bit floating point numbers from the stream into an array."""
+        return _to_array("f", self.read_bytes(4 * count), big)
+
+    def read_vector3_array(
+        self,
+        count: int,
+        *,
+        big: bool = False,
+    ) -> list[Vector3]:
+        """Reads count consecutive Vector3s (three 32-bit floats each) from the stream.
+
+        Args:
+        ----
+            count: The number of vectors.
+            big: Read bytes as big endian.
+
+        Returns:
+        -------
+            A list of new Vector3 instances.
+        """
+        return [Vector3(x, y, z) for x, y, z in _VECTOR3[big].iter_unpack(self.read_bytes(12 * count))]
 
     def read_bytes(
         self,
@@ -673,6 +1081,191 @@ class BinaryReader:
             raise OSError(msg)
 
 
+class BinaryBufferReader(BinaryReader):
+    """A BinaryReader over data that is already in memory.
+
+    Values are unpacked straight out of the buffer with precompiled structs and the position is tracked by the reader
+    itself, so reads do not go through a stream at all. Memoryviews, mmaps and bytes are read without being copied.
+    BinaryReader.from_bytes() returns an instance of this class.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        data: bytes | bytearray | memoryview | mmap.mmap,
+        offset: int = 0,
+        size: int | None = None,
+    ):
+        if isinstance(data, bytearray):
+            data = bytes(data)  # a view would stop the caller from resizing their bytearray while this reader is alive.
+        self._view: memoryview = memoryview(data).cast("B")
+        self._stream: BinaryIO = MemoryViewStream(self._view)  # type: ignore[assignment]
+        self._offset: int = offset
+        self.auto_close: bool = True
+
+        available: int = len(self._view) - offset
+        self._size: int = available if size is None else size
+        if self._size > available:
+            msg = "Specified size is greater than the number of available bytes."
+            raise OSError(msg)
+        self._end: int = offset + self._size
+        self._position: int = offset
+
+    def buffer(self) -> memoryview:
+        """Returns the readable region of the buffer (from offset 0 to size) without copying it."""
+        return self._view[self._offset : self._end]
+
+    def true_size(self) -> int:
+        return len(self._view)
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def skip(
+        self,
+        length: int,
+    ) -> None:
+        self.exceed_check(length)
+        self._position += length
+
+    def position(self) -> int:
+        return self._position - self._offset
+
+    def seek(
+        self,
+        position: int,
+    ) -> None:
+        self.exceed_check(position - self.position())
+        self._position = position + self._offset
+
+    def set_offset(
+        self,
+        offset: int,
+    ) -> None:
+        self.seek(self.position() + offset)
+        self._offset = offset
+
+    def read_all(self) -> bytes:
+        length: int = self.size() - self._offset
+        self._position = min(self._offset + length, len(self._view))
+        return self._view[self._offset : self._position].tobytes()
+
+    def exceed_check(
+        self,
+        num: int,
+    ) -> None:
+        if self._position + num > self._end:
+            msg = "This operation would exceed the streams boundaries."
+            raise OSError(msg)
+
+    def _unpack(
+        self,
+        compiled: struct.Struct,
+    ) -> tuple:
+        position: int = self._position
+        if position + compiled.size > self._end:
+            msg = "This operation would exceed the streams boundaries."
+            raise OSError(msg)
+        self._position = position + compiled.size
+        return compiled.unpack_from(self._view, position)
+
+    def _take(
+        self,
+        length: int,
+    ) -> memoryview:
+        position: int = self._position
+        if position + length > self._end:
+            msg = "This operation would exceed the streams boundaries."
+            raise OSError(msg)
+        self._position = position + length
+        return self._view[position : position + length]
+
+    def read_uint8(self, *, big: bool = False) -> int:
+        return self._unpack(_UINT8[big])[0]
+
+    def read_int8(self, *, big: bool = False) -> int:
+        return self._unpack(_INT8[big])[0]
+
+    def read_uint16(self, *, big: bool = False) -> int:
+        return self._unpack(_UINT16[big])[0]
+
+    def read_int16(self, *, big: bool = False) -> int:
+        return self._unpack(_INT16[big])[0]
+
+    def read_uint32(self, *, max_neg1: bool = False, big: bool = False) -> int:
+        unpacked: int = self._unpack(_UINT32[big])[0]
+        return -1 if max_neg1 and unpacked == 0xFFFFFFFF else unpacked
+
+    def read_int32(self, *, big: bool = False) -> int:
+        return self._unpack(_INT32[big])[0]
+
+    def read_uint64(self, *, big: bool = False) -> int:
+        return self._unpack(_UINT64[big])[0]
+
+    def read_int64(self, *, big: bool = False) -> int:
+        return self._unpack(_INT64[big])[0]
+
+    def read_single(self, *, big: bool = False) -> float:  # type: ignore[override]
+        return self._unpack(_SINGLE[big])[0]
+
+    def read_double(self, *, big: bool = False) -> float:  # type: ignore[override]
+        return self._unpack(_DOUBLE[big])[0]
+
+    def read_vector2(self, *, big: bool = False) -> Vector2:
+        return Vector2(*self._unpack(_VECTOR2[big]))
+
+    def read_vector3(self, *, big: bool = False) -> Vector3:
+        return Vector3(*self._unpack(_VECTOR3[big]))
+
+    def read_vector4(self, *, big: bool = False) -> Vector4:
+        return Vector4(*self._unpack(_VECTOR4[big]))
+
+    def read_struct(self, fmt: str | struct.Struct, *, big: bool = False) -> tuple:
+        return self._unpack(_get_struct(fmt, big))
+
+    def read_struct_array(self, fmt: str | struct.Struct, count: int, *, big: bool = False) -> list[tuple]:
+        compiled: struct.Struct = _get_struct(fmt, big)
+        return list(compiled.iter_unpack(self._take(compiled.size * count)))
+
+    def read_uint16_array(self, count: int, *, big: bool = False) -> array:
+        return _to_array("H", self._take(2 * count), big)
+
+    def read_uint32_array(self, count: int, *, big: bool = False) -> array:
+        return _to_array("I", self._take(4 * count), big)
+
+    def read_int32_array(self, count: int, *, big: bool = False) -> array:
+        return _to_array("i", self._take(4 * count), big)
+
+    def read_single_array(self, count: int, *, big: bool = False) -> array:
+        return _to_array("f", self._take(4 * count), big)
+
+    def read_vector3_array(self, count: int, *, big: bool = False) -> list[Vector3]:
+        return [Vector3(x, y, z) for x, y, z in _VECTOR3[big].iter_unpack(self._take(12 * count))]
+
+    def read_bytes(
+        self,
+        length: int,
+    ) -> bytes:
+        return self._take(length).tobytes()
+
+    def read_string(
+        self,
+        length: int,
+        encoding: str | None = "windows-1252",
+    ) -> str:
+        string_byte_data: bytes = self._take(length).tobytes()
+        string = decode_bytes_with_fallbacks(string_byte_data, encoding=encoding, errors="ignore")
+        if "\0" in string:
+            string = string[: string.index("\0")].rstrip("\0")
+            string = string.replace("\0", "")
+        return string
+
+    def peek(
+        self,
+        length: int = 1,
+    ) -> bytes:
+        return self._view[self._position : self._position + length].tobytes()
+
+
 class BinaryWriter(ABC):
     @abstractmethod
     def __enter__(self):
@@ -698,9 +1291,16 @@ class BinaryWriter(ABC):
             A new BinaryWriter instance.
         """
         resolved_path = Path.pathify(path)
-        if not resolved_path.exists():
+        created = not resolved_path.exists()
+        if created:
             resolved_path = resolved_path.resolve()
-        return BinaryWriterFile(resolved_path.open("wb"))
+        if not MAPPED_FILES.release(resolved_path):
+            msg = f"Cannot write to '{resolved_path}' while memoryviews of its mapped data are still in use."
+            raise BufferError(msg)
+        writer = BinaryWriterFile(resolved_path.open("wb"))
+        if created:
+            CaseAwarePath.invalidate_cache(resolved_path)
+        return writer
 
     @classmethod
     def to_bytearray(
@@ -751,10 +1351,16 @@ class BinaryWriter(ABC):
             data: The data to write to the file.
         """
         resolved_path = Path.pathify(path)
-        if not resolved_path.exists():
+        created = not resolved_path.exists()
+        if created:
             resolved_path = resolved_path.resolve()
+        if not MAPPED_FILES.release(resolved_path):
+            msg = f"Cannot write to '{resolved_path}' while memoryviews of its mapped data are still in use."
+            raise BufferError(msg)
         with resolved_path.open("wb") as file:
             file.write(data)
+        if created:
+            CaseAwarePath.invalidate_cache(resolved_path)
 
     @abstractmethod
     def close(
@@ -1,17 +1,152 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-from pykotor.common.stream import BinaryReader
+import os
+import struct
+import sys
+from collections import Counter
+from contextlib import suppress
+from typing import Any, BinaryIO, Iterable, NamedTuple, Union
+
+from pykotor.common.stream import MAPPED_FILES, BinaryReader
 from pykotor.extract.file import FileResource, ResourceIdentifier, ResourceResult
-from pykotor.resource.formats.erf import ERF, ERFType, read_erf, write_erf
-from pykotor.resource.formats.rim import RIM, read_rim, write_rim
+from pykotor.resource.formats.erf import ERF, ERFType, write_erf
+from pykotor.resource.formats.rim import RIM, write_rim
 from pykotor.resource.type import ResourceType
 from pykotor.tools.misc import is_any_erf_type_file, is_capsule_file, is_rim_file
+from pykotor.tools.path import CaseAwarePath
 from utility.path import Path
 
-if TYPE_CHECKING:
-    import os
+CAPSULE_SOURCE_TYPES = Union[bytes, bytearray, memoryview, os.PathLike, str, FileResource]
+
+_ERF_HEADER = struct.Struct("<4s4sIIIIIIIII116s")
+_ERF_KEY = struct.Struct("<16sIHH")
+_ERF_RESOURCE = struct.Struct("<II")
+_RIM_HEADER = struct.Struct("<4s4sIII100s")
+_RIM_KEY = struct.Struct("<16sIIII")
+_TABLE_ROW_SIZE = 32  # the key and resource table entries of one resource, the same size for ERFs and RIMs
+_COPY_CHUNK_SIZE = 1 << 20
+_SENDFILE_SUPPORTED: bool = hasattr(os, "sendfile") and sys.platform.startswith("linux")  # copies between two files
+
+
+class _CapsuleEntry(NamedTuple):
+    resref: str
+    restype: ResourceType
+    source: CAPSULE_SOURCE_TYPES
+    size: int
+
+
+def write_capsule(
+    target: os.PathLike | str,
+    resources: Iterable[tuple[str, ResourceType, CAPSULE_SOURCE_TYPES]],
+    erf_type: ERFType | None = None,
+) -> int:
+    """Writes an ERF/MOD/SAV/RIM capsule, streaming the data of each resource from its source into the file.
+
+    Only the size of every source is read up front to lay out the key and resource tables, the data is then copied in
+    chunks (with os.sendfile where the platform supports it), so no more than one chunk of data from a path or
+    FileResource source is held in memory. The capsule is written to a temporary file that replaces the target once
+    complete, so the sources may be slices of the target itself.
+
+    Args:
+    ----
+        target: The path of the capsule to write. The format is picked from the extension.
+        resources: (resref, restype, source) tuples. A source is the data itself, the path of a file holding it or a
+                   FileResource, such as a resource of another capsule or a BIF. A resource repeated later replaces the
+                   source and resref of the earlier one but keeps its position.
+        erf_type: The type written in the header of an ERF/MOD/SAV capsule. Defaults to the type of the extension.
+
+    Returns:
+    -------
+        The number of resources written.
+    """
+    target_path: Path = Path.pathify(target)  # type: ignore[assignment]
+    entries: dict[ResourceIdentifier, _CapsuleEntry] = {}
+    for resref, restype, source in resources:
+        entries[ResourceIdentifier(resref, restype)] = _CapsuleEntry(resref, restype, source, _source_size(source))
+
+    header: bytearray
+    if is_rim_file(target_path.name):
+        data_offset: int = _RIM_HEADER.size + _RIM_KEY.size * len(entries)
+        header = bytearray(_RIM_HEADER.pack(b"RIM ", b"V1.0", 0, len(entries), _RIM_HEADER.size, b""))
+        for resid, entry in enumerate(entries.values()):
+            header += _RIM_KEY.pack(_encode_resref(entry.resref), entry.restype.type_id, resid, data_offset, entry.size)
+            data_offset += entry.size
+    elif is_any_erf_type_file(target_path.name):
+        offset_to_keys: int = _ERF_HEADER.size
+        offset_to_resources: int = offset_to_keys + _ERF_KEY.size * len(entries)
+        file_type: bytes = (erf_type or ERFType.from_extension(target_path.name)).value.encode("ascii")
+        header = bytearray(_ERF_HEADER.pack(file_type, b"V1.0", 0, 0, len(entries), 0, offset_to_keys, offset_to_resources, 0, 0, 0xFFFFFFFF, b""))
+        for resid, entry in enumerate(entries.values()):
+            header += _ERF_KEY.pack(_encode_resref(entry.resref), resid, entry.restype.type_id, 0)
+        data_offset = offset_to_resources + _ERF_RESOURCE.size * len(entries)
+        for entry in entries.values():
+            header += _ERF_RESOURCE.pack(data_offset, entry.size)
+            data_offset += entry.size
+    else:
+        msg = f"File '{target_path}' is not a ERF/MOD/SAV/RIM capsule."
+        raise NotImplementedError(msg)
+
+    temp_path: Path = target_path.with_name(f"{target_path.name}.tmp")
+    try:
+        with temp_path.open("wb", buffering=0) as file:
+            _write_all(file, header)
+            for entry in entries.values():
+                _copy_source(file, entry.source, entry.size)
+        MAPPED_FILES.release(target_path)  # views still in use keep reading the replaced file
+        created: bool = not target_path.exists()
+        os.replace(temp_path, target_path)
+        if created:
+            CaseAwarePath.invalidate_cache(target_path)
+    except BaseException:
+        with suppress(OSError):
+            temp_path.unlink()
+        raise
+    return len(entries)
+
+
+def _encode_resref(resref: str) -> bytes:
+    return resref.encode("windows-1252", errors="ignore")[:16]
+
+
+def _source_size(source: CAPSULE_SOURCE_TYPES) -> int:
+    if isinstance(source, FileResource):
+        return source.size()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    return os.path.getsize(source)  # noqa: PTH202
+
+
+def _write_all(file: BinaryIO, data: bytes | bytearray | memoryview) -> None:
+    view = memoryview(data).cast("B")
+    while view:
+        view = view[file.write(view) :]
+
+
+def _copy_source(file: BinaryIO, source: CAPSULE_SOURCE_TYPES, size: int) -> None:
+    """Copies size bytes of the source to the current position of an unbuffered file."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        _write_all(file, source)
+        return
+    filepath, offset = (source.filepath(), source.offset()) if isinstance(source, FileResource) else (source, 0)
+    with open(filepath, "rb", buffering=0) as source_file:  # noqa: PTH123
+        if _SENDFILE_SUPPORTED:
+            while size > 0:
+                sent: int = os.sendfile(file.fileno(), source_file.fileno(), offset, size)
+                if sent == 0:
+                    break
+                offset += sent
+                size -= sent
+        else:
+            source_file.seek(offset)
+            while size > 0:
+                chunk: bytes = source_file.read(min(size, _COPY_CHUNK_SIZE))
+                if not chunk:
+                    break
+                _write_all(file, chunk)
+                size -= len(chunk)
+    if size > 0:
+        msg = f"'{filepath}' ended {size} bytes before the end of the resource."
+        raise OSError(msg)
 
 
 class Capsule:
@@ -19,8 +154,13 @@ class Capsule:
 
     Resource data is not actually stored in memory by default but is instead loaded up on demand with the
     Capsule.resource() method. Use the RIM or ERF classes if you want to solely work with capsules in memory.
+
+    Resources can be staged with Capsule.stage() to write many of them at once: staged data is returned by resource()
+    and exists() straight away but is only written to the disk, in a single rewrite of the file, by Capsule.commit().
     """
 
+    MAX_DEAD_SPACE_RATIO: float = 0.5  # see commit()
+
     def __init__(
         self,
         path: os.PathLike | str,
@@ -49,6 +189,13 @@ class Capsule:
         self._path: Path = Path.pathify(path)  # type: ignore[assignment]
         self._resources: list[FileResource] = []
 
+        # used for faster lookups, the first resource with a given identifier takes precedence.
+        self._resource_dict: dict[ResourceIdentifier, FileResource] = {}
+
+        # resources added with stage() that have not been written to the disk yet.
+        self._staged: dict[ResourceIdentifier, bytes] = {}
+        self._erf_type: ERFType | None = None  # as read from the header, which does not always match the extension
+
         str_path = str(self._path)
 
         if not is_capsule_file(str_path):
@@ -98,7 +245,10 @@ class Capsule:
             self.reload()
 
         query = ResourceIdentifier(resref, restype)
-        resource = next((resource for resource in self._resources if resource == query), None)
+        staged: bytes | None = self._staged.get(query)
+        if staged is not None:
+            return staged
+        resource: FileResource | None = self._resource_dict.get(query)
         return resource.data() if resource else None
 
     def batch(
@@ -120,36 +270,41 @@ class Capsule:
         Processing Logic:
         ----------------
             - Reloads capsule resources from erf/rim if reload is True
-            - Initializes results dict to return
-            - Opens capsule file as binary reader
-            - Loops through queries
-                - Sets result to None
-                - Checks if resource exists in capsule
-                - If so, seeks to offset, reads bytes and sets result
-            - Closes reader
+            - Returns staged data for queries that have been staged
+            - Looks up each query in the resource index, defaulting the result to None
+            - Sorts the found resources by their offset in the capsule
+            - Reads every found resource in a single forward pass over the file
             - Returns results dict.
         """
         if reload:
             self.reload()
 
         results: dict[ResourceIdentifier, ResourceResult | None] = {}
+        found: list[tuple[ResourceIdentifier, FileResource]] = []
+        for query in queries:
+            results[query] = None
+            staged: bytes | None = self._staged.get(query)
+            if staged is not None:
+                results[query] = ResourceResult(query.resname, query.restype, self._path, staged)
+                continue
+            resource: FileResource | None = self._resource_dict.get(query)
+            if resource is not None:
+                found.append((query, resource))
+        if not found:
+            return results
+
+        found.sort(key=lambda item: item[1].offset())
         with BinaryReader.from_file(self._path) as reader:
-            for query in queries:
-                results[query] = None
-                if self.exists(query.resname, query.restype):
-                    resource: FileResource | None = next(
-                        (resource for resource in self._resources if resource == query),
-                        None,
-                    )
-                    if resource is not None:
-                        reader.seek(resource.offset())
-                        data: bytes = reader.read_bytes(resource.size())
-                        results[query] = ResourceResult(
-                            query.resname,
-                            query.restype,
-                            self._path,
-                            data,
-                        )
+            for query, resource in found:
+                if resource.offset() != reader.position():
+                    reader.seek(resource.offset())
+                data: bytes = reader.read_bytes(resource.size())
+                results[query] = ResourceResult(
+                    query.resname,
+                    query.restype,
+                    self._path,
+                    data,
+                )
         return results
 
     def exists(
@@ -172,18 +327,14 @@ class Capsule:
 
         Checks if a resource exists:
             - Constructs a ResourceIdentifier from resref and restype
-            - Searches self._resources for a matching resource
+            - Looks up the identifier in the staged resources and the resource index
             - Returns True if a match is found, False otherwise.
         """
         if reload:
             self.reload()
 
         query = ResourceIdentifier(resref, restype)
-        resource: FileResource | None = next(
-            (resource for resource in self._resources if resource == query),
-            None,
-        )
-        return resource is not None
+        return query in self._staged or query in self._resource_dict
 
     def info(
         self,
@@ -207,13 +358,12 @@ class Capsule:
         ----------------
             - Check if reload is True and call reload()
             - Create query object from resref and restype
-            - Return first matching resource from internal list.
+            - Return the matching resource from the resource index.
         """
         if reload:
             self.reload()
 
-        query = ResourceIdentifier(resref, restype)
-        return next((resource for resource in self._resources if resource == query), None)
+        return self._resource_dict.get(ResourceIdentifier(resref, restype))
 
     def reload(
         self,
@@ -234,19 +384,26 @@ class Capsule:
             - Check if capsule exists on disk and print error if not
             - Open file and read header
             - Call appropriate reload method based on file type
-            - Raise error if unknown file type.
+            - Raise error if unknown file type
+            - Rebuild the resource index.
         """
+        self._resources = []
+        self._resource_dict = {}
         with BinaryReader.from_file(self._path) as reader:
             file_type = reader.read_string(4)
             reader.skip(4)  # file version
 
             if file_type in {ERFType.__members__[erf_name].value for erf_name in ERFType.__members__}:
-                return self._load_erf(reader)
-            if file_type == "RIM ":
-                return self._load_rim(reader)
+                self._erf_type = ERFType(file_type)
+                self._load_erf(reader)
+            elif file_type == "RIM ":
+                self._load_rim(reader)
+            else:
+                msg = f"File '{self._path}' is not an ERF/MOD/SAV/RIM capsule."
+                raise NotImplementedError(msg)
 
-            msg = f"File '{self._path}' is not an ERF/MOD/SAV/RIM capsule."
-            raise NotImplementedError(msg)
+        for resource in self._resources:
+            self._resource_dict.setdefault(resource.identifier(), resource)
 
     def add(
         self,
@@ -268,23 +425,214 @@ class Capsule:
 
         Processing Logic:
         ----------------
-            - Checks if the file is RIM or a type of ERF
-            - Reads the file as appropriate container
-            - Calls set_data to add the resource
-            - Writes the container back to the file.
+            - Stages the resource
+            - Commits every staged resource to the disk.
         """
-        container: RIM | ERF
-        if is_rim_file(self._path.name):
-            container = read_rim(self._path)
-            container.set_data(resname, restype, resdata)
-            write_rim(container, self._path)
-        elif is_any_erf_type_file(self._path.name):
-            container = read_erf(self._path)
-            container.set_data(resname, restype, resdata)
-            write_erf(container, self._path)
-        else:
-            msg = f"File '{self._path}' is not a ERF/MOD/SAV/RIM capsule."
-            raise NotImplementedError(msg)
+        self.stage(resname, restype, resdata)
+        self.commit()
+
+    def stage(
+        self,
+        resname: str,
+        restype: ResourceType,
+        resdata: bytes,
+    ):
+        """Adds a resource to the capsule without writing it to the disk until commit() is called.
+
+        Staging the same resource again replaces the previously staged data.
+
+        Args:
+        ----
+            resname: Name of the resource to add.
+            restype: Type of the resource to add.
+            resdata: Data of the resource to add.
+        """
+        self._staged[ResourceIdentifier(resname, restype)] = resdata
+
+    def staged(self) -> list[ResourceIdentifier]:
+        """Returns the identifiers of the resources that were staged but not committed yet."""
+        return list(self._staged)
+
+    def commit(
+        self,
+        *,
+        in_place: bool = False,
+    ):
+        """Writes every staged resource to the capsule on the disk.
+
+        By default the capsule is rewritten once: it is streamed into a temporary file next to the capsule with
+        write_capsule() and then moved over it, so the capsule on the disk is never left partially written and its
+        unchanged resources are copied rather than loaded into memory.
+
+        With in_place=True only the staged data, the key/resource tables and the header are written: payloads that fit
+        in the space of the resource they replace overwrite it, the rest are appended to the end of the file, and new
+        entries move the tables after them. The space this leaves unused is reported by dead_space() and reclaimed by
+        compact(). If it would exceed MAX_DEAD_SPACE_RATIO of the file, the capsule is rewritten instead. Resources
+        overwritten in place are not protected against an interrupted write, everything else is only linked in by
+        the final header or table write.
+
+        Args:
+        ----
+            in_place: Whether to update the capsule in place rather than rewriting it.
+
+        Raises:
+        ------
+            NotImplementedError: If the file is not a ERF/MOD/SAV/RIM capsule.
+
+        Processing Logic:
+        ----------------
+            - Returns early if nothing was staged
+            - Tries to update the capsule in place if requested
+            - Otherwise lists the resources of the capsule followed by the staged resources, which replace existing ones,
+              streams them into a temporary file and replaces the capsule with it
+            - Reloads the resource list and index from the updated file.
+        """
+        if not self._staged:
+            return
+
+        if not in_place or not self._commit_in_place():
+            self._rewrite()
+        self._staged.clear()
+        self.reload()
+
+    def compact(
+        self,
+    ) -> int:
+        """Rewrites the capsule without the dead space left by in-place commits. Staged resources are committed too.
+
+        Returns:
+        -------
+            The number of bytes the capsule shrank by.
+        """
+        size_before: int = self._path.stat().st_size
+        self._rewrite()
+        self._staged.clear()
+        self.reload()
+        return size_before - self._path.stat().st_size
+
+    def dead_space(
+        self,
+    ) -> int:
+        """Returns the number of bytes in the capsule file that are not part of its header, tables or resources."""
+        with self._path.open("rb") as file:
+            rows, _offset_to_keys, _offset_to_resources = self._read_tables(file)
+            file_size: int = file.seek(0, os.SEEK_END)
+            header_size: int = _RIM_HEADER.size if self._erf_type is None else _ERF_HEADER.size
+        used: int = header_size + len(rows) * _TABLE_ROW_SIZE + sum(size for _, size in {(row[2], row[3]) for row in rows})
+        return file_size - used
+
+    def _rewrite(
+        self,
+    ):
+        sources: list[tuple[str, ResourceType, CAPSULE_SOURCE_TYPES]] = [(resource.resname(), resource.restype(), resource) for resource in self._resources]
+        sources.extend((identifier.resname, identifier.restype, resdata) for identifier, resdata in self._staged.items())
+        write_capsule(self._path, sources, self._erf_type)
+
+    def _read_tables(
+        self,
+        file: BinaryIO,
+    ) -> tuple[list[list[Any]], int, int]:
+        """Reads the table rows of the capsule as [encoded resref, restype id, offset, size] lists.
+
+        Returns:
+        -------
+            The rows, the offset to the keys and the offset to the resource table (the same offset for a RIM).
+        """
+        file.seek(0)
+        header: bytes = file.read(_ERF_HEADER.size)
+        if self._erf_type is None:
+            _file_type, _file_version, _unused, entry_count, offset_to_keys, _reserved = _RIM_HEADER.unpack_from(header)
+            file.seek(offset_to_keys)
+            rows: list[list[Any]] = [
+                [resref, restype_id, offset, size]
+                for resref, restype_id, _resid, offset, size in _RIM_KEY.iter_unpack(file.read(entry_count * _RIM_KEY.size))
+            ]
+            return rows, offset_to_keys, offset_to_keys
+
+        fields: tuple[Any, ...] = _ERF_HEADER.unpack_from(header)
+        entry_count, offset_to_keys, offset_to_resources = fields[4], fields[6], fields[7]
+        file.seek(offset_to_keys)
+        keys: bytes = file.read(entry_count * _ERF_KEY.size)
+        file.seek(offset_to_resources)
+        resources: bytes = file.read(entry_count * _ERF_RESOURCE.size)
+        rows = [
+            [resref, restype_id, offset, size]
+            for (resref, _resid, restype_id, _unused), (offset, size) in zip(_ERF_KEY.iter_unpack(keys), _ERF_RESOURCE.iter_unpack(resources))
+        ]
+        return rows, offset_to_keys, offset_to_resources
+
+    def _commit_in_place(
+        self,
+    ) -> bool:
+        """Writes the staged resources into the capsule file in place, see commit().
+
+        Returns:
+        -------
+            False, without writing anything, if the capsule should be rewritten instead.
+        """
+        with self._path.open("r+b") as file:
+            rows, offset_to_keys, offset_to_resources = self._read_tables(file)
+            file_size: int = file.seek(0, os.SEEK_END)
+
+            row_indices: dict[ResourceIdentifier, int] = {}
+            for index, (resref, restype_id, _offset, _size) in enumerate(rows):
+                resname: str = resref.split(b"\0", 1)[0].decode("windows-1252", errors="ignore")
+                row_indices.setdefault(ResourceIdentifier(resname, ResourceType.from_id(restype_id)), index)
+            shared: set[int] = {offset for offset, count in Counter(row[2] for row in rows).items() if count > 1}
+
+            writes: list[tuple[int, bytes]] = []
+            append_offset: int = file_size
+            added = False
+            for identifier, resdata in self._staged.items():
+                index: int | None = row_indices.get(identifier)
+                if index is not None and len(resdata) <= rows[index][3] and rows[index][2] not in shared:
+                    writes.append((rows[index][2], resdata))
+                    rows[index][3] = len(resdata)
+                    continue
+                writes.append((append_offset, resdata))
+                if index is None:
+                    row_indices[identifier] = len(rows)
+                    rows.append([_encode_resref(identifier.resname), identifier.restype.type_id, append_offset, len(resdata)])
+                    added = True
+                else:
+                    rows[index][2:4] = [append_offset, len(resdata)]
+                append_offset += len(resdata)
+
+            header_size: int = _RIM_HEADER.size if self._erf_type is None else _ERF_HEADER.size
+            if added:
+                offset_to_keys = append_offset
+                offset_to_resources = offset_to_keys if self._erf_type is None else offset_to_keys + len(rows) * _ERF_KEY.size
+            new_size: int = append_offset + len(rows) * _TABLE_ROW_SIZE if added else append_offset
+            used: int = header_size + len(rows) * _TABLE_ROW_SIZE + sum(size for _, size in {(row[2], row[3]) for row in rows})
+            if new_size - used > self.MAX_DEAD_SPACE_RATIO * new_size:
+                return False
+
+            if not MAPPED_FILES.release(self._path):
+                return False  # views of the old data are still in use, only replacing the file keeps them valid
+            for offset, resdata in writes:
+                file.seek(offset)
+                file.write(resdata)
+
+            file.seek(offset_to_keys)
+            if self._erf_type is None:
+                file.write(b"".join(_RIM_KEY.pack(resref, restype_id, resid, offset, size) for resid, (resref, restype_id, offset, size) in enumerate(rows)))
+            else:
+                file.write(b"".join(_ERF_KEY.pack(resref, resid, restype_id, 0) for resid, (resref, restype_id, _, _) in enumerate(rows)))
+                file.seek(offset_to_resources)
+                file.write(b"".join(_ERF_RESOURCE.pack(offset, size) for _, _, offset, size in rows))
+
+            if added:
+                # the new tables are only linked in once everything else is written
+                file.seek(0)
+                header = bytearray(file.read(header_size))
+                if self._erf_type is None:
+                    struct.pack_into("<II", header, 12, len(rows), offset_to_keys)
+                else:
+                    struct.pack_into("<I", header, 16, len(rows))
+                    struct.pack_into("<II", header, 24, offset_to_keys, offset_to_resources)
+                file.seek(0)
+                file.write(header)
+        return True
 
     def path(
         self,
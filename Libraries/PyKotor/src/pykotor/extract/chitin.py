@@ -1,92 +1,211 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import shutil
 import struct
-from typing import TYPE_CHECKING
-
-from pykotor.common.stream import BinaryReader, BinaryWriter
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import TYPE_CHECKING, Iterator, NamedTuple, overload
+
+from pykotor.common.stream import MAPPED_FILES, BinaryReader, BinaryWriter
 from pykotor.extract.file import FileResource, ResourceIdentifier
 from pykotor.resource.type import ResourceType
 from pykotor.tools.path import CaseAwarePath
 from utility.path import PurePath
 
 if TYPE_CHECKING:
-    import os
+    from typing import BinaryIO
+
+_UINT32_TYPECODE = "I" if array("I").itemsize == 4 else "L"  # noqa: PLR2004
+
+
+class ChitinBif(NamedTuple):
+    """The resource table of a single BIF, stored as one array per column instead of one object per resource."""
+
+    filename: str  # as written in the key
+    filepath: CaseAwarePath
+    res_ids: array
+    offsets: array
+    sizes: array
+    restype_ids: array
 
 
 class Chitin:
     """Chitin object is used for loading the list of resources stored in the chitin.key/.bif files used by the game.
 
-    Chitin support is read-only and you cannot write your own key/bif files with this class yet.
+    Chitin itself is read-only, use ChitinWriter to pack resources into key/bif files.
+
+    The resource tables are kept as compact arrays and FileResources are only created when they are iterated, indexed or
+    queried, so a Chitin costs a few bytes per resource instead of a few objects.
     """
 
     KEY_ELEMENT_SIZE = 8
+    BIF_ENTRY = struct.Struct("<IIII")
+    KEY_ENTRY = struct.Struct("<16sHI")
+
     def __init__(
         self,
         key_path: os.PathLike | str,
         base_path: os.PathLike | str | None = None,
+        max_workers: int = 1,
     ):
+        """Loads the list of resources stored in the chitin.key and the BIF files it links to.
+
+        Args:
+        ----
+            key_path: The path to the chitin.key file.
+            base_path: The folder the BIF paths in the key are relative to. Defaults to the folder of the key.
+            max_workers: The number of threads that read the resource tables of the BIF files. 1 reads them one by one.
+        """
         self._key_path: CaseAwarePath = CaseAwarePath.pathify(key_path)
         base_path = base_path if base_path is not None else self._key_path.parent
         self._base_path: CaseAwarePath = CaseAwarePath.pathify(base_path)
+        self._max_workers: int = max_workers
 
-        self._resources: list[FileResource] = []
-        self._resource_dict: dict[str, list[FileResource]] = {}
+        self._keys: dict[int, str] = {}  # resource id -> resref, the only copy of each name
+        self._bifs: list[ChitinBif] = []
+        self._bif_starts: list[int] = []  # index of the first resource of each BIF
+        self._lookup: dict[tuple[str, int], tuple[int, int]] | None = None
         self.load()
 
     def __iter__(
         self,
-    ):
-        yield from self._resources
+    ) -> Iterator[FileResource]:
+        for bif in self._bifs:
+            yield from self._bif_resources(bif)
 
     def __len__(
         self,
     ):
-        return len(self._resources)
+        return sum(len(bif.res_ids) for bif in self._bifs)
+
+    @overload
+    def __getitem__(self, index: int) -> FileResource: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[FileResource]: ...
+    def __getitem__(
+        self,
+        index: int | slice,
+    ) -> FileResource | list[FileResource]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        bif_index = bisect_right(self._bif_starts, index) - 1
+        if index < 0 or bif_index < 0 or index - self._bif_starts[bif_index] >= len(self._bifs[bif_index].res_ids):
+            msg = "Chitin index out of range"
+            raise IndexError(msg)
+        return self._materialize(self._bifs[bif_index], index - self._bif_starts[bif_index])
 
     def load(
         self,
     ) -> None:
         """Reload the list of resource info linked from the chitin.key file."""
-        self._resources = []
-        self._resource_dict = {}
+        self._lookup = None
+        self._keys, filenames = self._get_chitin_data()
+        if self._max_workers > 1 and len(filenames) > 1:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                self._bifs = list(executor.map(self._load_bif, filenames))
+        else:
+            self._bifs = [self._load_bif(filename) for filename in filenames]
+
+        # kept in the order of the key so the result does not depend on which BIF was read first
+        self._bif_starts = []
+        start = 0
+        for bif in self._bifs:
+            self._bif_starts.append(start)
+            start += len(bif.res_ids)
+
+    def _load_bif(
+        self,
+        filename: str,
+    ) -> ChitinBif:
+        """Reads the resource table of a single BIF file in one read, splitting it into columns.
 
-        keys, bifs = self._get_chitin_data()
-        for bif in bifs:
-            self._resource_dict[bif] = []
-            absolute_bif_path = self._base_path / bif
-            with BinaryReader.from_file(absolute_bif_path) as reader:
-                _bif_file_type = reader.read_string(4)
-                _bif_file_version = reader.read_string(4)
-                resource_count = reader.read_uint32()
-                reader.skip(4)  # padding (always 0x00000000?) fixed resource count, unimplemented
-                resource_offset = reader.read_uint32()  # 0x10 always 20
-
-                reader.seek(resource_offset)  # 0x20
-                for _ in range(resource_count):
-                    res_id = reader.read_uint32()
-                    offset = reader.read_uint32()
-                    size = reader.read_uint32()
-                    restype_id = reader.read_uint32()
-
-                    resref = keys[res_id]
-                    restype = ResourceType.from_id(restype_id)
-                    resource = FileResource(
-                        resref,
-                        restype,
-                        size,
-                        offset,
-                        absolute_bif_path,
-                    )
-                    self._resources.append(resource)
-                    self._resource_dict[bif].append(resource)
+        Rows the key does not link to, such as resources replaced by ChitinWriter in append mode, are dropped.
+        """
+        absolute_bif_path = self._base_path / filename
+        with BinaryReader.from_file(absolute_bif_path) as reader:
+            _bif_file_type = reader.read_string(4)
+            _bif_file_version = reader.read_string(4)
+            resource_count = reader.read_uint32()
+            reader.skip(4)  # padding (always 0x00000000?) fixed resource count, unimplemented
+            resource_offset = reader.read_uint32()  # 0x10 always 20
+
+            reader.seek(resource_offset)  # 0x20
+            table = array(_UINT32_TYPECODE, reader.read_bytes(resource_count * self.BIF_ENTRY.size))
+        if sys.byteorder == "big":
+            table.byteswap()
+        res_ids: array = table[0::4]
+        if not self._keys.keys() >= set(res_ids):
+            rows: list[int] = [row for row, res_id in enumerate(res_ids) if res_id in self._keys]
+            table = array(_UINT32_TYPECODE, (value for row in rows for value in table[row * 4 : row * 4 + 4]))
+            res_ids = table[0::4]
+        return ChitinBif(filename, absolute_bif_path, res_ids, table[1::4], table[2::4], table[3::4])
+
+    def _materialize(
+        self,
+        bif: ChitinBif,
+        index: int,
+    ) -> FileResource:
+        return FileResource(
+            self._keys[bif.res_ids[index]],
+            ResourceType.from_id(bif.restype_ids[index]),
+            bif.sizes[index],
+            bif.offsets[index],
+            bif.filepath,
+        )
+
+    def _bif_resources(
+        self,
+        bif: ChitinBif,
+    ) -> list[FileResource]:
+        keys = self._keys
+        filepath = bif.filepath
+        restypes: dict[int, ResourceType] = {restype_id: ResourceType.from_id(restype_id) for restype_id in set(bif.restype_ids)}
+        return [
+            FileResource(keys[res_id], restypes[restype_id], size, offset, filepath)
+            for res_id, offset, size, restype_id in zip(bif.res_ids, bif.offsets, bif.sizes, bif.restype_ids)
+        ]
+
+    def bifs(
+        self,
+    ) -> list[str]:
+        """Returns the filenames of the BIF files linked from the key, as written in the key."""
+        return [bif.filename for bif in self._bifs]
+
+    def bif_resources(
+        self,
+        filename: str,
+    ) -> list[FileResource]:
+        """Returns the resources stored in the BIF file with the specified filename, as written in the key.
+
+        Args:
+        ----
+            filename: The filename of the BIF file, see bifs().
+
+        Returns:
+        -------
+            A list of FileResources.
+        """
+        for bif in self._bifs:
+            if bif.filename == filename:
+                return self._bif_resources(bif)
+        msg = f"'{filename}' is not linked from '{self._key_path}'."
+        raise KeyError(msg)
 
     def save(self) -> None:
         """(unfinished) Writes the list of resource info to the chitin.key file and associated .bif files."""
         keys, bifs = self._get_chitin_data()
         resource_lookup: dict[str, tuple[PurePath, FileResource]] = {
-            resource.resname(): (PurePath(bif), resource)
-            for bif, bif_resources in self._resource_dict.items()
-            for resource in bif_resources
+            resource.resname(): (PurePath(bif.filename), resource)
+            for bif in self._bifs
+            for resource in self._bif_resources(bif)
         }
 
         # Initialize a dictionary to store bytearrays for each bif file
@@ -125,7 +244,7 @@ class Chitin:
             bif_writer.write_string("BIFF")  # 0x0
             bif_writer.write_string("V1  ")  # 0x4
 
-            resource_count = len(self._resource_dict[str(bif_path)])
+            resource_count = len(self.bif_resources(str(bif_path)))
             bif_writer.write_uint32(resource_count)  # 0x8
             bif_writer.write_uint32(0)   # 0xC padding (always 0x00000000?)
             bif_writer.write_uint32(20)  # 0x10 resource offset
@@ -139,7 +258,7 @@ class Chitin:
             bif_count = reader.read_uint32()
             key_count = reader.read_uint32()
             file_table_offset = reader.read_uint32()
-            _key_table_offset = reader.read_uint32()
+            key_table_offset = reader.read_uint32()
 
             files = []
             reader.seek(file_table_offset)
@@ -156,15 +275,28 @@ class Chitin:
                 bif = reader.read_string(file_length)
                 bifs.append(bif)
 
-            keys: dict[int, str] = {}
-            for _ in range(key_count):
-                resref = reader.read_string(16)
-                _restype_id = reader.read_uint16()
-                res_id = reader.read_uint32()
-                keys[res_id] = resref
+            reader.seek(key_table_offset)
+            keys: dict[int, str] = {
+                res_id: resref.split(b"\0", 1)[0].decode("windows-1252", errors="ignore")
+                for resref, _restype_id, res_id in self.KEY_ENTRY.iter_unpack(reader.read_bytes(key_count * self.KEY_ENTRY.size))
+            }
 
             return keys, bifs
 
+    def _find(
+        self,
+        resref: str,
+        restype: ResourceType,
+    ) -> FileResource | None:
+        if self._lookup is None:
+            # built on the first query, the first of any duplicates is returned
+            self._lookup = {}
+            for bif_index, bif in enumerate(self._bifs):
+                for index, (res_id, restype_id) in enumerate(zip(bif.res_ids, bif.restype_ids)):
+                    self._lookup.setdefault((self._keys[res_id].lower(), restype_id), (bif_index, index))
+        location: tuple[int, int] | None = self._lookup.get((resref.lower(), restype.type_id))
+        return None if location is None else self._materialize(self._bifs[location[0]], location[1])
+
     def resource(
         self,
         resref: str,
@@ -181,11 +313,7 @@ class Chitin:
         -------
             None or bytes data of resource.
         """
-        query = ResourceIdentifier(resref, restype)
-        resource = next(
-            (resource for resource in self._resources if resource == query),
-            None,
-        )
+        resource: FileResource | None = self._find(resref, restype)
         return None if resource is None else resource.data()
 
     def exists(
@@ -203,15 +331,301 @@ class Chitin:
         Returns:
         -------
             bool: True if resource exists, False otherwise
+        """
+        return self._find(resref, restype) is not None
+
+
+class ChitinWriteResult(NamedTuple):
+    resources: int  # added to the key
+    deduplicated: int  # of those, stored by pointing at an identical payload already in the same BIF
+    bytes_written: int  # of resource data
+
+
+class _PendingResource(NamedTuple):
+    resref: str
+    restype: ResourceType
+    source: bytes | os.PathLike | str
+
+
+class ChitinWriter:
+    """Writes a chitin.key and the BIF files it links to.
 
-        Processes the following logic:
-            - Constructs a ResourceIdentifier object from the resref and restype
-            - Iterates through internal _resources list to find matching resource
-            - Returns True if match found, False otherwise.
+    Resources are only recorded when added. Their data is streamed into the BIF files in chunks by write(), so packing a
+    large folder never holds more than one chunk of resource data in memory. Payloads identical to one already stored in
+    the same BIF are stored once, with both table entries pointing at the same data.
+
+    With append=True the existing key is kept: resources are added to the BIFs it already links to or to new ones, and
+    resources that are added again replace the old key entries. New data is appended to existing BIFs and their
+    resource table is rewritten after it, the header of a BIF stores where its table is so this is still a valid BIF.
+    """
+
+    CHUNK_SIZE = 65536
+    BIF_HEADER = struct.Struct("<4s4sIII")
+    KEY_HEADER = struct.Struct("<4s4sIIIIII32s")
+    KEY_FILE = struct.Struct("<IIHH")
+    RES_ID_BITS = 20
+
+    def __init__(
+        self,
+        key_path: os.PathLike | str,
+        base_path: os.PathLike | str | None = None,
+        *,
+        append: bool = False,
+    ):
+        """Prepares a writer for the key file at key_path.
+
+        Args:
+        ----
+            key_path: The path to the chitin.key file to write.
+            base_path: The folder the BIF paths in the key are relative to. Defaults to the folder of the key.
+            append: If True and the key exists, add to its contents instead of replacing them.
         """
-        query = ResourceIdentifier(resref, restype)
-        resource = next(
-            (resource for resource in self._resources if resource == query),
-            None,
+        self._key_path: CaseAwarePath = CaseAwarePath.pathify(key_path)
+        base_path = base_path if base_path is not None else self._key_path.parent
+        self._base_path: CaseAwarePath = CaseAwarePath.pathify(base_path)
+
+        self._bifs: list[tuple[str, int]] = []  # filename and drives flags of each BIF, in key order
+        self._keys: dict[ResourceIdentifier, tuple[str, int, int]] = {}  # resref, restype id, resource id
+        self._pending: dict[int, dict[ResourceIdentifier, _PendingResource]] = {}
+        if append and self._key_path.safe_isfile():
+            self._read_key()
+        self._appendable_bifs: int = len(self._bifs)  # BIFs linked from the existing key are appended to, not replaced
+
+    def add(
+        self,
+        bif: str,
+        resref: str,
+        restype: ResourceType,
+        source: bytes | os.PathLike | str,
+    ) -> None:
+        """Adds a resource to be written into the specified BIF.
+
+        Args:
+        ----
+            bif: The filename of the BIF as written in the key, relative to the base path (for example 'data\\mod.bif').
+                 The BIF is created if the key does not link to it yet.
+            resref: The resource ResRef, at most 16 characters.
+            restype: The resource type.
+            source: The resource data, or the path of a file to stream it from when the BIF is written.
+        """
+        if len(resref) > 16:  # noqa: PLR2004
+            msg = f"ResRef '{resref}' is longer than 16 characters."
+            raise ValueError(msg)
+        bif = bif.replace("/", "\\")
+        bif_index: int = next((i for i, (filename, _) in enumerate(self._bifs) if filename.lower() == bif.lower()), len(self._bifs))
+        if bif_index == len(self._bifs):
+            self._bifs.append((bif, 0))
+        # a resource added twice is only written once, from the last source
+        self._pending.setdefault(bif_index, {})[ResourceIdentifier(resref, restype)] = _PendingResource(resref, restype, source)
+
+    def add_folder(
+        self,
+        bif: str,
+        folder: os.PathLike | str,
+    ) -> int:
+        """Adds every resource file in a folder and its subfolders, such as an Override folder, to be written into a BIF.
+
+        Files without a valid resource type are skipped. See add().
+
+        Returns:
+        -------
+            The number of resources added.
+        """
+        count = 0
+        for root, _, filenames in sorted(os.walk(folder)):
+            for filename in sorted(filenames):
+                identifier: ResourceIdentifier = ResourceIdentifier.from_path(filename)
+                if identifier.restype.is_invalid or len(identifier.resname) > 16:  # noqa: PLR2004
+                    continue
+                self.add(bif, identifier.resname, identifier.restype, os.path.join(root, filename))  # noqa: PTH118
+                count += 1
+        return count
+
+    def write(self) -> ChitinWriteResult:
+        """Writes the added resources into their BIF files, then writes the key.
+
+        Returns:
+        -------
+            The number of resources written, how many were deduplicated and the number of bytes of data written.
+        """
+        resources = deduplicated = bytes_written = 0
+        for bif_index, pending in self._pending.items():
+            bif_path: CaseAwarePath = self._base_path / self._bifs[bif_index][0]
+            bif_path.parent.mkdir(parents=True, exist_ok=True)
+            res_ids, bif_deduplicated, bif_bytes = self._write_bif(bif_path, bif_index, list(pending.values()), append=bif_index < self._appendable_bifs)
+            for resource, res_id in zip(pending.values(), res_ids):
+                self._keys[ResourceIdentifier(resource.resref, resource.restype)] = (resource.resref, resource.restype.type_id, res_id)
+            resources += len(pending)
+            deduplicated += bif_deduplicated
+            bytes_written += bif_bytes
+        self._pending = {}
+        self._appendable_bifs = len(self._bifs)
+        self._write_key()
+        CaseAwarePath.invalidate_cache(self._key_path.parent)
+        return ChitinWriteResult(resources, deduplicated, bytes_written)
+
+    def _read_key(self) -> None:
+        with self._key_path.open("rb") as file:
+            data: bytes = file.read()
+        _file_type, _file_version, bif_count, key_count, file_table_offset, key_table_offset, *_ = self.KEY_HEADER.unpack_from(data)
+        for _filesize, name_offset, name_length, drives in self.KEY_FILE.iter_unpack(data[file_table_offset : file_table_offset + bif_count * self.KEY_FILE.size]):
+            filename: str = data[name_offset : name_offset + name_length].split(b"\0", 1)[0].decode("windows-1252", errors="ignore")
+            self._bifs.append((filename, drives))
+        for resref_data, restype_id, res_id in Chitin.KEY_ENTRY.iter_unpack(data[key_table_offset : key_table_offset + key_count * Chitin.KEY_ENTRY.size]):
+            resref: str = resref_data.split(b"\0", 1)[0].decode("windows-1252", errors="ignore")
+            self._keys[ResourceIdentifier(resref, ResourceType.from_id(restype_id))] = (resref, restype_id, res_id)
+
+    def _write_bif(
+        self,
+        bif_path: CaseAwarePath,
+        bif_index: int,
+        pending: list[_PendingResource],
+        *,
+        append: bool,
+    ) -> tuple[list[int], int, int]:
+        """Streams the pending resources into a BIF, creating it or appending to it.
+
+        A BIF is only written in place when appending to it while none of its mapped data is in use, otherwise a new file
+        is written and replaces it. Appended data and the new table are written after the old table, which is only
+        unlinked by the final header write, so a failed append leaves the BIF as it was.
+
+        Returns:
+        -------
+            The resource ids of the pending resources, the number deduplicated and the number of bytes of data written.
+        """
+        table = array(_UINT32_TYPECODE)
+        table_offset: int = self.BIF_HEADER.size
+        append = append and bif_path.safe_isfile()
+        # views of the old data that are still in use stay valid only if the BIF is replaced instead of written in place
+        in_place: bool = MAPPED_FILES.release(bif_path) and append
+        target_path: CaseAwarePath = bif_path if in_place else bif_path.with_name(f"{bif_path.name}.tmp")
+        original_size: int = bif_path.stat().st_size if in_place else 0
+        try:
+            if append and not in_place:
+                shutil.copyfile(bif_path, target_path)
+            with target_path.open("r+b" if append else "w+b") as file:
+                if append:
+                    _file_type, _file_version, count, _fixed_count, table_offset = self.BIF_HEADER.unpack(file.read(self.BIF_HEADER.size))
+                    file.seek(table_offset)
+                    table.frombytes(file.read(count * Chitin.BIF_ENTRY.size))
+                    if sys.byteorder == "big":
+                        table.byteswap()
+                    data_end: int = file.seek(0, os.SEEK_END)
+                else:
+                    # reserve the standard position of the table right after the header
+                    data_end = self.BIF_HEADER.size + len(pending) * Chitin.BIF_ENTRY.size
+                file.seek(data_end)
+
+                # payloads are matched by size first so existing data is only hashed when a new payload could equal it
+                hashes: dict[tuple[int, bytes], int] = {}
+                unhashed: dict[int, list[int]] = {}
+                for offset, size in zip(table[1::4], table[2::4]):
+                    unhashed.setdefault(size, []).append(offset)
+
+                res_ids: list[int] = []
+                deduplicated = bytes_written = 0
+                first_row: int = len(table) // 4
+                for row, resource in enumerate(pending, first_row):
+                    offset, size, digest = self._write_payload(file, data_end, resource.source)
+                    for existing_offset in unhashed.pop(size, []):
+                        hashes.setdefault((size, self._hash_range(file, existing_offset, size)), existing_offset)
+                    existing: int | None = hashes.get((size, digest))
+                    if existing is None:
+                        hashes[(size, digest)] = offset
+                        data_end = offset + size
+                        bytes_written += size
+                    else:
+                        offset = existing
+                        deduplicated += 1
+                    file.seek(data_end)
+                    res_id: int = (bif_index << self.RES_ID_BITS) | row
+                    table.extend((res_id, offset, size, resource.restype.type_id))
+                    res_ids.append(res_id)
+
+                if append:
+                    table_offset = data_end
+                file.truncate(max(data_end, table_offset + len(table) * 4))
+                if sys.byteorder == "big":
+                    table.byteswap()
+                file.seek(table_offset)
+                file.write(table.tobytes())
+                file.seek(0)
+                file.write(self.BIF_HEADER.pack(b"BIFF", b"V1  ", len(table) // 4, 0, table_offset))
+            if not in_place:
+                MAPPED_FILES.release(bif_path)
+                os.replace(target_path, bif_path)
+        except BaseException:
+            with suppress(OSError):
+                if in_place:
+                    os.truncate(bif_path, original_size)  # drop the partly appended data, the old header still applies
+                else:
+                    target_path.unlink()
+            raise
+        return res_ids, deduplicated, bytes_written
+
+    def _write_payload(
+        self,
+        file: BinaryIO,
+        offset: int,
+        source: bytes | os.PathLike | str,
+    ) -> tuple[int, int, bytes]:
+        """Writes a payload at offset, returning the offset, size and SHA-256 digest of the payload."""
+        sha256 = hashlib.sha256()
+        size = 0
+        file.seek(offset)
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            sha256.update(source)
+            size = file.write(source)
+        else:
+            with open(source, "rb") as source_file:  # noqa: PTH123
+                for chunk in iter(lambda: source_file.read(self.CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    size += file.write(chunk)
+        return offset, size, sha256.digest()
+
+    def _hash_range(
+        self,
+        file: BinaryIO,
+        offset: int,
+        size: int,
+    ) -> bytes:
+        sha256 = hashlib.sha256()
+        file.seek(offset)
+        while size > 0:
+            chunk: bytes = file.read(min(size, self.CHUNK_SIZE))
+            if not chunk:
+                break
+            sha256.update(chunk)
+            size -= len(chunk)
+        return sha256.digest()
+
+    def _write_key(self) -> None:
+        file_table = bytearray()
+        filenames = bytearray()
+        file_table_offset: int = self.KEY_HEADER.size
+        names_offset: int = file_table_offset + len(self._bifs) * self.KEY_FILE.size
+        for filename, drives in self._bifs:
+            bif_path: CaseAwarePath = self._base_path / filename
+            encoded: bytes = filename.encode("windows-1252") + b"\0"
+            file_table += self.KEY_FILE.pack(bif_path.stat().st_size, names_offset + len(filenames), len(encoded), drives)
+            filenames += encoded
+
+        key_table = bytearray()
+        for resref, restype_id, res_id in self._keys.values():
+            key_table += Chitin.KEY_ENTRY.pack(resref.encode("windows-1252"), restype_id, res_id)
+
+        build: time.struct_time = time.gmtime()
+        header: bytes = self.KEY_HEADER.pack(
+            b"KEY ",
+            b"V1  ",
+            len(self._bifs),
+            len(self._keys),
+            file_table_offset,
+            names_offset + len(filenames),
+            build.tm_year - 1900,
+            build.tm_yday - 1,
+            b"",
         )
-        return resource is not None
+        self._key_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._key_path.open("wb") as file:
+            file.write(header + file_table + filenames + key_table)
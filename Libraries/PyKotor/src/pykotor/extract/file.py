@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import hashlib
 from contextlib import suppress
 from typing import TYPE_CHECKING, NamedTuple
 
+from pykotor.common.stream import MAPPED_FILES
 from pykotor.resource.type import ResourceType
 from pykotor.tools.misc import is_bif_file, is_capsule_file
 from utility.misc import generate_sha256_hash
@@ -15,7 +17,14 @@ if TYPE_CHECKING:
 
 
 class FileResource:
-    """Stores information for a resource regarding its name, type and where the data can be loaded from."""
+    """Stores information for a resource regarding its name, type and where the data can be loaded from.
+
+    Two FileResources compare equal when their data is equal. Resources at the same location are equal and resources of
+    different sizes are not without touching the disk; otherwise the SHA-256 hashes of both are computed on demand by
+    streaming the data in chunks and cached for as long as the size and modification time of the file are unchanged.
+    """
+
+    HASH_CHUNK_SIZE: int = 65536
 
     def __init__(
         self,
@@ -32,6 +41,7 @@ class FileResource:
         self._filepath: Path = Path.pathify(filepath)
 
         self._sha256_hash: str = ""
+        self._hash_stamp: tuple[int, int] | None = None  # size and mtime of the file when the hash was computed
         self._identifier = ResourceIdentifier(self._resname, self._restype)
 
     def __repr__(self) -> str:
@@ -55,13 +65,37 @@ class FileResource:
         other: FileResource | ResourceIdentifier | Path | bytes | bytearray | memoryview | object,
     ):
         if isinstance(other, FileResource):
+            if self is other or self.same_location(other):
+                return True
+            if self._size != other._size:
+                return False
             return self.get_sha256_hash() == other.get_sha256_hash()
-        if isinstance(other, (Path, bytes, bytearray, memoryview)):
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            if memoryview(other).nbytes != self._size:
+                return False
+            return self.get_sha256_hash() == generate_sha256_hash(other)
+        if isinstance(other, Path):
+            if other.stat().st_size != self._size:
+                return False
             return self.get_sha256_hash() == generate_sha256_hash(other)
         if isinstance(other, ResourceIdentifier):
             return self.identifier() == other
         return NotImplemented
 
+    def same_location(
+        self,
+        other: FileResource,
+    ) -> bool:
+        """Returns True if the other resource points at the exact same bytes on disk as this resource.
+
+        This never reads the resource data.
+        """
+        return (
+            self._offset == other._offset
+            and self._size == other._size
+            and self._filepath == other._filepath
+        )
+
     def resname(
         self,
     ) -> str:
@@ -105,7 +139,10 @@ class FileResource:
         *,
         reload: bool = False,
     ) -> bytes:
-        """Opens the file the resource is located at and returns the bytes data of the resource.
+        """Returns the bytes data of the resource.
+
+        The data is read from the file directly and no map of the file is kept, so it can be deleted or replaced
+        afterwards. Use view() to read from a shared memory map instead.
 
         Returns
         -------
@@ -124,16 +161,63 @@ class FileResource:
             elif not is_bif_file(self._filepath):  # bifs are read-only and there's no reason to reload them.
                 self._offset = 0
                 self._size = self._filepath.stat().st_size
+            self._sha256_hash = ""
 
         with self._filepath.open("rb") as file:
             file.seek(self._offset)
-            data: bytes = file.read(self._size)
-            self._sha256_hash = generate_sha256_hash(data)
-            return data
+            return file.read(self._size)
+
+    def view(
+        self,
+    ) -> memoryview:
+        """Returns a read-only memoryview of the resource data, mapped directly from the file the resource is located at.
+
+        The file is memory-mapped through the shared MAPPED_FILES pool so that repeated reads from the same BIF or capsule
+        do not reopen the file. The view can be passed straight to BinaryReader.from_bytes() or any read_* function.
+        Do not hold on to the view after the file has been rewritten.
+
+        Returns
+        -------
+            A memoryview of the resource data.
+        """
+        return MAPPED_FILES.view(self._filepath, self._offset, self._size)
+
+    def get_sha256_hash(
+        self,
+        *,
+        reload: bool = False,
+    ) -> str:
+        """Returns the SHA-256 hex digest of the resource data.
+
+        The hash is only computed the first time it is requested, by streaming the data from disk in chunks of
+        HASH_CHUNK_SIZE bytes so that large resources are never loaded into memory as a whole. It is recomputed once the
+        file has changed size or modification time, for example after its capsule was committed.
+
+        Args:
+        ----
+            reload: Recompute the hash even if it has already been computed.
+
+        Returns:
+        -------
+            The hex digest of the resource data.
+        """
+        stat_result: os.stat_result = self._filepath.stat()
+        stamp: tuple[int, int] = (stat_result.st_size, stat_result.st_mtime_ns)
+        if self._sha256_hash and self._hash_stamp == stamp and not reload:
+            return self._sha256_hash
 
-    def get_sha256_hash(self):
-        if not self._sha256_hash:
-            self.data()  # Ensure that the SHA256 hash is calculated
+        sha256_hash = hashlib.sha256()
+        with self._filepath.open("rb") as file:
+            file.seek(self._offset)
+            remaining: int = self._size
+            while remaining > 0:
+                chunk: bytes = file.read(min(remaining, self.HASH_CHUNK_SIZE))
+                if not chunk:
+                    break
+                sha256_hash.update(chunk)
+                remaining -= len(chunk)
+        self._sha256_hash = sha256_hash.hexdigest()
+        self._hash_stamp = stamp
         return self._sha256_hash
 
     def identifier(
@@ -0,0 +1,335 @@
+"""This module holds the on-disk cache of the resource lists read from the containers of an Installation."""
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from pykotor.extract.file import FileResource
+from pykotor.resource.type import ResourceType
+from pykotor.tools.path import DirectoryListingCache
+from utility.path import Path
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class CacheDependency(NamedTuple):
+    filepath: str
+    size: int
+    mtime_ns: int
+
+
+class CacheRecord(NamedTuple):
+    resname: str
+    restype_id: int
+    size: int
+    offset: int
+    dependency_index: int
+
+
+class CacheEntry(NamedTuple):
+    dependencies: list[CacheDependency]
+    records: list[CacheRecord]
+
+
+class InstallationIndexCache:
+    """Stores the list of FileResources for each container file (capsules, chitin.key) of an Installation on disk.
+
+    Every entry is fingerprinted by the size and modification time of the files its resources were read from, so an
+    entry is only returned while none of those files have changed. This lets an Installation skip parsing the headers
+    of every capsule and BIF on startup and only re-parse the containers that were modified since the last run.
+
+    The listings of loose folders (Override, streams, lips, rims, ...) are stored too, fingerprinted by the modification
+    time of every directory walked. A directory changes when files are added, removed or renamed in it, but not when a
+    file is rewritten in place, so the size of a loose file rewritten without a rename stays cached until the folder
+    changes. Installation.reload_override_file() refreshes a single file.
+    """
+
+    FILE_TYPE = b"PKIC"
+    FILE_VERSION = b"V1.1"
+
+    _HEADER = struct.Struct("<4s4sI")
+    _DEPENDENCY = struct.Struct("<QQ")
+    _RECORD = struct.Struct("<IIIH")
+    _LENGTH = struct.Struct("<I")
+
+    def __init__(
+        self,
+        path: os.PathLike | str,
+    ):
+        self._path: Path = Path.pathify(path)  # type: ignore[assignment]
+        self._entries: dict[str, CacheEntry] = {}
+        self._modified: bool = False
+        self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, container: os.PathLike | str):
+        return str(container) in self._entries
+
+    @staticmethod
+    def default_path(installation_path: os.PathLike | str) -> Path:
+        """Returns the default location of the cache file for an installation, inside the user's cache directory.
+
+        Args:
+        ----
+            installation_path: The path to the root folder of the installation.
+
+        Returns:
+        -------
+            The path to the cache file.
+        """
+        if os.name == "nt":
+            cache_root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~/AppData/Local")  # noqa: PTH111
+        else:
+            cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")  # noqa: PTH111
+        install_hash: str = hashlib.sha1(str(installation_path).encode("utf-8")).hexdigest()  # noqa: S324
+        return Path(cache_root, "pykotor", f"installation_{install_hash}.idx")
+
+    def path(self) -> Path:
+        return self._path
+
+    def get(
+        self,
+        container: os.PathLike | str,
+    ) -> list[FileResource] | None:
+        """Returns the cached resources of the container, or None if the container is not cached or has since changed.
+
+        Args:
+        ----
+            container: The path to the container file (a capsule or chitin.key).
+
+        Returns:
+        -------
+            A new list of FileResources or None.
+        """
+        entry: CacheEntry | None = self._entries.get(str(container))
+        if entry is None or not all(self._fingerprint(dependency.filepath) == dependency for dependency in entry.dependencies):
+            return None
+
+        filepaths: list[Path] = [Path(dependency.filepath) for dependency in entry.dependencies]
+        return [
+            FileResource(
+                record.resname,
+                ResourceType.from_id(record.restype_id),
+                record.size,
+                record.offset,
+                filepaths[record.dependency_index],
+            )
+            for record in entry.records
+        ]
+
+    def put(
+        self,
+        container: os.PathLike | str,
+        resources: Iterable[FileResource],
+    ) -> None:
+        """Stores the resources read from the container.
+
+        The container and every file the resources point into are fingerprinted.
+
+        Args:
+        ----
+            container: The path to the container file (a capsule or chitin.key).
+            resources: The resources that were read from the container.
+        """
+        container_str = str(container)
+        dependency_indices: dict[str, int] = {container_str: 0}
+        records: list[CacheRecord] = []
+        for resource in resources:
+            filepath_str = str(resource.filepath())
+            if filepath_str not in dependency_indices:
+                dependency_indices[filepath_str] = len(dependency_indices)
+            records.append(
+                CacheRecord(
+                    resource.resname(),
+                    resource.restype().type_id,
+                    resource.size(),
+                    resource.offset(),
+                    dependency_indices[filepath_str],
+                )
+            )
+        dependencies: list[CacheDependency] = [self._fingerprint(filepath) for filepath in dependency_indices]
+        self._entries[container_str] = CacheEntry(dependencies, records)
+        self._modified = True
+
+    def get_folder(
+        self,
+        folder: os.PathLike | str,
+        *,
+        recurse: bool = False,
+    ) -> dict[str, list[FileResource]] | None:
+        """Returns the cached listing of a loose folder, or None if the folder is not cached or a directory has changed.
+
+        Args:
+        ----
+            folder: The path to the folder.
+            recurse: Whether the listing includes every subfolder.
+
+        Returns:
+        -------
+            The resources found in each directory walked, keyed by the path of the directory, the folder first.
+        """
+        entry: CacheEntry | None = self._entries.get(self._folder_key(folder, recurse))
+        if entry is None or not all(self._fingerprint(dependency.filepath) == dependency for dependency in entry.dependencies):
+            return None
+
+        listing: dict[str, list[FileResource]] = {dependency.filepath: [] for dependency in entry.dependencies}
+        directories: list[str] = list(listing)
+        for record in entry.records:
+            restype: ResourceType = ResourceType.from_id(record.restype_id)
+            directory: str = directories[record.dependency_index]
+            filename: str = record.resname  # the resname of a folder record holds the filename, extension included
+            resname: str = filename[: len(filename) - len(restype.extension) - 1]
+            listing[directory].append(FileResource(resname, restype, record.size, 0, Path(directory, filename)))
+        return listing
+
+    def put_folder(
+        self,
+        folder: os.PathLike | str,
+        listing: dict[str, list[FileResource]],
+        *,
+        recurse: bool = False,
+    ) -> None:
+        """Stores the listing of a loose folder.
+
+        A listing is not stored if a directory changed within DirectoryListingCache.RACY_WINDOW_NS, since a filesystem
+        with a coarse mtime could hide a change made in that same tick. It is stored by a later load instead.
+
+        Args:
+        ----
+            folder: The path to the folder.
+            listing: The resources found in each directory walked, keyed by the path of the directory, the folder first.
+            recurse: Whether the listing includes every subfolder.
+        """
+        records: list[CacheRecord] = [
+            CacheRecord(resource.filepath().name, resource.restype().type_id, resource.size(), 0, dependency_index)
+            for dependency_index, resources in enumerate(listing.values())
+            for resource in resources
+        ]
+        dependencies: list[CacheDependency] = [self._fingerprint(directory) for directory in listing]
+        if any(time.time_ns() - dependency.mtime_ns < DirectoryListingCache.RACY_WINDOW_NS for dependency in dependencies):
+            self.discard(self._folder_key(folder, recurse))
+            return
+        self._entries[self._folder_key(folder, recurse)] = CacheEntry(dependencies, records)
+        self._modified = True
+
+    def discard(
+        self,
+        container: os.PathLike | str,
+    ) -> None:
+        if self._entries.pop(str(container), None) is not None:
+            self._modified = True
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._modified = True
+
+    def load(self) -> None:
+        """Reads the cache file from disk. A missing, outdated or corrupted cache file is treated as an empty cache."""
+        self._entries = {}
+        self._modified = False
+        try:
+            data: bytes = self._path.read_bytes()
+            self._entries = self._parse(data)
+        except (OSError, ValueError, UnicodeDecodeError, struct.error):
+            self._entries = {}
+
+    def save(self) -> None:
+        """Writes the cache file to disk if any entry has changed since it was loaded.
+
+        Entries for containers and folders that no longer exist are dropped. The file is written to a temporary file first and then
+        moved over the old one so that an interrupted write never leaves a partial cache behind.
+        """
+        for container in [container for container, entry in self._entries.items() if not os.path.exists(entry.dependencies[0].filepath)]:  # noqa: PTH110
+            del self._entries[container]
+            self._modified = True
+        if not self._modified:
+            return
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path: Path = self._path.with_name(f"{self._path.name}.tmp")
+        with temp_path.open("wb") as file:
+            file.write(self._serialize())
+        os.replace(temp_path, self._path)
+        self._modified = False
+
+    @staticmethod
+    def _folder_key(folder: os.PathLike | str, recurse: bool) -> str:  # noqa: FBT001
+        return os.path.join(str(folder), "**" if recurse else "*")  # noqa: PTH118
+
+    @staticmethod
+    def _fingerprint(filepath: str) -> CacheDependency:
+        try:
+            stat_result: os.stat_result = os.stat(filepath)  # noqa: PTH116
+        except OSError:
+            return CacheDependency(filepath, -1, -1)
+        return CacheDependency(filepath, stat_result.st_size, stat_result.st_mtime_ns)
+
+    def _serialize(self) -> bytes:
+        data = bytearray(self._HEADER.pack(self.FILE_TYPE, self.FILE_VERSION, len(self._entries)))
+
+        def write_text(text: str):
+            encoded: bytes = text.encode("utf-8")
+            data.extend(self._LENGTH.pack(len(encoded)))
+            data.extend(encoded)
+
+        for container, entry in self._entries.items():
+            write_text(container)
+            data.extend(self._LENGTH.pack(len(entry.dependencies)))
+            for dependency in entry.dependencies:
+                write_text(dependency.filepath)
+                data.extend(self._DEPENDENCY.pack(max(dependency.size, 0), max(dependency.mtime_ns, 0)))
+            data.extend(self._LENGTH.pack(len(entry.records)))
+            write_text("\0".join(record.resname for record in entry.records))
+            for record in entry.records:
+                data.extend(self._RECORD.pack(record.restype_id, record.size, record.offset, record.dependency_index))
+        return bytes(data)
+
+    def _parse(self, data: bytes) -> dict[str, CacheEntry]:
+        file_type, file_version, entry_count = self._HEADER.unpack_from(data, 0)
+        if file_type != self.FILE_TYPE or file_version != self.FILE_VERSION:
+            msg = "Unsupported installation index cache file."
+            raise ValueError(msg)
+        position: int = self._HEADER.size
+
+        def read_length() -> int:
+            nonlocal position
+            value: int = self._LENGTH.unpack_from(data, position)[0]
+            position += self._LENGTH.size
+            return value
+
+        def read_text() -> str:
+            nonlocal position
+            length: int = read_length()
+            text: str = data[position : position + length].decode("utf-8")
+            position += length
+            return text
+
+        entries: dict[str, CacheEntry] = {}
+        for _ in range(entry_count):
+            container: str = read_text()
+            dependencies: list[CacheDependency] = []
+            for _ in range(read_length()):
+                filepath: str = read_text()
+                size, mtime_ns = self._DEPENDENCY.unpack_from(data, position)
+                position += self._DEPENDENCY.size
+                dependencies.append(CacheDependency(filepath, size, mtime_ns))
+
+            record_count: int = read_length()
+            resnames: list[str] = read_text().split("\0") if record_count else []
+            records_end: int = position + record_count * self._RECORD.size
+            records: list[CacheRecord] = [
+                CacheRecord(resname, *fields)
+                for resname, fields in zip(resnames, self._RECORD.iter_unpack(data[position:records_end]))
+            ]
+            if len(records) != record_count:
+                msg = "Truncated installation index cache file."
+                raise ValueError(msg)
+            position = records_end
+            entries[container] = CacheEntry(dependencies, records)
+        return entries
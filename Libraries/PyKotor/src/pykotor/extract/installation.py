@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import os
 import re
-from contextlib import suppress
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext, suppress
 from copy import copy
 from enum import Enum, IntEnum
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generator, NamedTuple
@@ -12,6 +16,7 @@ from pykotor.common.stream import BinaryReader
 from pykotor.extract.capsule import Capsule
 from pykotor.extract.chitin import Chitin
 from pykotor.extract.file import FileResource, LocationResult, ResourceIdentifier, ResourceResult
+from pykotor.extract.index_cache import InstallationIndexCache
 from pykotor.extract.talktable import StringResult, TalkTable
 from pykotor.resource.formats.gff import read_gff
 from pykotor.resource.formats.tpc import TPC, read_tpc
@@ -22,8 +27,6 @@ from pykotor.tools.sound import fix_audio
 from utility.path import Path, PurePath
 
 if TYPE_CHECKING:
-    import os
-
     from pykotor.resource.formats.gff import GFF
 
 
@@ -150,9 +153,51 @@ class Installation:
         ResourceType.TGA,
         ResourceType.DDS,
     ]
+    # the load phases (see load()) that populate the resources of each search location
+    LOCATION_PHASES: ClassVar[dict[SearchLocation, tuple[str, ...]]] = {
+        SearchLocation.OVERRIDE: ("override",),
+        SearchLocation.MODULES: ("modules",),
+        SearchLocation.CHITIN: ("chitin",),
+        SearchLocation.TEXTURES_TPA: ("textures",),
+        SearchLocation.TEXTURES_TPB: ("textures",),
+        SearchLocation.TEXTURES_TPC: ("textures",),
+        SearchLocation.TEXTURES_GUI: ("textures",),
+        SearchLocation.MUSIC: ("streammusic",),
+        SearchLocation.SOUND: ("streamsounds",),
+        SearchLocation.VOICE: ("streamwaves", "streamvoice"),
+        SearchLocation.LIPS: ("lips",),
+        SearchLocation.RIMS: ("rims",),
+    }
+
+    def __init__(
+        self,
+        path: os.PathLike | str,
+        *,
+        index_cache_path: os.PathLike | str | None = None,
+        max_workers: int = 1,
+        lazy: bool = False,
+    ):
+        """Initializes the Installation and loads the resource lists of every location.
 
-    def __init__(self, path: os.PathLike | str):
+        Args:
+        ----
+            path: The path to the root folder of the installation.
+            index_cache_path: If set, the resource lists of capsules and the chitin are cached in this file and only
+                re-read from containers that changed since the last load. See InstallationIndexCache.default_path().
+            max_workers: The number of threads used to read capsule headers and BIF tables. With more than 1, every
+                location is also listed concurrently. The loaded resource lists are the same either way.
+            lazy: If True, nothing is loaded up front. Each location is loaded the first time a method needs its
+                resources, so a script that only reads the talk tables or a single location skips everything else.
+        """
         self._path: CaseAwarePath = CaseAwarePath.pathify(path)
+        self._max_workers: int = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._load_timings: dict[str, float] = {}
+        self._loaded: set[str] = set()  # names of the load phases whose resource lists are populated, added by each load_*()
+        self._load_lock: threading.RLock = threading.RLock()
+        self._index_cache: InstallationIndexCache | None = None
+        if index_cache_path is not None:
+            self._index_cache = InstallationIndexCache(index_cache_path)
 
         self._talktable: TalkTable = TalkTable(self._path / "dialog.tlk")
         self._female_talktable: TalkTable = TalkTable(self._path / "dialogf.tlk")
@@ -164,30 +209,105 @@ class Installation:
 
         self._override: dict[str, list[FileResource]] = {}
 
-        self._chitin: list[FileResource] = []
+        self._chitin: list[FileResource] | Chitin = []  # a Chitin keeps its resources compact until they are used
         self._streammusic: list[FileResource] = []
         self._streamsounds: list[FileResource] = []
         self._streamwaves: list[FileResource] = []
         self._game: Game | None = None
-        self.load()
+
+        # precomputed lookup tables for each search location, see _location_index().
+        self._location_indexes: dict[SearchLocation, dict[ResourceIdentifier, list[LocationResult]]] = {}
+        if not lazy:
+            self.load()
 
     def load(self):
-        self.load_chitin()
-        self.load_lips()
-        self.load_modules()
-        self.load_override()
-        if self.game() == Game.K1:
-            self.load_rims()
-        self.load_streammusic()
-        self.load_streamsounds()
+        """Loads the resource lists of every location, timing each phase. See load_timings()."""
+        self._load_timings = {}
+        start = time.perf_counter()
+        phases: list[tuple[str, Callable[[], None]]] = list(self._load_phases().items())
+        if self._max_workers > 1:
+            # Phases only list folders and wait on the capsules they submit to the worker pool, so they get their own
+            # threads; running them on the worker pool could deadlock once every worker waits on a queued capsule.
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor, ThreadPoolExecutor(max_workers=len(phases)) as phase_executor:
+                self._executor = executor
+                try:
+                    futures = [phase_executor.submit(self._load_phase, method) for _, method in phases]
+                    for (name, _), future in zip(phases, futures):
+                        self._load_timings[name] = future.result()
+                finally:
+                    self._executor = None
+        else:
+            for name, method in phases:
+                self._load_timings[name] = self._load_phase(method)
+
+        self._load_timings["location_indexes"] = self._load_phase(self.build_location_indexes)
+        self.save_index_cache()
+        print(f"Finished loading the installation from {self._path!s} in {time.perf_counter() - start:.2f}s")
+
+    def _load_phases(self) -> dict[str, Callable[[], None]]:
+        """Returns the load method of every location the game has, keyed by phase name."""
+        phases: dict[str, Callable[[], None]] = {
+            "chitin": self.load_chitin,
+            "lips": self.load_lips,
+            "modules": self.load_modules,
+            "override": self.load_override,
+            "streammusic": self.load_streammusic,
+            "streamsounds": self.load_streamsounds,
+            "textures": self.load_textures,
+        }
         if self.game() == Game.K1:
-            self.load_streamwaves()
+            phases["rims"] = self.load_rims
+            phases["streamwaves"] = self.load_streamwaves
         elif self.game() == Game.K2:
-            self.load_streamvoice()
-        self.load_textures()
-        print(f"Finished loading the installation from {self._path!s}")
+            phases["streamvoice"] = self.load_streamvoice
+        return phases
+
+    def _load_phase(
+        self,
+        method: Callable[[], None],
+    ) -> float:
+        start = time.perf_counter()
+        method()
+        return time.perf_counter() - start
+
+    def _require(self, *names: str) -> None:
+        """Loads the named phases that have not been loaded yet. Names of phases the game does not have are ignored.
+
+        This is what makes a lazy Installation transparent: every method reading a resource list calls this first.
+        """
+        if self._loaded.issuperset(names):
+            return
+        with self._load_lock:
+            phases: dict[str, Callable[[], None]] = self._load_phases()
+            missing: list[str] = [name for name in names if name in phases and name not in self._loaded]
+            if not missing:
+                return
+            with ThreadPoolExecutor(max_workers=self._max_workers) if self._max_workers > 1 else nullcontext() as executor:
+                self._executor = executor
+                try:
+                    for name in missing:
+                        self._load_timings[name] = self._load_phase(phases[name])
+                finally:
+                    self._executor = None
+            self.save_index_cache()
+
+    def _require_location(self, location: SearchLocation) -> None:
+        self._require(*self.LOCATION_PHASES.get(location, ()))
+
+    def load_timings(self) -> dict[str, float]:
+        """Returns the number of seconds each phase of the last load() took, keyed by phase name.
+
+        With more than one worker the phases overlap, so their sum is larger than the time load() took.
+
+        Returns:
+        -------
+            A dictionary mapping a phase name (such as "chitin", "modules" or "location_indexes") to seconds.
+        """
+        return dict(self._load_timings)
 
     def __iter__(self) -> Generator[FileResource, Any, None]:
+        self._require(*self._load_phases())
+
         def generator() -> Generator[FileResource, Any, None]:
             yield from self._chitin
             yield from self._streammusic
@@ -376,50 +496,124 @@ class Installation:
             print(f"The '{path.name}' folder did not exist at '{self.path()!s}' when loading the installation, skipping...")
             return resources
 
-        files_list: list[CaseAwarePath] = list(
-            path.safe_rglob("*")
-            if recurse
-            else path.safe_iterdir(),
-        )
+        files_list: list[FileResource] = [file for files in self._folder_listing(path, recurse=recurse).values() for file in files]
+        capsules: dict[str, list[FileResource]] = {}
+        if capsule_check and self._executor is not None:
+            capsule_files: list[CaseAwarePath] = [CaseAwarePath(file.filepath()) for file in files_list if capsule_check(file.filepath())]
+            capsules = dict(zip((file.name for file in capsule_files), self._executor.map(self._capsule_resources, capsule_files)))
         for file in files_list:
-            if capsule_check and capsule_check(file):
-                resources[file.name] = list(Capsule(file))  # type: ignore[assignment, call-overload]
+            filepath: Path = file.filepath()
+            if capsule_check and capsule_check(filepath):
+                # Filled in the listing order whether or not the capsules were read concurrently.
+                resources[filepath.name] = capsules[filepath.name] if filepath.name in capsules else self._capsule_resources(CaseAwarePath(filepath))  # type: ignore[assignment, call-overload]
             else:
-                resname, restype = ResourceIdentifier.from_path(file)
-                if restype.is_invalid:
-                    continue
-                resource = FileResource(
-                    resname,
-                    restype,
-                    file.stat().st_size,
-                    0,
-                    file,
-                )
-                resources.append(resource)  # type: ignore[assignment, call-overload, union-attr]
+                resources.append(file)  # type: ignore[assignment, call-overload, union-attr]
         if not resources or not files_list:
             print(f"No resources found at '{path!s}' when loading the installation, skipping...")
         else:
             print(f"Loading '{path.name}' folder from installation...")
         return resources
 
+    def _folder_listing(
+        self,
+        path: CaseAwarePath,
+        *,
+        recurse: bool = False,
+    ) -> dict[str, list[FileResource]]:
+        """Lists the files with a valid resource type in a folder, using the index cache where possible.
+
+        Subfolders are walked depth first, so the files are listed in the same order as path.rglob() yields them.
+
+        Returns:
+        -------
+            The resources found in each directory walked, keyed by the path of the directory, the folder first.
+        """
+        if self._index_cache is not None:
+            cached: dict[str, list[FileResource]] | None = self._index_cache.get_folder(path, recurse=recurse)
+            if cached is not None:
+                return cached
+
+        listing: dict[str, list[FileResource]] = {}
+        complete: bool = True  # a listing that skipped anything because of an error is not cached
+
+        def walk(directory: str):
+            nonlocal complete
+            resources: list[FileResource] = listing.setdefault(directory, [])
+            subfolders: list[str] = []
+            try:
+                with os.scandir(directory) as scanner:
+                    for entry in scanner:
+                        try:
+                            if entry.is_dir():
+                                if recurse and not entry.is_symlink():
+                                    subfolders.append(entry.path)
+                                continue
+                            resname, restype = ResourceIdentifier.from_path(entry.name)
+                            if not restype.is_invalid:
+                                resources.append(FileResource(resname, restype, entry.stat().st_size, 0, entry.path))
+                        except OSError:  # e.g. a broken symlink, only that entry is skipped
+                            complete = False
+            except OSError:
+                complete = False
+            for subfolder in subfolders:
+                walk(subfolder)
+
+        walk(str(path))
+        if self._index_cache is not None and complete:
+            self._index_cache.put_folder(path, listing, recurse=recurse)
+        return listing
+
+    def _capsule_resources(self, path: CaseAwarePath) -> list[FileResource]:
+        """Returns the list of resources stored in the capsule, using the index cache where possible."""
+        if self._index_cache is not None:
+            cached: list[FileResource] | None = self._index_cache.get(path)
+            if cached is not None:
+                return cached
+        resources: list[FileResource] = list(Capsule(path))
+        if self._index_cache is not None:
+            self._index_cache.put(path, resources)
+        return resources
+
+    def save_index_cache(self) -> None:
+        """Writes the index cache to disk, if the Installation was created with one."""
+        if self._index_cache is None:
+            return
+        try:
+            self._index_cache.save()
+        except OSError as e:
+            print(f"Could not write the installation index cache to '{self._index_cache.path()}': {e}")
+
     def load_chitin(self) -> None:
         """Reloads the list of resources in the Chitin linked to the Installation."""
         chitin_path: CaseAwarePath = self._path / "chitin.key"
         if not chitin_path.exists():
             print(f"The chitin.key file did not exist at '{self._path!s}' when loading the installation, skipping...")
+            self._loaded.add("chitin")
             return
         print("Load chitin...")
-        self._chitin = list(Chitin(key_path=chitin_path))
+        cached: list[FileResource] | None = None if self._index_cache is None else self._index_cache.get(chitin_path)
+        if cached is None:
+            self._chitin = Chitin(key_path=chitin_path, max_workers=self._max_workers)
+            if self._index_cache is not None:
+                self._index_cache.put(chitin_path, self._chitin)
+        else:
+            self._chitin = cached
+        self._invalidate_location_index(SearchLocation.CHITIN)
+        self._loaded.add("chitin")
 
     def load_lips(
         self,
     ) -> None:
         """Reloads the list of modules in the lips folder linked to the Installation."""
         self._lips = self.load_resources(self.lips_path(), capsule_check=is_mod_file)  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.LIPS)
+        self._loaded.add("lips")
 
     def load_modules(self) -> None:
         """Reloads the list of modules files in the modules folder linked to the Installation."""
         self._modules = self.load_resources(self.module_path(), capsule_check=is_capsule_file)  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.MODULES)
+        self._loaded.add("modules")
 
     def reload_module(self, module: str) -> None:
         """Reloads the list of resources in specified module in the modules folder linked to the Installation.
@@ -428,19 +622,34 @@ class Installation:
         ----
             module: The filename of the module.
         """
-        self._modules[module] = list(Capsule(self.module_path() / module))
+        self._require("modules")
+        module_path: CaseAwarePath = self.module_path() / module
+        self._modules[module] = list(Capsule(module_path))
+        self._invalidate_location_index(SearchLocation.MODULES)
+        if self._index_cache is not None:
+            self._index_cache.put(module_path, self._modules[module])
+            self.save_index_cache()
 
     def load_rims(
         self,
     ) -> None:
         """Reloads the list of module files in the rims folder linked to the Installation."""
         self._rims = self.load_resources(self.rims_path(), capsule_check=is_rim_file)  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.RIMS)
+        self._loaded.add("rims")
 
     def load_textures(
         self,
     ) -> None:
         """Reloads the list of modules files in the texturepacks folder linked to the Installation."""
         self._texturepacks = self.load_resources(self.texturepacks_path(), capsule_check=is_erf_file)  # type: ignore[assignment]
+        self._invalidate_location_index(
+            SearchLocation.TEXTURES_TPA,
+            SearchLocation.TEXTURES_TPB,
+            SearchLocation.TEXTURES_TPC,
+            SearchLocation.TEXTURES_GUI,
+        )
+        self._loaded.add("textures")
 
     def load_override(self, directory: str | None = None) -> None:
         """Loads the list of resources in a specific subdirectory of the override folder linked to the Installation.
@@ -460,16 +669,20 @@ class Installation:
         """
         override_path = self.override_path()
         if directory:
-            target_dirs = [override_path / directory]
+            self._require("override")
+            folder = override_path / directory
             self._override[directory] = []
+            self._override[folder.relative_to(override_path).as_posix()] = self.load_resources(folder)  # type: ignore[assignment]
         else:
-            target_dirs = [f for f in override_path.safe_rglob("*") if f.safe_isdir()]
-            target_dirs.append(override_path)
-            self._override = {}
-
-        for folder in target_dirs:
-            relative_folder = folder.relative_to(override_path).as_posix()  # '.' if folder is the same as override_path
-            self._override[relative_folder] = self.load_resources(folder)  # type: ignore[assignment]
+            # A single recursive listing, so the index cache only has to check the directories on a warm start.
+            listing: dict[str, list[FileResource]] = self._folder_listing(override_path, recurse=True)
+            root, *subfolders = listing
+            self._override = {
+                os.path.relpath(folder, root).replace(os.sep, "/"): listing[folder]  # '.' for the override folder itself
+                for folder in [*subfolders, root]
+            }
+            self._loaded.add("override")
+        self._invalidate_location_index(SearchLocation.OVERRIDE)
 
     def reload_override(self, directory: str) -> None:
         """Reload the resources in the specified override subdirectory.
@@ -499,28 +712,117 @@ class Installation:
             0,
             filepath,
         )
+        self._require("override")
         override_list: list[FileResource] = self._override[str(rel_folderpath)]
-        if resource not in override_list:
+        index: int | None = next(
+            (i for i, existing in enumerate(override_list) if existing.filepath() == resource.filepath()),
+            None,
+        )
+        if index is None:
             print(f"Cannot reload override file '{identifier!s}'. File not found in ", rel_folderpath)
             return
-        index: int = override_list.index(resource)
         override_list[index] = resource
+        self._invalidate_location_index(SearchLocation.OVERRIDE)
 
     def load_streammusic(self) -> None:
         """Reloads the list of resources in the streammusic folder linked to the Installation."""
         self._streammusic = self.load_resources(self.streammusic_path())  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.MUSIC)
+        self._loaded.add("streammusic")
 
     def load_streamsounds(self) -> None:
         """Reloads the list of resources in the streamsounds folder linked to the Installation."""
         self._streamsounds = self.load_resources(self.streamsounds_path())  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.SOUND)
+        self._loaded.add("streamsounds")
 
     def load_streamwaves(self) -> None:
         """Reloads the list of resources in the streamwaves folder linked to the Installation."""
         self._streamwaves = self.load_resources(self._find_resource_folderpath("streamwaves"), recurse=True)  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.VOICE)
+        self._loaded.add("streamwaves")
 
     def load_streamvoice(self) -> None:
         """Reloads the list of resources in the streamvoice folder linked to the Installation."""
         self._streamwaves = self.load_resources(self._find_resource_folderpath("streamvoice"), recurse=True)  # type: ignore[assignment]
+        self._invalidate_location_index(SearchLocation.VOICE)
+        self._loaded.add("streamvoice")
+
+    # endregion
+
+    # region Location Index
+    def build_location_indexes(self) -> None:
+        """Builds the lookup table of every search location linked to the Installation.
+
+        Each table maps a ResourceIdentifier to the list of places it can be found in that location, in the same order
+        the resource lists are stored in. Tables are invalidated whenever the underlying resource lists are reloaded
+        and are lazily rebuilt on the next query.
+        """
+        self._location_indexes = {}
+        for location in SearchLocation:
+            if location in {SearchLocation.CUSTOM_MODULES, SearchLocation.CUSTOM_FOLDERS}:
+                continue
+            self._location_index(location)
+
+    def _invalidate_location_index(self, *locations: SearchLocation) -> None:
+        for location in locations:
+            self._location_indexes.pop(location, None)
+
+    def _location_index(self, location: SearchLocation) -> dict[ResourceIdentifier, list[LocationResult]]:
+        """Returns the lookup table of the specified search location, building it first if required.
+
+        Args:
+        ----
+            location: The search location, cannot be CUSTOM_MODULES or CUSTOM_FOLDERS.
+
+        Returns:
+        -------
+            A dictionary mapping a resource identifier to a list of locations.
+        """
+        index: dict[ResourceIdentifier, list[LocationResult]] | None = self._location_indexes.get(location)
+        if index is not None:
+            return index
+
+        index = {}
+        for resources in self._location_resource_lists(location):
+            # Only the last duplicate within a single container is used, matching how the game reads the container.
+            container: dict[ResourceIdentifier, FileResource] = {resource.identifier(): resource for resource in resources}
+            for identifier, resource in container.items():
+                location_result = LocationResult(resource.filepath(), resource.offset(), resource.size())
+                if identifier in index:
+                    index[identifier].append(location_result)
+                else:
+                    index[identifier] = [location_result]
+        self._location_indexes[location] = index
+        return index
+
+    def _location_resource_lists(self, location: SearchLocation) -> list[list[FileResource]]:
+        texturepack_names: dict[SearchLocation, TexturePackNames] = {
+            SearchLocation.TEXTURES_TPA: TexturePackNames.TPA,
+            SearchLocation.TEXTURES_TPB: TexturePackNames.TPB,
+            SearchLocation.TEXTURES_TPC: TexturePackNames.TPC,
+            SearchLocation.TEXTURES_GUI: TexturePackNames.GUI,
+        }
+        self._require_location(location)
+        if location == SearchLocation.OVERRIDE:
+            return list(self._override.values())
+        if location == SearchLocation.MODULES:
+            return list(self._modules.values())
+        if location == SearchLocation.LIPS:
+            return list(self._lips.values())
+        if location == SearchLocation.RIMS:
+            return list(self._rims.values())
+        if location in texturepack_names:
+            return [self._texturepacks.get(texturepack_names[location].value, [])]
+        if location == SearchLocation.CHITIN:
+            return [self._chitin]
+        if location == SearchLocation.MUSIC:
+            return [self._streammusic]
+        if location == SearchLocation.SOUND:
+            return [self._streamsounds]
+        if location == SearchLocation.VOICE:
+            return [self._streamwaves]
+        return []
 
     # endregion
 
@@ -532,6 +834,7 @@ class Installation:
         -------
             A list of FileResources.
         """
+        self._require("chitin")
         return self._chitin[:]
 
     def modules_list(self) -> list[str]:
@@ -543,6 +846,7 @@ class Installation:
         -------
             A list of filenames.
         """
+        self._require("modules")
         return list(self._modules.keys())
 
     def module_resources(self, filename: str) -> list[FileResource]:
@@ -554,6 +858,7 @@ class Installation:
         -------
             A list of FileResources.
         """
+        self._require("modules")
         return self._modules[filename][:]
 
     def lips_list(self) -> list[str]:
@@ -565,6 +870,7 @@ class Installation:
         -------
             A list of filenames.
         """
+        self._require("lips")
         return list(self._lips.keys())
 
     def lip_resources(self, filename: str) -> list[FileResource]:
@@ -576,6 +882,7 @@ class Installation:
         -------
             A list of FileResources.
         """
+        self._require("lips")
         return self._lips[filename][:]
 
     def texturepacks_list(self) -> list[str]:
@@ -585,6 +892,7 @@ class Installation:
         -------
             A list of filenames.
         """
+        self._require("textures")
         return list(self._texturepacks.keys())
 
     def texturepack_resources(self, filename: str) -> list[FileResource]:
@@ -596,6 +904,7 @@ class Installation:
         -------
             A list of FileResources.
         """
+        self._require("textures")
         return self._texturepacks[filename][:]
 
     def override_list(self) -> list[str]:
@@ -607,6 +916,7 @@ class Installation:
         -------
             A list of subdirectories.
         """
+        self._require("override")
         return list(self._override.keys())
 
     def override_resources(self, directory: str) -> list[FileResource]:
@@ -618,6 +928,7 @@ class Installation:
         -------
             A list of FileResources.
         """
+        self._require("override")
         return self._override[directory]
 
     # endregion
@@ -816,35 +1127,34 @@ class Installation:
             folders=folders,
         )
 
-        handles: dict[ResourceIdentifier, BinaryReader] = {}
-
-        for query in queries:
-            location_list: list[LocationResult] = locations.get(query, [])
-
-            if not location_list:
-                print(f"Resource not found: '{query}'")
-                results[query] = None
-                continue
-
-            location: LocationResult = location_list[0]
-
-            if query not in handles:
-                handles[query] = BinaryReader.from_file(location.filepath)
-
-            handle: BinaryReader = handles[query]
-            handle.seek(location.offset)
-            data: bytes = handle.read_bytes(location.size)
+        # one handle per file, shared by every query located in it and closed once all of them are read, so no file
+        # is left open afterwards.
+        handles: dict[Path, BinaryReader] = {}
+        try:
+            for query in queries:
+                location_list: list[LocationResult] = locations.get(query, [])
 
-            results[query] = ResourceResult(
-                query.resname,
-                query.restype,
-                location.filepath,
-                data,
-            )
+                if not location_list:
+                    print(f"Resource not found: '{query}'")
+                    results[query] = None
+                    continue
 
-        # Close all open handles
-        for handle in handles.values():
-            handle.close()
+                location: LocationResult = location_list[0]
+                if location.filepath not in handles:
+                    handles[location.filepath] = BinaryReader.from_file(location.filepath)
+                handle: BinaryReader = handles[location.filepath]
+                handle.seek(location.offset)
+                data: bytes = handle.read_bytes(location.size)
+
+                results[query] = ResourceResult(
+                    query.resname,
+                    query.restype,
+                    location.filepath,
+                    data,
+                )
+        finally:
+            for handle in handles.values():
+                handle.close()
 
         return results
 
@@ -928,22 +1238,12 @@ class Installation:
         for qinden in queries:
             locations[qinden] = []
 
-        def check_dict(values: dict[str, list[FileResource]]):
-            for resources in values.values():
-                check_list(resources)
-
-        def check_list(values: list[FileResource]):
-            # Index resources by identifier
-            resource_dict: dict[ResourceIdentifier, FileResource] = {resource.identifier(): resource for resource in values}
+        def check_index(location: SearchLocation):
+            index: dict[ResourceIdentifier, list[LocationResult]] = self._location_index(location)
             for query in queries:
-                if query in resource_dict:
-                    resource: FileResource = resource_dict[query]
-                    location = LocationResult(
-                        resource.filepath(),
-                        resource.offset(),
-                        resource.size(),
-                    )
-                    locations[query].append(location)
+                found: list[LocationResult] | None = index.get(query)
+                if found:
+                    locations[query].extend(found)
 
         def check_capsules(values: list[Capsule]):
             for capsule in values:
@@ -957,40 +1257,29 @@ class Installation:
                         )
                         locations[resource.identifier()].append(location)
 
-
         def check_folders(values: list[Path]):
+            query_filenames: set[str] = {str(query) for query in queries}
             for folder in values:
                 for file in folder.rglob("*"):
-                    if file.safe_isfile():
-                        identifier = ResourceIdentifier.from_path(file)
-                        if identifier in queries:
-                            location = LocationResult(
-                                file,
-                                0,
-                                file.stat().st_size,
-                            )
-                            locations[identifier].append(location)
+                    if file.name.lower() not in query_filenames or not file.safe_isfile():
+                        continue
+                    identifier = ResourceIdentifier.from_path(file)
+                    if identifier in queries:
+                        location = LocationResult(
+                            file,
+                            0,
+                            file.stat().st_size,
+                        )
+                        locations[identifier].append(location)
 
         function_map: dict[SearchLocation, Callable] = {
-            SearchLocation.OVERRIDE: lambda: check_dict(self._override),
-            SearchLocation.MODULES: lambda: check_dict(self._modules),
-            SearchLocation.LIPS: lambda: check_dict(self._lips),
-            SearchLocation.RIMS: lambda: check_dict(self._rims),
-            SearchLocation.TEXTURES_TPA: lambda: check_list(self._texturepacks[TexturePackNames.TPA.value]),
-            SearchLocation.TEXTURES_TPB: lambda: check_list(self._texturepacks[TexturePackNames.TPB.value]),
-            SearchLocation.TEXTURES_TPC: lambda: check_list(self._texturepacks[TexturePackNames.TPC.value]),
-            SearchLocation.TEXTURES_GUI: lambda: check_list(self._texturepacks[TexturePackNames.GUI.value]),
-            SearchLocation.CHITIN: lambda: check_list(self._chitin),
-            SearchLocation.MUSIC: lambda: check_list(self._streammusic),
-            SearchLocation.SOUND: lambda: check_list(self._streamsounds),
-            SearchLocation.VOICE: lambda: check_list(self._streamwaves),
             SearchLocation.CUSTOM_MODULES: lambda: check_capsules(capsules),  # type: ignore[arg-type]
             SearchLocation.CUSTOM_FOLDERS: lambda: check_folders(folders),  # type: ignore[arg-type]
         }
 
         for item in order:
             assert isinstance(item, SearchLocation)
-            function_map.get(item, lambda: None)()
+            function_map.get(item, lambda item=item: check_index(item))()
 
         return locations
 
@@ -1155,6 +1444,7 @@ class Installation:
 
         for item in order:
             assert isinstance(item, SearchLocation)
+            self._require_location(item)
             function_map.get(item, lambda: None)()
 
         return textures
@@ -1282,6 +1572,7 @@ class Installation:
 
         for item in order:
             assert isinstance(item, SearchLocation)
+            self._require_location(item)
             function_map.get(item, lambda: None)()
 
         return sounds
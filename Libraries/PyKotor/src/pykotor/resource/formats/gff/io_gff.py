@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-from typing import Any
+import struct
+import sys
+from array import array
+from typing import TYPE_CHECKING, Any
 
+from pykotor.common.geometry import Vector3, Vector4
+from pykotor.common.language import LocalizedString
 from pykotor.common.misc import ResRef
 from pykotor.common.stream import BinaryWriter
 from pykotor.resource.formats.gff.gff_data import GFF, GFFContent, GFFFieldType, GFFList, GFFStruct
 from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES, ResourceReader, ResourceWriter, autoclose
+from pykotor.tools.encoding import decode_bytes_with_fallbacks
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 _COMPLEX_FIELD: set[GFFFieldType] = {
     GFFFieldType.UInt64,
@@ -20,7 +29,89 @@ _COMPLEX_FIELD: set[GFFFieldType] = {
 }
 
 
+_HEADER = struct.Struct("<12I")
+_STRUCT_ENTRY = struct.Struct("<iII")
+_FIELD_ENTRY = struct.Struct("<III")
+_LOCSTRING_HEADER = struct.Struct("<II")
+_LOCSTRING_SUBSTRING = struct.Struct("<II")
+_UINT32 = struct.Struct("<I")
+_UINT64 = struct.Struct("<Q")
+_INT64 = struct.Struct("<q")
+_SINGLE = struct.Struct("<f")
+_DOUBLE = struct.Struct("<d")
+_VECTOR3 = struct.Struct("<3f")
+_VECTOR4 = struct.Struct("<4f")
+
+_FIELD_TYPES: dict[int, GFFFieldType] = {field_type.value: field_type for field_type in GFFFieldType}
+
+# Simple fields store their value in the last 4 bytes of the field entry, which is unpacked as a uint32.
+_SIMPLE_DECODERS: dict[GFFFieldType, Callable[[int], int]] = {
+    GFFFieldType.UInt8: lambda data: data & 0xFF,
+    GFFFieldType.Int8: lambda data: ((data & 0xFF) ^ 0x80) - 0x80,
+    GFFFieldType.UInt16: lambda data: data & 0xFFFF,
+    GFFFieldType.Int16: lambda data: ((data & 0xFFFF) ^ 0x8000) - 0x8000,
+    GFFFieldType.UInt32: lambda data: data,
+    GFFFieldType.Int32: lambda data: (data ^ 0x80000000) - 0x80000000,
+}
+
+# The inverse of _SIMPLE_DECODERS, a value of -1 is stored as 0xFFFFFFFF for the unsigned types.
+_SIMPLE_ENCODERS: dict[GFFFieldType, Callable[[Any], int]] = {
+    GFFFieldType.UInt8: lambda value: 0xFFFFFFFF if value == -1 else value,
+    GFFFieldType.Int8: lambda value: value + 0x100000000 if value < 0 else value,
+    GFFFieldType.UInt16: lambda value: 0xFFFFFFFF if value == -1 else value,
+    GFFFieldType.Int16: lambda value: value + 0x100000000 if value < 0 else value,
+    GFFFieldType.UInt32: lambda value: 0xFFFFFFFF if value == -1 else value,
+    GFFFieldType.Int32: lambda value: value + 0x100000000 if value < 0 else value,
+    GFFFieldType.Single: lambda value: _UINT32.unpack(_SINGLE.pack(value))[0],
+}
+
+_SETTERS: dict[GFFFieldType, Callable[[GFFStruct, str, Any], Any]] = {
+    GFFFieldType.UInt8: GFFStruct.set_uint8,
+    GFFFieldType.Int8: GFFStruct.set_int8,
+    GFFFieldType.UInt16: GFFStruct.set_uint16,
+    GFFFieldType.Int16: GFFStruct.set_int16,
+    GFFFieldType.UInt32: GFFStruct.set_uint32,
+    GFFFieldType.Int32: GFFStruct.set_int32,
+    GFFFieldType.UInt64: GFFStruct.set_uint64,
+    GFFFieldType.Int64: GFFStruct.set_int64,
+    GFFFieldType.Single: GFFStruct.set_single,
+    GFFFieldType.Double: GFFStruct.set_double,
+    GFFFieldType.String: GFFStruct.set_string,
+    GFFFieldType.ResRef: GFFStruct.set_resref,
+    GFFFieldType.LocalizedString: GFFStruct.set_locstring,
+    GFFFieldType.Binary: GFFStruct.set_binary,
+    GFFFieldType.Vector3: GFFStruct.set_vector3,
+    GFFFieldType.Vector4: GFFStruct.set_vector4,
+}
+
+
+def _decode_string(
+    data: bytes,
+    encoding: str | None = "windows-1252",
+) -> str:
+    """Decodes a string the same way as BinaryReader.read_string(), trimming everything from the first null byte."""
+    string: str = decode_bytes_with_fallbacks(data, encoding=encoding, errors="ignore")
+    if "\0" in string:
+        string = string[: string.index("\0")]
+    return string
+
+
+def _array_bytes(values: array) -> bytes:
+    """Returns the bytes of a uint32 array as stored in a GFF file (little endian)."""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
 class GFFBinaryReader(ResourceReader):
+    """Reads a binary GFF file.
+
+    Every section of the file (structs, fields, labels, field data, field indices and list indices) is read into
+    memory with a single read each and the struct and field tables are unpacked in bulk. The GFFStruct/GFFList tree
+    is then built from those tables without any further I/O.
+    """
+
     def __init__(
         self,
         source: SOURCE_TYPES,
@@ -31,11 +122,12 @@ class GFFBinaryReader(ResourceReader):
         self._gff: GFF | None = None
 
         self._labels: list[str] = []
-        self._field_data_offset: int = 0
-        self._field_indices_offset: int = 0
-        self._list_indices_offset: int = 0
-        self._struct_offset: int = 0
-        self._field_offset: int = 0
+        self._structs: list[tuple[int, int, int]] = []
+        self._fields: list[tuple[int, int, int]] = []
+        self._field_table: bytes = b""
+        self._field_data: memoryview = memoryview(b"")
+        self._field_indices: bytes = b""
+        self._list_indices: bytes = b""
 
     @autoclose
     def load(
@@ -57,121 +149,159 @@ class GFFBinaryReader(ResourceReader):
 
         self._gff.content = GFFContent(file_type)
 
-        self._struct_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # struct count
-        self._field_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # field count
-        label_offset = self._reader.read_uint32()
-        label_count = self._reader.read_uint32()
-        self._field_data_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # field data count
-        self._field_indices_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # field indices count
-        self._list_indices_offset = self._reader.read_uint32()
-        self._reader.read_uint32()  # list indices count
-
-        self._labels = []
-        self._reader.seek(label_offset)
-        self._labels.extend(self._reader.read_string(16) for _ in range(label_count))
-        self._load_struct(self._gff.root, 0)
+        (
+            struct_offset,
+            struct_count,
+            field_offset,
+            field_count,
+            label_offset,
+            label_count,
+            field_data_offset,
+            field_data_count,
+            field_indices_offset,
+            field_indices_count,
+            list_indices_offset,
+            list_indices_count,
+        ) = self._reader.read_struct(_HEADER)
+
+        self._structs = list(_STRUCT_ENTRY.iter_unpack(self._read_section(struct_offset, struct_count * 12)))
+        self._field_table = self._read_section(field_offset, field_count * 12)
+        self._fields = list(_FIELD_ENTRY.iter_unpack(self._field_table))
+        label_data: bytes = self._read_section(label_offset, label_count * 16)
+        self._labels = [_decode_string(label_data[i : i + 16]) for i in range(0, len(label_data), 16)]
+        self._field_data = memoryview(self._read_section(field_data_offset, field_data_count))
+        self._field_indices = self._read_section(field_indices_offset, field_indices_count)
+        self._list_indices = self._read_section(list_indices_offset, list_indices_count)
+
+        try:
+            self._load_struct(self._gff.root, 0)
+        except (IndexError, struct.error) as e:
+            msg = "The GFF file is corrupted."
+            raise ValueError(msg) from e
 
         return self._gff
 
+    def _read_section(
+        self,
+        offset: int,
+        size: int,
+    ) -> bytes:
+        if not size:
+            return b""
+        self._reader.seek(offset)
+        return self._reader.read_bytes(size)
+
     def _load_struct(
         self,
         gff_struct: GFFStruct,
         struct_index: int,
     ) -> None:
-        self._reader.seek(self._struct_offset + struct_index * 12)
-        struct_id, data, field_count = (
-            self._reader.read_int32(),
-            self._reader.read_uint32(),
-            self._reader.read_uint32(),
-        )
-
+        struct_id, data, field_count = self._structs[struct_index]
         gff_struct.struct_id = struct_id
 
         if field_count == 1:
             self._load_field(gff_struct, data)
         elif field_count > 1:
-            self._reader.seek(self._field_indices_offset + data)
-            indices: list[int] = [self._reader.read_uint32() for _ in range(field_count)]
-            for index in indices:
-                self._load_field(gff_struct, index)
+            for field_index in struct.unpack_from(f"<{field_count}I", self._field_indices, data):
+                self._load_field(gff_struct, field_index)
 
     def _load_field(
         self,
         gff_struct: GFFStruct,
         field_index: int,
     ) -> None:
-        self._reader.seek(self._field_offset + field_index * 12)
-        field_type_id = self._reader.read_uint32()
-        label_id = self._reader.read_uint32()
-
-        field_type = GFFFieldType(field_type_id)
-        label = self._labels[label_id]
+        field_type_id, label_id, data = self._fields[field_index]
+        field_type: GFFFieldType = _FIELD_TYPES.get(field_type_id) or GFFFieldType(field_type_id)
+        label: str = self._labels[label_id]
 
-        if field_type in _COMPLEX_FIELD:
-            offset = self._reader.read_uint32()  # relative to field data
-            self._reader.seek(self._field_data_offset + offset)
-            if field_type is GFFFieldType.UInt64:
-                gff_struct.set_uint64(label, self._reader.read_uint64())
-            elif field_type is GFFFieldType.Int64:
-                gff_struct.set_int64(label, self._reader.read_int64())
-            elif field_type is GFFFieldType.Double:
-                gff_struct.set_double(label, self._reader.read_double())
-            elif field_type is GFFFieldType.String:
-                length = self._reader.read_uint32()
-                gff_struct.set_string(label, self._reader.read_string(length))
-            elif field_type is GFFFieldType.ResRef:
-                length = self._reader.read_uint8()
-                resref = ResRef(self._reader.read_string(length))
-                gff_struct.set_resref(label, resref)
-            elif field_type is GFFFieldType.LocalizedString:
-                gff_struct.set_locstring(label, self._reader.read_locstring())
-            elif field_type is GFFFieldType.Binary:
-                length = self._reader.read_uint32()
-                gff_struct.set_binary(label, self._reader.read_bytes(length))
-            elif field_type is GFFFieldType.Vector3:
-                gff_struct.set_vector3(label, self._reader.read_vector3())
-            elif field_type is GFFFieldType.Vector4:
-                gff_struct.set_vector4(label, self._reader.read_vector4())
-        elif field_type is GFFFieldType.Struct:
-            struct_index = self._reader.read_uint32()
+        if field_type is GFFFieldType.Struct:
             new_struct = GFFStruct()
-            self._load_struct(new_struct, struct_index)
+            self._load_struct(new_struct, data)
             gff_struct.set_struct(label, new_struct)
         elif field_type is GFFFieldType.List:
-            self._load_list(gff_struct, label)
-        elif field_type is GFFFieldType.UInt8:
-            gff_struct.set_uint8(label, self._reader.read_uint8())
-        elif field_type is GFFFieldType.Int8:
-            gff_struct.set_int8(label, self._reader.read_int8())
-        elif field_type is GFFFieldType.UInt16:
-            gff_struct.set_uint16(label, self._reader.read_uint16())
-        elif field_type is GFFFieldType.Int16:
-            gff_struct.set_int16(label, self._reader.read_int16())
-        elif field_type is GFFFieldType.UInt32:
-            gff_struct.set_uint32(label, self._reader.read_uint32())
-        elif field_type is GFFFieldType.Int32:
-            gff_struct.set_int32(label, self._reader.read_int32())
+            self._load_list(gff_struct, label, data)
+        elif field_type in _COMPLEX_FIELD:
+            _SETTERS[field_type](gff_struct, label, self._load_complex(field_type, data))
         elif field_type is GFFFieldType.Single:
-            gff_struct.set_single(label, self._reader.read_single())
+            gff_struct.set_single(label, _SINGLE.unpack_from(self._field_table, field_index * 12 + 8)[0])
+        else:
+            _SETTERS[field_type](gff_struct, label, _SIMPLE_DECODERS[field_type](data))
 
-    def _load_list(self, gff_struct: GFFStruct, label: str) -> None:
-        offset = self._reader.read_uint32()  # relative to list indices
-        self._reader.seek(self._list_indices_offset + offset)
+    def _load_complex(  # noqa: PLR0911
+        self,
+        field_type: GFFFieldType,
+        offset: int,
+    ) -> Any:
+        field_data: memoryview = self._field_data
+        if field_type is GFFFieldType.UInt64:
+            return _UINT64.unpack_from(field_data, offset)[0]
+        if field_type is GFFFieldType.Int64:
+            return _INT64.unpack_from(field_data, offset)[0]
+        if field_type is GFFFieldType.Double:
+            return _DOUBLE.unpack_from(field_data, offset)[0]
+        if field_type is GFFFieldType.String:
+            length: int = _UINT32.unpack_from(field_data, offset)[0]
+            return _decode_string(self._field_data_slice(offset + 4, length))
+        if field_type is GFFFieldType.ResRef:
+            length = field_data[offset]
+            return ResRef(_decode_string(self._field_data_slice(offset + 1, length)))
+        if field_type is GFFFieldType.LocalizedString:
+            return self._load_locstring(offset)
+        if field_type is GFFFieldType.Binary:
+            length = _UINT32.unpack_from(field_data, offset)[0]
+            return self._field_data_slice(offset + 4, length)
+        if field_type is GFFFieldType.Vector3:
+            return Vector3(*_VECTOR3.unpack_from(field_data, offset))
+        return Vector4(*_VECTOR4.unpack_from(field_data, offset))
+
+    def _load_locstring(
+        self,
+        offset: int,
+    ) -> LocalizedString:
+        locstring: LocalizedString = LocalizedString.from_invalid()
+        # The first uint32 is the total number of bytes of the localized string
+        stringref, string_count = _LOCSTRING_HEADER.unpack_from(self._field_data, offset + 4)
+        locstring.stringref = -1 if stringref == 0xFFFFFFFF else stringref
+        offset += 12
+        for _ in range(string_count):
+            string_id, length = _LOCSTRING_SUBSTRING.unpack_from(self._field_data, offset)
+            language, gender = LocalizedString.substring_pair(string_id)
+            string_data: bytes = self._field_data_slice(offset + 8, length)
+            locstring.set_data(language, gender, _decode_string(string_data, language.get_encoding()))
+            offset += 8 + length
+        return locstring
+
+    def _field_data_slice(
+        self,
+        offset: int,
+        length: int,
+    ) -> bytes:
+        if offset + length > len(self._field_data):
+            msg = "Field data exceeds the boundaries of the field data block."
+            raise struct.error(msg)
+        return self._field_data[offset : offset + length].tobytes()
+
+    def _load_list(
+        self,
+        gff_struct: GFFStruct,
+        label: str,
+        offset: int,  # relative to list indices
+    ) -> None:
         value = GFFList()
-        count = self._reader.read_uint32()
-        list_indices: list[int] = [self._reader.read_uint32() for _ in range(count)]
-        for struct_index in list_indices:
-            value.add(0)
-            child: GFFStruct | None = value.at(len(value) - 1)
-            self._load_struct(child, struct_index)
+        count: int = _UINT32.unpack_from(self._list_indices, offset)[0]
+        for struct_index in struct.unpack_from(f"<{count}I", self._list_indices, offset + 4):
+            self._load_struct(value.add(0), struct_index)
         gff_struct.set_list(label, value)
 
 
 class GFFBinaryWriter(ResourceWriter):
+    """Writes a binary GFF file.
+
+    The struct, field, field index and list index tables are collected into typed arrays while the tree is walked,
+    slots for field and list indices are reserved up front and filled in by index, and labels are looked up in a dict.
+    Each section is then emitted with a single write, keeping the writer linear in the number of fields.
+    """
+
     def __init__(
         self,
         gff: GFF,
@@ -180,16 +310,13 @@ class GFFBinaryWriter(ResourceWriter):
         super().__init__(target)
         self._gff: GFF = gff
 
-        self._struct_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._field_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._structs: array = array("I")  # struct id, field index or field indices offset, field count
+        self._fields: array = array("I")  # field type id, label index, value or offset into another section
         self._field_data_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._field_indices_writer: BinaryWriter = BinaryWriter.to_bytearray()
-        self._list_indices_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        self._field_indices: array = array("I")
+        self._list_indices: array = array("I")
 
-        self._labels: list[str] = []
-
-        self._struct_count: int = 0
-        self._field_count: int = 0
+        self._labels: dict[str, int] = {}
 
     @autoclose
     def write(
@@ -198,58 +325,59 @@ class GFFBinaryWriter(ResourceWriter):
     ) -> None:
         self._build_struct(self._gff.root)
 
+        label_writer: BinaryWriter = BinaryWriter.to_bytearray()
+        for label in self._labels:
+            label_writer.write_string(label, string_length=16)
+
+        sections: list[bytes] = [
+            _array_bytes(self._structs),
+            _array_bytes(self._fields),
+            label_writer.data(),
+            self._field_data_writer.data(),
+            _array_bytes(self._field_indices),
+            _array_bytes(self._list_indices),
+        ]
         struct_offset = 56
-        struct_count = self._struct_writer.size() // 12
-        field_offset = struct_offset + self._struct_writer.size()
-        field_count = self._field_writer.size() // 12
-        label_offset = field_offset + self._field_writer.size()
-        label_count = len(self._labels)
-        field_data_offset = label_offset + len(self._labels) * 16
-        field_data_count = self._field_data_writer.size()
-        field_indices_offset = field_data_offset + self._field_data_writer.size()
-        field_indices_count = self._field_indices_writer.size()
-        list_indices_offset = field_indices_offset + self._field_indices_writer.size()
-        list_indices_count = self._list_indices_writer.size()
+        field_offset = struct_offset + len(sections[0])
+        label_offset = field_offset + len(sections[1])
+        field_data_offset = label_offset + len(sections[2])
+        field_indices_offset = field_data_offset + len(sections[3])
+        list_indices_offset = field_indices_offset + len(sections[4])
 
         self._writer.write_string(self._gff.content.value)
         self._writer.write_string("V3.2")
-        self._writer.write_uint32(struct_offset)
-        self._writer.write_uint32(struct_count)
-        self._writer.write_uint32(field_offset)
-        self._writer.write_uint32(field_count)
-        self._writer.write_uint32(label_offset)
-        self._writer.write_uint32(label_count)
-        self._writer.write_uint32(field_data_offset)
-        self._writer.write_uint32(field_data_count)
-        self._writer.write_uint32(field_indices_offset)
-        self._writer.write_uint32(field_indices_count)
-        self._writer.write_uint32(list_indices_offset)
-        self._writer.write_uint32(list_indices_count)
-
-        self._writer.write_bytes(self._struct_writer.data())
-        self._writer.write_bytes(self._field_writer.data())
-        for label in self._labels:
-            self._writer.write_string(label, string_length=16)
-        self._writer.write_bytes(self._field_data_writer.data())
-        self._writer.write_bytes(self._field_indices_writer.data())
-        self._writer.write_bytes(self._list_indices_writer.data())
+        self._writer.write_bytes(
+            _HEADER.pack(
+                struct_offset,
+                len(self._structs) // 3,
+                field_offset,
+                len(self._fields) // 3,
+                label_offset,
+                len(self._labels),
+                field_data_offset,
+                len(sections[3]),
+                field_indices_offset,
+                len(sections[4]),
+                list_indices_offset,
+                len(sections[5]),
+            )
+        )
+        self._writer.write_bytes(b"".join(sections))
 
     def _build_struct(
         self,
         gff_struct: GFFStruct,
     ) -> None:
-        self._struct_count += 1
         struct_id = gff_struct.struct_id
         field_count = len(gff_struct)
-
-        self._struct_writer.write_uint32(struct_id, max_neg1=True)
+        self._structs.append(0xFFFFFFFF if struct_id == -1 else struct_id)
 
         if field_count == 0:
-            self._struct_writer.write_uint32(0xFFFFFFFF)
-            self._struct_writer.write_uint32(0)
+            self._structs.append(0xFFFFFFFF)
+            self._structs.append(0)
         elif field_count == 1:
-            self._struct_writer.write_uint32(self._field_count)
-            self._struct_writer.write_uint32(field_count)
+            self._structs.append(len(self._fields) // 3)
+            self._structs.append(field_count)
 
             for label, field_type, value in gff_struct:
                 self._build_field(label, value, field_type)
@@ -257,29 +385,26 @@ class GFFBinaryWriter(ResourceWriter):
             self._write_large_struct(field_count, gff_struct)
 
     def _write_large_struct(self, field_count: int, gff_struct: GFFStruct):
-        self._struct_writer.write_uint32(self._field_indices_writer.size())
-        self._struct_writer.write_uint32(field_count)
-
-        self._field_indices_writer.end()
-        pos = self._field_indices_writer.position()
-        self._field_indices_writer.write_bytes(b"\x00\x00\x00\x00" * field_count)
+        field_indices: array = self._field_indices
+        pos: int = len(field_indices)
+        self._structs.append(pos * 4)
+        self._structs.append(field_count)
 
+        field_indices.frombytes(bytes(4 * field_count))
         for i, (label, field_type, value) in enumerate(gff_struct):
-            self._field_indices_writer.seek(pos + i * 4)
-            self._field_indices_writer.write_uint32(self._field_count)
+            field_indices[pos + i] = len(self._fields) // 3
             self._build_field(label, value, field_type)
 
     def _build_list(
         self,
         gff_list: GFFList,
     ) -> None:
-        self._list_indices_writer.end()
-        self._list_indices_writer.write_uint32(len(gff_list))
-        pos = self._list_indices_writer.position()
-        self._list_indices_writer.write_bytes(b"\x00\x00\x00\x00" * len(gff_list))
+        list_indices: array = self._list_indices
+        list_indices.append(len(gff_list))
+        pos: int = len(list_indices)
+        list_indices.frombytes(bytes(4 * len(gff_list)))
         for i, gff_struct in enumerate(gff_list):
-            self._list_indices_writer.seek(pos + i * 4)
-            self._list_indices_writer.write_uint32(self._struct_count)
+            list_indices[pos + i] = len(self._structs) // 3
             self._build_struct(gff_struct)
 
     def _build_field(
@@ -288,17 +413,13 @@ class GFFBinaryWriter(ResourceWriter):
         value: Any,
         field_type: GFFFieldType,
     ) -> None:
-        self._field_count += 1
-        field_type_id = field_type.value
-        label_index = self._label_index(label)
-
-        self._field_writer.write_uint32(field_type_id)
-        self._field_writer.write_uint32(label_index)
+        fields: array = self._fields
+        fields.append(field_type.value)
+        fields.append(self._label_index(label))
 
         if field_type in _COMPLEX_FIELD:
-            self._field_writer.write_uint32(self._field_data_writer.size())
+            fields.append(self._field_data_writer.size())
 
-            self._field_data_writer.end()
             if field_type is GFFFieldType.UInt64:
                 self._field_data_writer.write_uint64(value)
             elif field_type is GFFFieldType.Int64:
@@ -319,25 +440,13 @@ class GFFBinaryWriter(ResourceWriter):
             elif field_type is GFFFieldType.Vector3:
                 self._field_data_writer.write_vector3(value)
         elif field_type is GFFFieldType.Struct:
-            self._field_writer.write_uint32(self._struct_count)
+            fields.append(len(self._structs) // 3)
             self._build_struct(value)
         elif field_type is GFFFieldType.List:
-            self._field_writer.write_uint32(self._list_indices_writer.size())
+            fields.append(len(self._list_indices) * 4)
             self._build_list(value)
-        elif field_type is GFFFieldType.UInt8:
-            self._field_writer.write_uint32(value, max_neg1=True)
-        elif field_type is GFFFieldType.Int8:
-            self._field_writer.write_int32(value)
-        elif field_type is GFFFieldType.UInt16:
-            self._field_writer.write_uint32(value, max_neg1=True)
-        elif field_type is GFFFieldType.Int16:
-            self._field_writer.write_int32(value)
-        elif field_type is GFFFieldType.UInt32:
-            self._field_writer.write_uint32(value, max_neg1=True)
-        elif field_type is GFFFieldType.Int32:
-            self._field_writer.write_int32(value)
-        elif field_type is GFFFieldType.Single:
-            self._field_writer.write_single(value)
+        elif field_type in _SIMPLE_ENCODERS:
+            fields.append(_SIMPLE_ENCODERS[field_type](value))
         else:
             msg = "Unknown field type"
             raise ValueError(msg)
@@ -346,7 +455,7 @@ class GFFBinaryWriter(ResourceWriter):
         self,
         label: str,
     ) -> int:
-        if label in self._labels:
-            return self._labels.index(label)
-        self._labels.append(label)
-        return len(self._labels) - 1
+        label_index: int | None = self._labels.get(label)
+        if label_index is None:
+            label_index = self._labels[label] = len(self._labels)
+        return label_index
@@ -50,8 +50,8 @@ def detect_mdl(
         if isinstance(source, (str, os.PathLike)):
             with BinaryReader.from_file(source, offset) as reader:
                 file_format = check(reader.read_bytes(4))
-        elif isinstance(source, (bytes, bytearray)):
-            file_format = check(source[:4])
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            file_format = check(bytes(source[:4]))
         elif isinstance(source, BinaryReader):
             file_format = check(source.read_bytes(4))
             source.skip(-4)
@@ -615,7 +615,7 @@ class FunctionDefinition(TopLevelObject):
         self.block.compile(temp, root, None, retn, None, None)
         temp.instructions.append(retn)
 
-        stub_index = ncs.instructions.index(root.function_map[name].instruction)
+        stub_index = ncs.index(root.function_map[name].instruction)
         ncs.instructions[stub_index + 1 : stub_index + 1] = temp.instructions
 
     def is_matching_signature(self, prototype: FunctionForwardDeclaration) -> bool:
@@ -654,27 +654,21 @@ class IncludeScript(TopLevelObject):
         for folder in root.library_lookup:
             filepath = folder / f"{self.file.value}.nss"
             if filepath.exists():
-                source = BinaryReader.load_file(filepath).decode(errors="ignore")
+                name = str(filepath)
+                source = BinaryReader.load_file(filepath)
                 break
         else:
             if self.file.value in self.library:
-                source = self.library[self.file.value].decode(errors="ignore")
+                name = self.file.value
+                source = self.library[self.file.value]
             else:
                 msg = f"Could not find included script '{self.file.value}.nss'."
                 raise CompileException(msg)
 
-        from pykotor.resource.formats.ncs.compiler.parser import NssParser
+        from pykotor.resource.formats.ncs.compiler.parser import INCLUDE_CACHE
 
-        nss_parser = NssParser(
-            root.functions,
-            root.constants,
-            root.library,
-            root.library_lookup,
-        )
-        nss_parser.library = self.library
-        nss_parser.constants = root.constants
-        t: CodeRoot = nss_parser.parser.parse(source, tracking=True)
-        root.objects = t.objects + root.objects
+        objects = INCLUDE_CACHE.objects(name, source, root.functions, root.constants, self.library, root.library_lookup)
+        root.objects = objects + root.objects
 
 
 class StructDefinition(TopLevelObject):
@@ -29,7 +29,7 @@ class Interpreter:
     def run(self):
         # TODO - limit how many instructions can be run before raising an error
         while self._cursor is not None:
-            index = self._ncs.instructions.index(self._cursor)
+            index = self._ncs.index(self._cursor)
             jump_value = None
 
             # print(str(index).ljust(3), str(self._cursor).ljust(40)[:40], str(self._stack.state()).ljust(30), f"BP={self._stack.base_pointer()//4}")
@@ -224,7 +224,7 @@ class Interpreter:
                 self._stack.copy_down_bp(self._cursor.args[0], self._cursor.args[1])
 
             elif self._cursor.ins_type in [NCSInstructionType.JSR]:
-                index_return_to = self._ncs.instructions.index(self._cursor) + 1
+                index_return_to = self._ncs.index(self._cursor) + 1
                 return_to = self._ncs.instructions[index_return_to]
                 self._returns.append(return_to)
 
@@ -260,13 +260,13 @@ class Interpreter:
     def store_state(self):
         self._stack.store_state()
 
-        index = self._ncs.instructions.index(self._cursor)
+        index = self._ncs.index(self._cursor)
         tempcursor = self._ncs.instructions[index + 2]
 
         block = []
         while tempcursor.ins_type != NCSInstructionType.RETN:
             block.append(tempcursor)
-            index = self._ncs.instructions.index(tempcursor)
+            index = self._ncs.index(tempcursor)
             tempcursor = self._ncs.instructions[index + 1]
 
         self._stack.add(DataType.ACTION, ActionStackValue(block, self._stack.state()))
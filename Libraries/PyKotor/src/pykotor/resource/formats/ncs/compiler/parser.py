@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import hashlib
+import io
+import pickle
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
 
 from ply import yacc
 
@@ -62,6 +67,7 @@ if TYPE_CHECKING:
     from ply.lex import LexToken
 
     from pykotor.common.script import ScriptConstant, ScriptFunction
+    from pykotor.resource.formats.ncs.compiler.classes import TopLevelObject
 
 
 class NssParser:
@@ -73,6 +79,7 @@ class NssParser:
         library_lookup: list[str] | list[CaseAwarePath] | str | CaseAwarePath | None,
         errorlog=yacc.NullLogger(),
     ):
+        # The LALR tables are loaded from parsetab.py as long as its signature matches the grammar in this class.
         self.parser = yacc.yacc(
             module=self,
             errorlog=errorlog,
@@ -83,19 +90,32 @@ class NssParser:
         self.functions: list[ScriptFunction] = functions
         self.constants: list[ScriptConstant] = constants
         self.library: dict[str, bytes] = library
-        self.library_lookup: list[CaseAwarePath] = []
-        if not library_lookup:
-            pass
-        elif isinstance(library_lookup, list):
-            for library_path in library_lookup:
-                if isinstance(library_path, CaseAwarePath):
-                    self.library_lookup.append(library_path)
-                elif library_path:
-                    self.library_lookup.append(CaseAwarePath(library_path))
-        elif isinstance(library_lookup, CaseAwarePath):
-            self.library_lookup = [library_lookup]
-        else:
-            self.library_lookup = [CaseAwarePath(library_lookup)]
+        self.library_lookup: list[CaseAwarePath] = lookup_paths(library_lookup)
+        self._lexer: NssLexer | None = None
+
+        self._routine_ids: dict[str, int] = {}
+        for routine_id, function in enumerate(functions):
+            self._routine_ids.setdefault(function.name, routine_id)
+
+    def parse(
+        self,
+        source: str,
+    ) -> CodeRoot:
+        """Parses a script using a lexer owned by this parser, so the parser can be reused for any number of scripts.
+
+        Args:
+        ----
+            source: The source code.
+
+        Returns:
+        -------
+            The root of the parsed script.
+        """
+        if self._lexer is None:
+            self._lexer = NssLexer()
+        lexer = self._lexer.lexer
+        lexer.lineno = 1
+        return self.parser.parse(source, lexer=lexer, tracking=True)
 
     tokens: list[str] = NssLexer.tokens
     literals: list[str] = NssLexer.literals
@@ -511,9 +531,9 @@ class NssParser:
         identifier = p[1]
         args: list[Expression] = p[3]
 
-        engine_function = next((x for x in self.functions if x.name == identifier), None)
-        if engine_function:
-            routine_id = self.functions.index(engine_function)
+        routine_id = self._routine_ids.get(identifier)
+        if routine_id is not None:
+            engine_function = self.functions[routine_id]
             data_type = engine_function.returntype
             p[0] = EngineCallExpression(engine_function, routine_id, data_type, args)
         else:
@@ -658,3 +678,188 @@ class NssParser:
             p[0] = []
 
     # endregion
+
+
+def lookup_paths(
+    library_lookup: list[str] | list[CaseAwarePath] | str | CaseAwarePath | None,
+) -> list[CaseAwarePath]:
+    """Returns the folders to search for included scripts as a list of paths, skipping empty entries."""
+    if not library_lookup:
+        return []
+    if isinstance(library_lookup, list):
+        return [path if isinstance(path, CaseAwarePath) else CaseAwarePath(path) for path in library_lookup if path]
+    if isinstance(library_lookup, CaseAwarePath):
+        return [library_lookup]
+    return [CaseAwarePath(library_lookup)]
+
+
+_PARSER_POOL: dict[tuple[int, int], list[NssParser]] = {}
+_PARSER_POOL_LOCK = threading.Lock()
+
+
+@contextmanager
+def pooled_parser(
+    functions: list[ScriptFunction],
+    constants: list[ScriptConstant],
+    library: dict[str, bytes],
+    library_lookup: list[str] | list[CaseAwarePath] | str | CaseAwarePath | None,
+) -> Iterator[NssParser]:
+    """Checks out a parser for a game's function and constant sets from a process-wide pool.
+
+    Building a parser and its lexer costs more than parsing a typical script, so parsers are kept and reused between
+    compilations. A parser is only handed to one caller at a time, a new one is built whenever the pool for the game is
+    empty, for example when an include is parsed while another thread is compiling.
+
+    Args:
+    ----
+        functions: The engine functions of the game, usually KOTOR_FUNCTIONS or TSL_FUNCTIONS.
+        constants: The engine constants of the game, usually KOTOR_CONSTANTS or TSL_CONSTANTS.
+        library: The built-in include scripts.
+        library_lookup: Folders searched for included scripts before the library.
+
+    Returns:
+    -------
+        A context manager yielding the parser, which is returned to the pool on exit.
+    """
+    key = (id(functions), id(constants))
+    with _PARSER_POOL_LOCK:
+        parsers = _PARSER_POOL.setdefault(key, [])
+        nss_parser = parsers.pop() if parsers else None
+    if nss_parser is None:
+        nss_parser = NssParser(functions, constants, library, library_lookup)
+    else:
+        nss_parser.library = library
+        nss_parser.library_lookup = lookup_paths(library_lookup)
+    try:
+        yield nss_parser
+    finally:
+        with _PARSER_POOL_LOCK:
+            parsers.append(nss_parser)
+
+
+class _SharedPickler(pickle.Pickler):
+    """Pickles parsed objects, storing references to the game's functions, constants and library rather than copies."""
+
+    def __init__(
+        self,
+        file: io.BytesIO,
+        shared: dict[int, tuple],
+    ):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._shared: dict[int, tuple] = shared
+
+    def persistent_id(
+        self,
+        obj: Any,
+    ) -> tuple | None:
+        return self._shared.get(id(obj))
+
+
+class _SharedUnpickler(pickle.Unpickler):
+    def __init__(
+        self,
+        file: io.BytesIO,
+        functions: list[ScriptFunction],
+        constants: list[ScriptConstant],
+        library: dict[str, bytes],
+    ):
+        super().__init__(file)
+        self._functions: list[ScriptFunction] = functions
+        self._constants: list[ScriptConstant] = constants
+        self._library: dict[str, bytes] = library
+
+    def persistent_load(
+        self,
+        pid: tuple,
+    ) -> Any:
+        kind = pid[0]
+        if kind == "function":
+            return self._functions[pid[1]]
+        if kind == "constant":
+            return self._constants[pid[1]]
+        if kind == "functions":
+            return self._functions
+        if kind == "constants":
+            return self._constants
+        return self._library
+
+
+class IncludeCache:
+    """Parsed top-level objects of included scripts, shared by every compilation in the process.
+
+    Entries are keyed by the resolved path or library name of the include and the game's function set, and are only
+    used while the SHA-256 of the include source matches, so an edited include file is parsed again. The objects are
+    stored pickled and every hit unpickles a fresh copy, as compiling a script mutates its objects.
+    """
+
+    def __init__(
+        self,
+    ):
+        self._entries: dict[tuple[str, int], tuple[bytes, bytes]] = {}
+        self._games: dict[int, list[ScriptFunction]] = {}
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def objects(
+        self,
+        name: str,
+        source: bytes,
+        functions: list[ScriptFunction],
+        constants: list[ScriptConstant],
+        library: dict[str, bytes],
+        library_lookup: list[CaseAwarePath],
+    ) -> list[TopLevelObject]:
+        """Returns a copy of the top-level objects of an include script, parsing it if it is not cached.
+
+        Args:
+        ----
+            name: The resolved path of the include, or its name if it was found in the library.
+            source: The source code of the include.
+            functions: The engine functions of the game.
+            constants: The engine constants of the game.
+            library: The built-in include scripts, used for includes nested in this one.
+            library_lookup: Folders searched for includes nested in this one.
+
+        Returns:
+        -------
+            The parsed objects, which the caller is free to modify.
+        """
+        key = (name, id(functions))
+        digest = hashlib.sha256(source).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = entry is not None and entry[0] == digest
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            return _SharedUnpickler(io.BytesIO(entry[1]), functions, constants, library).load()
+
+        with pooled_parser(functions, constants, library, library_lookup) as nss_parser:
+            objects: list[TopLevelObject] = nss_parser.parse(source.decode(errors="ignore")).objects
+
+        shared: dict[int, tuple] = {id(function): ("function", i) for i, function in enumerate(functions)}
+        shared.update({id(constant): ("constant", i) for i, constant in enumerate(constants)})
+        shared.update({id(functions): ("functions",), id(constants): ("constants",), id(library): ("library",)})
+        data = io.BytesIO()
+        _SharedPickler(data, shared).dump(objects)
+        with self._lock:
+            # holding the function list keeps its id from being reused by another game's list
+            self._entries[key] = (digest, data.getvalue())
+            self._games[id(functions)] = functions
+        return objects
+
+    def clear(
+        self,
+    ):
+        """Drops every cached include and resets the hit and miss counts."""
+        with self._lock:
+            self._entries.clear()
+            self._games.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+INCLUDE_CACHE = IncludeCache()
@@ -5,11 +5,10 @@ from typing import TYPE_CHECKING
 from pykotor.common.misc import Game
 from pykotor.common.scriptdefs import KOTOR_CONSTANTS, KOTOR_FUNCTIONS, TSL_CONSTANTS, TSL_FUNCTIONS
 from pykotor.common.scriptlib import KOTOR_LIBRARY, TSL_LIBRARY
-from pykotor.resource.formats.ncs.compiler.lexer import NssLexer
-from pykotor.resource.formats.ncs.compiler.parser import NssParser
+from pykotor.resource.formats.ncs.compiler.parser import pooled_parser
 from pykotor.resource.formats.ncs.io_ncs import NCSBinaryReader, NCSBinaryWriter
 from pykotor.resource.formats.ncs.ncs_data import NCS
-from pykotor.resource.formats.ncs.optimizers import RemoveNopOptimizer
+from pykotor.resource.formats.ncs.optimizers import NCSPassManager, RemoveNopOptimizer
 from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES, ResourceType
 
 if TYPE_CHECKING:
@@ -96,6 +95,7 @@ def compile_nss(
     game: Game,
     optimizers: list[NCSOptimizer] | None = None,
     library_lookup: list[str | CaseAwarePath] | str | CaseAwarePath | None = None,
+    optimization_level: int = 0,
 ) -> NCS:
     """Returns NCS object compiled from input source string.
 
@@ -104,21 +104,23 @@ def compile_nss(
         source: The source code.
         game: Target game for the NCS object.
         optimizers: What post-compilation optimizers to apply to the NCS object.
+        library_lookup: Folders searched for included scripts before the built-in library.
+        optimization_level: Which passes of NCSPassManager to run before the optimizers, see NCSPassManager.for_level().
+
+    Parsers are reused across calls, see pooled_parser().
     """
-    NssLexer()
-    nss_parser = NssParser(
+    with pooled_parser(
         functions=KOTOR_FUNCTIONS if game == Game.K1 else TSL_FUNCTIONS,
         constants=KOTOR_CONSTANTS if game == Game.K1 else TSL_CONSTANTS,
         library=KOTOR_LIBRARY if game == Game.K1 else TSL_LIBRARY,
         library_lookup=library_lookup,
-    )
+    ) as nss_parser:
+        block = nss_parser.parse(source)
 
     ncs = NCS()
-
-    block = nss_parser.parser.parse(source, tracking=True)
     block.compile(ncs)
 
-    optimizers = [RemoveNopOptimizer()] if optimizers is None else [RemoveNopOptimizer(), *optimizers]
+    optimizers = [RemoveNopOptimizer(), NCSPassManager.for_level(optimization_level), *(optimizers or [])]
     for optimizer in optimizers:
         optimizer.reset()
     ncs.optimize(optimizers)
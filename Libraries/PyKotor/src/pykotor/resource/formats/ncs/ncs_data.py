@@ -185,13 +185,31 @@ class NCSInstructionType(Enum):
 
 
 class NCS:
+    """A compiled script as a list of instructions.
+
+    Jumps are stored as references to the target instruction. Every instruction keeps track of the instructions jumping
+    to it, and the program keeps a map from instruction to index that is rebuilt when a lookup misses, so index() and
+    links_to() do not scan the program. Code that drops instructions from the program must clear their jumps, as
+    remove() does, so that they no longer show up as links.
+    """
+
     def __init__(self):
-        self.instructions: list[NCSInstruction] = []
+        self._instructions: list[NCSInstruction] = []
+        self._positions: dict[NCSInstruction, int] = {}
+
+    @property
+    def instructions(self) -> list[NCSInstruction]:
+        return self._instructions
+
+    @instructions.setter
+    def instructions(self, instructions: list[NCSInstruction]):
+        self._instructions = instructions
+        self._positions = {}
 
     def print(self):
         for i, instruction in enumerate(self.instructions):
             if instruction.jump:
-                jump_index = self.instructions.index(instruction.jump)
+                jump_index = self.index(instruction.jump)
                 print(f"{i}:\t{instruction.ins_type.name.ljust(8)}\t--> {jump_index}")
             else:
                 print(f"{i}:\t{instruction.ins_type.name.ljust(8)} {instruction.args}")
@@ -230,13 +248,68 @@ class NCS:
         ) if index is not None else self.instructions.append(instruction)
         return instruction
 
+    def index(self, instruction: NCSInstruction) -> int:
+        """Returns the index of an instruction in the program.
+
+        Raises:
+        ------
+            ValueError: If the instruction is not part of the program.
+        """
+        position = self._positions.get(instruction)
+        instructions = self._instructions
+        if position is not None and position < len(instructions) and instructions[position] is instruction:
+            return position
+        # the list may have been changed in place, even with its length unchanged, so any miss rebuilds the map once
+        self._positions = {inst: i for i, inst in enumerate(instructions)}
+        position = self._positions.get(instruction)
+        if position is not None:
+            return position
+        msg = f"{instruction} is not part of the program."
+        raise ValueError(msg)
+
+    def __contains__(self, instruction: NCSInstruction) -> bool:
+        try:
+            self.index(instruction)
+        except ValueError:
+            return False
+        return True
+
     def links_to(self, target: NCSInstruction) -> list[NCSInstruction]:
         """Get a list of all instructions which may jump to the target instructions."""
-        return [
-            inst
-            for inst in self.instructions
-            if inst.jump is target
-        ]
+        return sorted(target.links, key=self.index)
+
+    def remove(
+        self,
+        removed: set[NCSInstruction],
+    ) -> None:
+        """Removes a set of instructions in a single pass over the program.
+
+        Jumps to a removed instruction are redirected to the first instruction after it that is kept, and the jumps of
+        removed instructions are cleared.
+
+        Args:
+        ----
+            removed: The instructions to remove.
+
+        Raises:
+        ------
+            ValueError: If a kept instruction jumps to a removed one that no kept instruction follows. The program is
+                        left unchanged.
+        """
+        following: NCSInstruction | None = None
+        for instruction in reversed(self._instructions):
+            if instruction not in removed:
+                following = instruction
+            elif following is not None:
+                for link in list(instruction.links):
+                    link.jump = following
+            elif any(link not in removed for link in instruction.links):
+                # nothing has been redirected yet, since the end of the program is visited first
+                msg = f"{instruction} is a jump target with no instruction after it to redirect the jump to."
+                raise ValueError(msg)
+        self.instructions = [instruction for instruction in self._instructions if instruction not in removed]
+        for instruction in removed:
+            instruction.jump = None
 
     def optimize(self, optimizers: list[NCSOptimizer]) -> None:
         """Optimize the model using the provided optimizers.
@@ -293,9 +366,23 @@ class NCSInstruction:
         jump: NCSInstruction | None = None,
     ):
         self.ins_type: NCSInstructionType = ins_type
-        self.jump: NCSInstruction | None = jump
+        self.links: dict[NCSInstruction, None] = {}  # instructions jumping to this one, kept in order by the jump setter
+        self._jump: NCSInstruction | None = None
+        self.jump = jump
         self.args: list[Any] = args if args is not None else []
 
+    @property
+    def jump(self) -> NCSInstruction | None:
+        return self._jump
+
+    @jump.setter
+    def jump(self, target: NCSInstruction | None):
+        if self._jump is not None:
+            self._jump.links.pop(self, None)
+        self._jump = target
+        if target is not None:
+            target.links[self] = None
+
     def __str__(self):
         if self.jump is None:
             return f"Instruction: {self.ins_type.name} {self.args}"
@@ -1,6 +1,13 @@
-from copy import copy
+from __future__ import annotations
 
-from pykotor.resource.formats.ncs.ncs_data import NCS, NCSInstructionType, NCSOptimizer
+import math
+import struct
+from typing import Callable
+
+from pykotor.resource.formats.ncs.ncs_data import NCS, NCSInstruction, NCSInstructionType, NCSOptimizer
+
+BRANCH_TYPES = (NCSInstructionType.JZ, NCSInstructionType.JNZ, NCSInstructionType.JSR)
+JUMP_TYPES = (NCSInstructionType.JMP, *BRANCH_TYPES)
 
 
 class RemoveNopOptimizer(NCSOptimizer):
@@ -22,16 +29,11 @@ class RemoveNopOptimizer(NCSOptimizer):
             - For each NOP, finds all links jumping to it and updates them to jump to the next instruction instead
             - Removes all NOP instructions from the NCS instruction list.
         """
-        nops = [inst for inst in ncs.instructions if inst.ins_type == NCSInstructionType.NOP]
-
-        # Process instructions which jump to a NOP and set them to jump to the proceeding instruction instead
-        for nop in nops:
-            nop_index = ncs.instructions.index(nop)
-            for link in ncs.links_to(nop):
-                link.jump = ncs.instructions[nop_index + 1]
+        nops = {inst for inst in ncs.instructions if inst.ins_type == NCSInstructionType.NOP}
 
-        # It is now safe to remove all NOP instructions
-        ncs.instructions = [inst for inst in ncs.instructions if inst.ins_type != NCSInstructionType.NOP]
+        # Instructions which jump to a NOP are set to jump to the proceeding instruction instead
+        ncs.remove(nops)
+        self.instructions_cleared += len(nops)
 
 
 class RemoveMoveSPEqualsZeroOptimizer(NCSOptimizer):
@@ -51,34 +53,68 @@ class RemoveMoveSPEqualsZeroOptimizer(NCSOptimizer):
             - Changes any jumps to those instructions to jump to the next instruction instead
             - Removes all MOVSP=0 instructions from the program.
         """
-        movsp0 = [inst for inst in ncs.instructions if inst.ins_type == NCSInstructionType.MOVSP and inst.args[0] == 0]
+        movsp0 = {inst for inst in ncs.instructions if inst.ins_type == NCSInstructionType.MOVSP and inst.args[0] == 0}
 
-        # Process instructions which jump to a MOVSP=0 and set them to jump to the proceeding instruction instead
-        for op in movsp0:
-            nop_index = ncs.instructions.index(op)
-            for link in ncs.links_to(op):
-                link.jump = ncs.instructions[nop_index + 1]
-
-        # It is now safe to remove all MOVSP=0 instructions
-        for inst in copy(ncs.instructions):
-            if inst.ins_type == NCSInstructionType.MOVSP and inst.args[0] == 0:
-                ncs.instructions.remove(inst)
-                self.instructions_cleared += 1
+        # Instructions which jump to a MOVSP=0 are set to jump to the proceeding instruction instead
+        ncs.remove(movsp0)
+        self.instructions_cleared += len(movsp0)
 
 
 class MergeAdjacentMoveSPOptimizer(NCSOptimizer):
     def optimize(self, ncs: NCS) -> None:
-        raise NotImplementedError
+        """Merges runs of MOVSP instructions into the first MOVSP of the run.
+
+        Args:
+        ----
+            ncs: The NCS script to optimize
+
+        Processing Logic:
+        ----------------
+            - A MOVSP directly after another MOVSP is merged into it, unless it is the target of a jump
+            - Merged MOVSP instructions are removed in a single pass.
+        """
+        merged: set[NCSInstruction] = set()
+        previous: NCSInstruction | None = None
+        for inst in ncs.instructions:
+            if inst.ins_type != NCSInstructionType.MOVSP:
+                previous = None
+            elif previous is not None and not ncs.links_to(inst):
+                previous.args[0] += inst.args[0]
+                merged.add(inst)
+            else:
+                previous = inst
+
+        ncs.remove(merged)
+        self.instructions_cleared += len(merged)
 
 
 class RemoveJMPToAdjacentOptimizer(NCSOptimizer):
     def optimize(self, ncs: NCS) -> None:
-        raise NotImplementedError
+        """Removes JMP instructions that jump to the instruction directly after them.
+
+        Args:
+        ----
+            ncs: The NCS script to optimize
+
+        Processing Logic:
+        ----------------
+            - Finds JMP instructions whose target is the next instruction
+            - Removes them, redirecting any jumps to them to the next instruction.
+        """
+        instructions = ncs.instructions
+        adjacent = {
+            inst
+            for inst, following in zip(instructions, instructions[1:])
+            if inst.ins_type == NCSInstructionType.JMP and inst.jump is following
+        }
+
+        ncs.remove(adjacent)
+        self.instructions_cleared += len(adjacent)
 
 
 class RemoveUnusedBlocksOptimizer(NCSOptimizer):
     def optimize(self, ncs: NCS) -> None:
-        """Optimizes the NCS by removing unreachable instructions.
+        """Optimizes the NCS by removing unreachable basic blocks.
 
         Args:
         ----
@@ -86,45 +122,275 @@ class RemoveUnusedBlocksOptimizer(NCSOptimizer):
 
         Processing Logic:
         ----------------
-            - Find list of reachable instructions using breadth first search
-            - Instructions not in reachable list are unreachable
-            - Remove unreachable instructions from NCS.
+            - Build the control flow graph of the script
+            - Find the blocks reachable from the first block using depth first search
+            - Remove the instructions of every other block from NCS.
         """
-        # Find list of unreachable instructions
-        reachable = set()
-        checking = [0]
+        blocks = build_cfg(ncs)
+        if not blocks:
+            return
+
+        # We do not have to worry about fixing any instructions that JMP since the target instructions here should
+        # be detached for the actual (reachable) script.
+        reachable: set[int] = set()
+        checking = [blocks[0]]
         while checking:
-            check = checking.pop(0)
-            if check > len(ncs.instructions):
+            block = checking.pop()
+            if block.start in reachable:
                 continue
+            reachable.add(block.start)
+            checking.extend(block.successors)
 
-            instruction = ncs.instructions[check]
-            if instruction in reachable:
-                continue
-            reachable.add(instruction)
-
-            if instruction.ins_type in [
-                NCSInstructionType.JZ,
-                NCSInstructionType.JNZ,
-                NCSInstructionType.JSR,
-            ]:
-                checking.append(ncs.instructions.index(instruction.jump))
-                checking.append(check + 1)
-            elif instruction.ins_type in [NCSInstructionType.JMP]:
-                checking.append(ncs.instructions.index(instruction.jump))
-            elif instruction.ins_type in [NCSInstructionType.RETN]:
-                ...
+        instructions = []
+        for block in blocks:
+            if block.start in reachable:
+                instructions.extend(block.instructions)
             else:
-                checking.append(check + 1)
-
-        unreachable = [instruction for instruction in ncs.instructions if instruction not in reachable]
-        for instruction in unreachable:
-            # We do not have to worry about fixing any instructions that JMP since the target instructions here should
-            # be detached for the actual (reachable) script.
-            ncs.instructions.remove(instruction)
-            self.instructions_cleared += 1
+                for inst in block.instructions:
+                    inst.jump = None
+        self.instructions_cleared += len(ncs.instructions) - len(instructions)
+        ncs.instructions = instructions
 
 
 class RemoveUnusedGlobalsInStackOptimizer(NCSOptimizer):
     def optimize(self, ncs: NCS) -> None:
         raise NotImplementedError
+
+
+class ThreadJumpsOptimizer(NCSOptimizer):
+    def optimize(self, ncs: NCS) -> None:
+        """Points jumps that land on a JMP straight at the final target of the chain.
+
+        Args:
+        ----
+            ncs: The NCS script to optimize
+
+        Processing Logic:
+        ----------------
+            - Follows the chain of JMP instructions from the target of every jump
+            - Stops at the first instruction that is not a JMP, or when the chain loops
+            - The JMPs that are skipped over are left for RemoveUnusedBlocksOptimizer.
+        """
+        for inst in ncs.instructions:
+            if inst.ins_type not in JUMP_TYPES or inst.jump is None:
+                continue
+            target = inst.jump
+            seen = {inst}
+            while target.ins_type == NCSInstructionType.JMP and target.jump is not None and target not in seen:
+                seen.add(target)
+                target = target.jump
+            if target is not inst.jump:
+                inst.jump = target
+
+
+def _int32(value: int) -> int:
+    return (value + 0x80000000) % 0x100000000 - 0x80000000
+
+
+def _float32(value: float) -> float:
+    return struct.unpack("<f", struct.pack("<f", value))[0]
+
+
+def _div(a: int, b: int) -> int:
+    return abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+
+
+def _mod(a: int, b: int) -> int:
+    return a - _div(a, b) * b
+
+
+_BINARY_FOLDS: dict[NCSInstructionType, tuple[NCSInstructionType, Callable]] = {
+    NCSInstructionType.ADDII: (NCSInstructionType.CONSTI, lambda a, b: _int32(a + b)),
+    NCSInstructionType.SUBII: (NCSInstructionType.CONSTI, lambda a, b: _int32(a - b)),
+    NCSInstructionType.MULII: (NCSInstructionType.CONSTI, lambda a, b: _int32(a * b)),
+    NCSInstructionType.DIVII: (NCSInstructionType.CONSTI, lambda a, b: _int32(_div(a, b))),
+    NCSInstructionType.MODII: (NCSInstructionType.CONSTI, lambda a, b: _int32(_mod(a, b))),
+    NCSInstructionType.ADDFF: (NCSInstructionType.CONSTF, lambda a, b: _float32(_float32(a) + _float32(b))),
+    NCSInstructionType.SUBFF: (NCSInstructionType.CONSTF, lambda a, b: _float32(_float32(a) - _float32(b))),
+    NCSInstructionType.MULFF: (NCSInstructionType.CONSTF, lambda a, b: _float32(_float32(a) * _float32(b))),
+    NCSInstructionType.DIVFF: (NCSInstructionType.CONSTF, lambda a, b: _float32(_float32(a) / _float32(b))),
+}
+_UNARY_FOLDS: dict[NCSInstructionType, tuple[NCSInstructionType, Callable]] = {
+    NCSInstructionType.NEGI: (NCSInstructionType.CONSTI, lambda a: _int32(-a)),
+    NCSInstructionType.NEGF: (NCSInstructionType.CONSTF, lambda a: _float32(-a)),
+}
+
+
+class FoldConstantsOptimizer(NCSOptimizer):
+    def optimize(self, ncs: NCS) -> None:
+        """Replaces arithmetic on CONSTI/CONSTF operands with the constant result.
+
+        Args:
+        ----
+            ncs: The NCS script to optimize
+
+        Processing Logic:
+        ----------------
+            - Instructions are copied to a new list, and the tail of the list is folded after every append
+            - CONST a, CONST b, OP becomes CONST (a OP b), and CONST a, NEG becomes CONST (-a)
+            - The first constant is kept and updated, so jumps to it stay valid; nothing else may be a jump target
+            - Division or modulo by zero and results that are not finite floats are left to fail at runtime.
+        """
+        folded: list[NCSInstruction] = []
+        for inst in ncs.instructions:
+            folded.append(inst)
+            while self._fold_tail(ncs, folded):
+                pass
+        self.instructions_cleared += len(ncs.instructions) - len(folded)
+        ncs.instructions = folded
+
+    def _fold_tail(
+        self,
+        ncs: NCS,
+        folded: list[NCSInstruction],
+    ) -> bool:
+        operation = folded[-1]
+        if operation.ins_type in _BINARY_FOLDS and len(folded) >= 3:
+            const_type, fold = _BINARY_FOLDS[operation.ins_type]
+            first, second = folded[-3], folded[-2]
+            operands = (first, second)
+        elif operation.ins_type in _UNARY_FOLDS and len(folded) >= 2:
+            const_type, fold = _UNARY_FOLDS[operation.ins_type]
+            first = folded[-2]
+            operands = (first,)
+        else:
+            return False
+
+        if any(operand.ins_type != const_type for operand in operands):
+            return False
+        if any(ncs.links_to(inst) for inst in folded[-len(operands) :]):
+            return False
+        try:
+            value = fold(*(operand.args[0] for operand in operands))
+        except (ZeroDivisionError, OverflowError):
+            return False
+        if isinstance(value, float) and not math.isfinite(value):
+            return False
+
+        first.args[0] = value
+        for inst in folded[-len(operands) :]:
+            inst.jump = None
+        del folded[-len(operands) :]
+        return True
+
+
+class NCSPassManager(NCSOptimizer):
+    """Runs a pipeline of optimizers over a script until none of them changes it.
+
+    Passes enable each other: threading jumps can leave blocks unreachable, removing blocks can make JMPs adjacent to
+    their targets and merged MOVSP instructions can add up to zero, so the pipeline is repeated until a full run leaves
+    the script as it was, or max_iterations is reached.
+    """
+
+    def __init__(
+        self,
+        passes: list[NCSOptimizer],
+        max_iterations: int = 10,
+    ):
+        super().__init__()
+        self.passes: list[NCSOptimizer] = passes
+        self.max_iterations: int = max_iterations
+
+    @classmethod
+    def for_level(
+        cls,
+        level: int,
+    ) -> NCSPassManager:
+        """Returns the pipeline for an optimization level.
+
+        Args:
+        ----
+            level: 0 runs no passes. 1 runs the peephole passes that do not need a control flow graph. 2 also folds
+                   constants, threads jumps and removes unreachable blocks.
+
+        Returns:
+        -------
+            The pass manager.
+        """
+        passes: list[NCSOptimizer] = []
+        if level >= 1:
+            passes.extend((MergeAdjacentMoveSPOptimizer(), RemoveMoveSPEqualsZeroOptimizer(), RemoveJMPToAdjacentOptimizer()))
+        if level >= 2:
+            passes[:0] = (FoldConstantsOptimizer(), ThreadJumpsOptimizer(), RemoveUnusedBlocksOptimizer())
+        return cls(passes)
+
+    def optimize(self, ncs: NCS) -> None:
+        if not self.passes:
+            return
+        for _ in range(self.max_iterations):
+            before = _fingerprint(ncs)
+            for optimizer in self.passes:
+                cleared = optimizer.instructions_cleared
+                optimizer.optimize(ncs)
+                self.instructions_cleared += optimizer.instructions_cleared - cleared
+            if _fingerprint(ncs) == before:
+                break
+
+    def reset(self) -> None:
+        super().reset()
+        for optimizer in self.passes:
+            optimizer.reset()
+
+
+def _fingerprint(
+    ncs: NCS,
+) -> list[tuple]:
+    return [(inst.ins_type, *inst.args, None if inst.jump is None else id(inst.jump)) for inst in ncs.instructions]
+
+
+class BasicBlock:
+    """A run of instructions that is only entered at its first instruction and only branches at its last."""
+
+    def __init__(
+        self,
+        start: int,
+        instructions: list[NCSInstruction],
+    ):
+        self.start: int = start  # index of the first instruction in the script
+        self.instructions: list[NCSInstruction] = instructions
+        self.successors: list[BasicBlock] = []
+
+
+def build_cfg(
+    ncs: NCS,
+) -> list[BasicBlock]:
+    """Splits a script into basic blocks and links each block to the blocks that may run after it.
+
+    A STORE_STATE is followed by a JMP over the code saved for DelayCommand and similar actions, which starts two
+    instructions after the STORE_STATE. That code is entered by the engine rather than by a jump, so it is treated as a
+    successor of the STORE_STATE block.
+
+    Args:
+    ----
+        ncs: The script.
+
+    Returns:
+    -------
+        The blocks in script order.
+    """
+    instructions = ncs.instructions
+    count = len(instructions)
+    leaders: set[int] = {0} if count else set()
+    for i, inst in enumerate(instructions):
+        if inst.ins_type in JUMP_TYPES and inst.jump is not None:
+            leaders.add(ncs.index(inst.jump))
+        if inst.ins_type in (*JUMP_TYPES, NCSInstructionType.RETN, NCSInstructionType.STORE_STATE) and i + 1 < count:
+            leaders.add(i + 1)
+        if inst.ins_type == NCSInstructionType.STORE_STATE and i + 2 < count:
+            leaders.add(i + 2)
+
+    starts = sorted(leaders)
+    blocks = [BasicBlock(start, instructions[start:end]) for start, end in zip(starts, [*starts[1:], count])]
+    by_start = {block.start: block for block in blocks}
+    for block in blocks:
+        last = block.instructions[-1]
+        following = block.start + len(block.instructions)
+        targets: list[int] = []
+        if last.ins_type in JUMP_TYPES and last.jump is not None:
+            targets.append(ncs.index(last.jump))
+        if last.ins_type == NCSInstructionType.STORE_STATE:
+            targets.extend((following, following + 1))
+        elif last.ins_type not in (NCSInstructionType.JMP, NCSInstructionType.RETN):
+            targets.append(following)
+        block.successors = [by_start[target] for target in targets if target in by_start]
+    return blocks
@@ -2,6 +2,18 @@ from .tpc_data import (
     TPC,
     TPCTextureFormat,
 )
+from .dxt import (
+    decode_dxt1,
+    decode_dxt5,
+    encode_dxt1,
+    encode_dxt5,
+)
+from .mipmap import (
+    MipmapFilter,
+    downsample,
+    generate_mipmaps,
+    mipmap_sizes,
+)
 from .io_tpc import (
     TPCBinaryReader,
     TPCBinaryWriter,
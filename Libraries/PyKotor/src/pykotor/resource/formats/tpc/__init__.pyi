@@ -1,5 +1,7 @@
+from .dxt import decode_dxt1 as decode_dxt1, decode_dxt5 as decode_dxt5, encode_dxt1 as encode_dxt1, encode_dxt5 as encode_dxt5
 from .io_bmp import TPCBMPWriter as TPCBMPWriter
 from .io_tga import TPCTGAReader as TPCTGAReader, TPCTGAWriter as TPCTGAWriter
 from .io_tpc import TPCBinaryReader as TPCBinaryReader, TPCBinaryWriter as TPCBinaryWriter
+from .mipmap import MipmapFilter as MipmapFilter, downsample as downsample, generate_mipmaps as generate_mipmaps, mipmap_sizes as mipmap_sizes
 from .tpc_auto import bytes_tpc as bytes_tpc, detect_tpc as detect_tpc, read_tpc as read_tpc, write_tpc as write_tpc
 from .tpc_data import TPC as TPC, TPCTextureFormat as TPCTextureFormat
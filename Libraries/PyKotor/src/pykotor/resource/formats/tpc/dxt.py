@@ -0,0 +1,458 @@
+"""This module decodes and encodes DXT1/DXT5 (BC1/BC3) compressed texture data.
+
+All blocks of a mipmap are processed at once when NumPy is installed, otherwise a pure-Python implementation producing
+identical results is used.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import types
+
+np: types.ModuleType | None = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_COLOR_BLOCK = struct.Struct("<HHI")
+
+# Palette weights used by the original per-block decoder; kept as-is so decoded textures are unchanged.
+_WEIGHT_FOUR_COLOR = (0.3333333, 0.6666666)
+_WEIGHT_THREE_COLOR = 0.5555555
+
+
+def decode_dxt1(
+    data: bytes,
+    width: int,
+    height: int,
+    channels: int = 4,
+) -> bytearray:
+    """Decodes DXT1 compressed texture data into RGB or RGBA pixels.
+
+    Args:
+    ----
+        data: The compressed DXT1 data of a single mipmap.
+        width: Width of the mipmap in pixels.
+        height: Height of the mipmap in pixels.
+        channels: 3 to return RGB pixels, 4 to return RGBA pixels.
+
+    Returns:
+    -------
+        The uncompressed pixel data, row by row.
+    """
+    if np is not None:
+        return _decode_numpy(data, width, height, channels, dxt5=False)
+    return _decode_python(data, width, height, channels, dxt5=False)
+
+
+def decode_dxt5(
+    data: bytes,
+    width: int,
+    height: int,
+    channels: int = 4,
+) -> bytearray:
+    """Decodes DXT5 compressed texture data into RGB or RGBA pixels.
+
+    Args:
+    ----
+        data: The compressed DXT5 data of a single mipmap.
+        width: Width of the mipmap in pixels.
+        height: Height of the mipmap in pixels.
+        channels: 3 to return RGB pixels, 4 to return RGBA pixels.
+
+    Returns:
+    -------
+        The uncompressed pixel data, row by row.
+    """
+    if np is not None:
+        return _decode_numpy(data, width, height, channels, dxt5=True)
+    return _decode_python(data, width, height, channels, dxt5=True)
+
+
+def encode_dxt1(
+    data: bytes,
+    width: int,
+    height: int,
+) -> bytearray:
+    """Compresses RGBA pixels into DXT1 blocks. The alpha channel is discarded.
+
+    Args:
+    ----
+        data: The RGBA pixel data, row by row.
+        width: Width of the image in pixels.
+        height: Height of the image in pixels.
+
+    Returns:
+    -------
+        The compressed DXT1 data.
+    """
+    if np is not None:
+        return _encode_numpy(data, width, height, dxt5=False)
+    return _encode_python(data, width, height, dxt5=False)
+
+
+def encode_dxt5(
+    data: bytes,
+    width: int,
+    height: int,
+) -> bytearray:
+    """Compresses RGBA pixels into DXT5 blocks.
+
+    Args:
+    ----
+        data: The RGBA pixel data, row by row.
+        width: Width of the image in pixels.
+        height: Height of the image in pixels.
+
+    Returns:
+    -------
+        The compressed DXT5 data.
+    """
+    if np is not None:
+        return _encode_numpy(data, width, height, dxt5=True)
+    return _encode_python(data, width, height, dxt5=True)
+
+
+def _block_count(
+    width: int,
+    height: int,
+) -> tuple[int, int]:
+    return max(1, (width + 3) // 4), max(1, (height + 3) // 4)
+
+
+# region Pure-Python
+def _unpack565(
+    color: int,
+) -> tuple[int, int, int]:
+    return (color >> 11 & 0x1F) << 3, (color >> 5 & 0x3F) << 2, (color & 0x1F) << 3
+
+
+def _pack565(
+    red: int,
+    green: int,
+    blue: int,
+) -> int:
+    return min(31, (red + 4) >> 3) << 11 | min(63, (green + 2) >> 2) << 5 | min(31, (blue + 4) >> 3)
+
+
+def _interpolate(
+    weight: float,
+    color0: tuple[int, int, int],
+    color1: tuple[int, int, int],
+) -> tuple[int, int, int]:
+    return (
+        int((1.0 - weight) * color0[0] + weight * color1[0]),
+        int((1.0 - weight) * color0[1] + weight * color1[1]),
+        int((1.0 - weight) * color0[2] + weight * color1[2]),
+    )
+
+
+def _color_palette(
+    color0: int,
+    color1: int,
+) -> list[tuple[int, int, int]]:
+    rgb0 = _unpack565(color0)
+    rgb1 = _unpack565(color1)
+    if color0 > color1:
+        return [rgb0, rgb1, _interpolate(_WEIGHT_FOUR_COLOR[0], rgb0, rgb1), _interpolate(_WEIGHT_FOUR_COLOR[1], rgb0, rgb1)]
+    return [rgb0, rgb1, _interpolate(_WEIGHT_THREE_COLOR, rgb0, rgb1), (0, 0, 0)]
+
+
+def _alpha_palette(
+    alpha0: int,
+    alpha1: int,
+) -> list[int]:
+    if alpha0 > alpha1:
+        return [alpha0, alpha1] + [((7 - i) * alpha0 + i * alpha1 + 3) // 7 for i in range(1, 7)]
+    return [
+        alpha0,
+        alpha1,
+        (4 * alpha0 + alpha1 + 1) // 5,
+        (3 * alpha0 + 2 * alpha1 + 2) // 5,
+        (2 * alpha0 + 3 * alpha1 + 2) // 5,
+        (alpha0 + 4 * alpha1 + 2) // 5,
+        0,
+        255,
+    ]
+
+
+def _decode_python(
+    data: bytes,
+    width: int,
+    height: int,
+    channels: int,
+    *,
+    dxt5: bool,
+) -> bytearray:
+    blocks_x, blocks_y = _block_count(width, height)
+    block_size = 16 if dxt5 else 8
+    stride = blocks_x * 4 * channels
+    pixels = bytearray(stride * blocks_y * 4)
+
+    alphas = [255] * 16
+    offset = 0
+    for block_y in range(blocks_y):
+        for block_x in range(blocks_x):
+            if dxt5:
+                alpha_palette = _alpha_palette(data[offset], data[offset + 1])
+                alpha_bits = int.from_bytes(data[offset + 2 : offset + 8], "little")
+                alphas = [alpha_palette[alpha_bits >> (3 * i) & 7] for i in range(16)]
+            color0, color1, color_bits = _COLOR_BLOCK.unpack_from(data, offset + block_size - 8)
+            palette = _color_palette(color0, color1)
+            offset += block_size
+
+            for i in range(16):
+                index = (block_y * 4 + (i >> 2)) * stride + (block_x * 4 + (i & 3)) * channels
+                red, green, blue = palette[color_bits >> (2 * i) & 3]
+                pixels[index] = red
+                pixels[index + 1] = green
+                pixels[index + 2] = blue
+                if channels == 4:
+                    pixels[index + 3] = alphas[i]
+
+    return _crop(pixels, blocks_x * 4, width, height, channels)
+
+
+def _crop(
+    pixels: bytearray,
+    padded_width: int,
+    width: int,
+    height: int,
+    channels: int,
+) -> bytearray:
+    if padded_width == width and len(pixels) == width * height * channels:
+        return pixels
+    row_size = width * channels
+    stride = padded_width * channels
+    cropped = bytearray()
+    for y in range(height):
+        cropped += pixels[y * stride : y * stride + row_size]
+    return cropped
+
+
+def _encode_python(
+    data: bytes,
+    width: int,
+    height: int,
+    *,
+    dxt5: bool,
+) -> bytearray:
+    blocks_x, blocks_y = _block_count(width, height)
+    compressed = bytearray()
+    for block_y in range(blocks_y):
+        for block_x in range(blocks_x):
+            block = []
+            for i in range(16):
+                x = min(block_x * 4 + (i & 3), width - 1)
+                y = min(block_y * 4 + (i >> 2), height - 1)
+                index = (y * width + x) * 4
+                block.append(data[index : index + 4])
+
+            if dxt5:
+                alpha0 = max(pixel[3] for pixel in block)
+                alpha1 = min(pixel[3] for pixel in block)
+                alpha_palette = _alpha_palette(alpha0, alpha1)
+                alpha_bits = 0
+                for i, pixel in enumerate(block):
+                    alpha_bits |= _nearest_alpha(alpha_palette, pixel[3]) << (3 * i)
+                compressed += bytes((alpha0, alpha1))
+                compressed += alpha_bits.to_bytes(6, "little")
+
+            low = [min(pixel[c] for pixel in block) for c in range(3)]
+            high = [max(pixel[c] for pixel in block) for c in range(3)]
+            inset = [(high[c] - low[c]) >> 4 for c in range(3)]
+            color0 = _pack565(*(high[c] - inset[c] for c in range(3)))
+            color1 = _pack565(*(low[c] + inset[c] for c in range(3)))
+            color_bits = 0
+            if color0 != color1:  # equal endpoints select the three-colour palette, a solid block only needs index 0
+                palette = _color_palette(color0, color1)
+                for i, pixel in enumerate(block):
+                    color_bits |= _nearest_color(palette, pixel) << (2 * i)
+            compressed += _COLOR_BLOCK.pack(color0, color1, color_bits)
+
+    return compressed
+
+
+def _nearest_color(
+    palette: list[tuple[int, int, int]],
+    pixel: bytes,
+) -> int:
+    nearest = 0
+    nearest_distance = 0x40000
+    for i, (red, green, blue) in enumerate(palette):
+        distance = (pixel[0] - red) ** 2 + (pixel[1] - green) ** 2 + (pixel[2] - blue) ** 2
+        if distance < nearest_distance:
+            nearest, nearest_distance = i, distance
+    return nearest
+
+
+def _nearest_alpha(
+    palette: list[int],
+    alpha: int,
+) -> int:
+    nearest = 0
+    nearest_distance = 256
+    for i, value in enumerate(palette):
+        distance = abs(alpha - value)
+        if distance < nearest_distance:
+            nearest, nearest_distance = i, distance
+    return nearest
+
+
+# endregion
+
+
+# region NumPy
+def _unpack565_numpy(
+    colors,
+):
+    return np.stack([(colors >> 11 & 0x1F) << 3, (colors >> 5 & 0x3F) << 2, (colors & 0x1F) << 3], axis=-1).astype(np.float64)
+
+
+def _color_palette_numpy(
+    color0,
+    color1,
+):
+    """Returns the four palette entries of every block as an array of shape (blocks, 4, 3)."""
+    rgb0 = _unpack565_numpy(color0)
+    rgb1 = _unpack565_numpy(color1)
+    four_color = (color0 > color1)[:, None]
+
+    weight2 = np.where(four_color, _WEIGHT_FOUR_COLOR[0], _WEIGHT_THREE_COLOR)
+    weight3 = _WEIGHT_FOUR_COLOR[1]
+    color2 = (1.0 - weight2) * rgb0 + weight2 * rgb1
+    color3 = np.where(four_color, (1.0 - weight3) * rgb0 + weight3 * rgb1, 0.0)
+    return np.stack([rgb0, rgb1, color2, color3], axis=1).astype(np.int32)
+
+
+def _alpha_palette_numpy(
+    alpha0,
+    alpha1,
+):
+    """Returns the eight palette entries of every block as an array of shape (blocks, 8)."""
+    alpha0 = alpha0.astype(np.int32)
+    alpha1 = alpha1.astype(np.int32)
+    eight_alpha = [((7 - i) * alpha0 + i * alpha1 + 3) // 7 for i in range(1, 7)]
+    six_alpha = [
+        (4 * alpha0 + alpha1 + 1) // 5,
+        (3 * alpha0 + 2 * alpha1 + 2) // 5,
+        (2 * alpha0 + 3 * alpha1 + 2) // 5,
+        (alpha0 + 4 * alpha1 + 2) // 5,
+        np.zeros_like(alpha0),
+        np.full_like(alpha0, 255),
+    ]
+    interpolated = np.where((alpha0 > alpha1)[:, None], np.stack(eight_alpha, axis=1), np.stack(six_alpha, axis=1))
+    return np.concatenate([alpha0[:, None], alpha1[:, None], interpolated], axis=1)
+
+
+def _decode_numpy(
+    data: bytes,
+    width: int,
+    height: int,
+    channels: int,
+    *,
+    dxt5: bool,
+) -> bytearray:
+    blocks_x, blocks_y = _block_count(width, height)
+    block_count = blocks_x * blocks_y
+    block_size = 16 if dxt5 else 8
+    blocks = np.frombuffer(data, dtype=np.uint8, count=block_count * block_size).reshape(block_count, block_size)
+    rows = np.arange(block_count)[:, None]
+
+    color_block = blocks[:, block_size - 8 :]
+    color0 = color_block[:, 0:2].copy().view("<u2").ravel()
+    color1 = color_block[:, 2:4].copy().view("<u2").ravel()
+    color_bits = color_block[:, 4:8].copy().view("<u4").ravel()
+    color_codes = color_bits[:, None] >> np.arange(0, 32, 2, dtype=np.uint32) & 3
+    pixels = np.empty((block_count, 16, channels), dtype=np.uint8)
+    pixels[:, :, :3] = _color_palette_numpy(color0, color1)[rows, color_codes]
+
+    if channels == 4:
+        if dxt5:
+            alpha_bits = np.zeros((block_count, 8), dtype=np.uint8)
+            alpha_bits[:, :6] = blocks[:, 2:8]
+            alpha_bits = alpha_bits.view("<u8").ravel()
+            alpha_codes = alpha_bits[:, None] >> np.arange(0, 48, 3, dtype=np.uint64) & 7
+            pixels[:, :, 3] = _alpha_palette_numpy(blocks[:, 0], blocks[:, 1])[rows, alpha_codes.astype(np.intp)]
+        else:
+            pixels[:, :, 3] = 255
+
+    image = pixels.reshape(blocks_y, blocks_x, 4, 4, channels).transpose(0, 2, 1, 3, 4)
+    image = image.reshape(blocks_y * 4, blocks_x * 4, channels)[:height, :width]
+    return bytearray(image.tobytes())
+
+
+def _pack565_numpy(
+    rgb,
+):
+    red = np.minimum(31, (rgb[:, 0] + 4) >> 3)
+    green = np.minimum(63, (rgb[:, 1] + 2) >> 2)
+    blue = np.minimum(31, (rgb[:, 2] + 4) >> 3)
+    return (red << 11 | green << 5 | blue).astype(np.uint16)
+
+
+def _nearest_numpy(
+    values,
+    palette,
+):
+    """Returns the index of the closest palette entry for every pixel, picking the lowest index on ties."""
+    distance = np.abs(values - palette[:, None, 0, ...])
+    if distance.ndim == 3:
+        distance = (distance * distance).sum(axis=2)
+    nearest = np.zeros(distance.shape, dtype=np.uint32)
+    for i in range(1, palette.shape[1]):
+        candidate = np.abs(values - palette[:, None, i, ...])
+        if candidate.ndim == 3:
+            candidate = (candidate * candidate).sum(axis=2)
+        closer = candidate < distance
+        nearest[closer] = i
+        np.minimum(distance, candidate, out=distance)
+    return nearest
+
+
+def _encode_numpy(
+    data: bytes,
+    width: int,
+    height: int,
+    *,
+    dxt5: bool,
+) -> bytearray:
+    blocks_x, blocks_y = _block_count(width, height)
+    block_count = blocks_x * blocks_y
+    image = np.frombuffer(data, dtype=np.uint8, count=width * height * 4).reshape(height, width, 4)
+    image = np.pad(image, ((0, blocks_y * 4 - height), (0, blocks_x * 4 - width), (0, 0)), mode="edge")
+    pixels = image.reshape(blocks_y, 4, blocks_x, 4, 4).transpose(0, 2, 1, 3, 4).reshape(block_count, 16, 4).astype(np.int32)
+
+    compressed = np.empty((block_count, 16 if dxt5 else 8), dtype=np.uint8)
+    if dxt5:
+        alphas = pixels[:, :, 3]
+        alpha0 = alphas.max(axis=1)
+        alpha1 = alphas.min(axis=1)
+        alpha_codes = _nearest_numpy(alphas, _alpha_palette_numpy(alpha0, alpha1)).astype(np.uint64)
+        alpha_bits = (alpha_codes << np.arange(0, 48, 3, dtype=np.uint64)).sum(axis=1, dtype=np.uint64)
+        compressed[:, 0] = alpha0
+        compressed[:, 1] = alpha1
+        compressed[:, 2:8] = alpha_bits.astype("<u8").view(np.uint8).reshape(block_count, 8)[:, :6]
+
+    rgb = pixels[:, :, :3]
+    low = rgb.min(axis=1)
+    high = rgb.max(axis=1)
+    inset = (high - low) >> 4
+    color0 = _pack565_numpy(high - inset)
+    color1 = _pack565_numpy(low + inset)
+    color_codes = _nearest_numpy(rgb, _color_palette_numpy(color0, color1))
+    color_codes[color0 == color1] = 0  # see _encode_python()
+    color_bits = (color_codes << np.arange(0, 32, 2, dtype=np.uint32)).sum(axis=1, dtype=np.uint32)
+
+    color_block = compressed[:, -8:]
+    color_block[:, 0:2] = color0.astype("<u2").view(np.uint8).reshape(block_count, 2)
+    color_block[:, 2:4] = color1.astype("<u2").view(np.uint8).reshape(block_count, 2)
+    color_block[:, 4:8] = color_bits.astype("<u4").view(np.uint8).reshape(block_count, 4)
+    return bytearray(compressed.tobytes())
+
+
+# endregion
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-import struct
 from enum import IntEnum
 
-from pykotor.common.stream import BinaryReader
 from pykotor.resource.formats.tpc.tpc_data import TPC, TPCTextureFormat
 from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES, ResourceReader, ResourceWriter, autoclose
 
@@ -178,26 +176,21 @@ class TPCTGAReader(ResourceReader):
             if bits_per_pixel not in [24, 32]:
                 ValueError("The image must store 24 or 32 bits per pixel.")
 
-            pixel_rows: list[bytearray] = []
-            for y in range(height):
-                pixel_rows.append(bytearray())
-                for _ in range(width):
-                    b, g, r = (
-                        self._reader.read_uint8(),
-                        self._reader.read_uint8(),
-                        self._reader.read_uint8(),
-                    )
-                    if bits_per_pixel == 32:
-                        pixel_rows[y].extend([r, g, b, self._reader.read_uint8()])
-                    else:
-                        pixel_rows[y].extend([r, g, b])
-
+            # Swizzle BGR(A) into RGBA with strided slices instead of reading one byte at a time.
+            bytes_per_pixel = bits_per_pixel // 8
+            pixel_count = width * height
+            raw: bytes = self._reader.read_bytes(pixel_count * bytes_per_pixel)
+            pixels = bytearray(pixel_count * 4)
+            pixels[0::4] = raw[2::bytes_per_pixel]
+            pixels[1::4] = raw[1::bytes_per_pixel]
+            pixels[2::4] = raw[0::bytes_per_pixel]
+            pixels[3::4] = raw[3::4] if bits_per_pixel == 32 else b"\xff" * pixel_count
+
+            row_size = width * 4
+            pixel_rows: list[bytearray] = [pixels[y * row_size : (y + 1) * row_size] for y in range(height)]
             if y_flipped:
-                for pixels in reversed(pixel_rows):
-                    data.extend(pixels)
-            else:
-                for pixels in pixel_rows:
-                    data.extend(pixels)
+                pixel_rows.reverse()
+            data = bytearray(b"".join(pixel_rows))
         elif datatype_code == _DataTypes.UNCOMPRESSED_BLACK_WHITE:
             data = bytearray()
             for _ in range(width * height):
@@ -267,24 +260,19 @@ class TPCTGAWriter(ResourceWriter):
         self._writer.write_uint16(width)
         self._writer.write_uint16(height)
 
+        self._writer.write_uint8(32)  # bits_per_pixel, image_descriptor
+        self._writer.write_uint8(0)
         if self._tpc.format() in [TPCTextureFormat.RGB or TPCTextureFormat.DXT1]:
-            self._writer.write_uint8(32)  # bits_per_pixel, image_descriptor
-            self._writer.write_uint8(0)
             data: bytes | None = self._tpc.convert(TPCTextureFormat.RGB, 0).data
-            pixel_reader: BinaryReader = BinaryReader.from_bytes(data)
-            for _ in range(len(data) // 3):
-                r = pixel_reader.read_uint8()
-                g = pixel_reader.read_uint8()
-                b = pixel_reader.read_uint8()
-                self._writer.write_bytes(struct.pack("BBBB", b, g, r, 255))
+            bytes_per_pixel = 3
         else:
-            self._writer.write_uint8(32)
-            self._writer.write_uint8(0)
-            width, height, data = self._tpc.convert(TPCTextureFormat.RGBA, 0)
-            pixel_reader = BinaryReader.from_bytes(data)
-            for _ in range(len(data) // 4):
-                r = pixel_reader.read_uint8()
-                g = pixel_reader.read_uint8()
-                b = pixel_reader.read_uint8()
-                a = pixel_reader.read_uint8()
-                self._writer.write_bytes(struct.pack("BBBB", b, g, r, a))
\ No newline at end of file
+            data = self._tpc.convert(TPCTextureFormat.RGBA, 0).data
+            bytes_per_pixel = 4
+
+        pixel_count = len(data) // bytes_per_pixel
+        pixels = bytearray(pixel_count * 4)
+        pixels[0::4] = data[2::bytes_per_pixel]
+        pixels[1::4] = data[1::bytes_per_pixel]
+        pixels[2::4] = data[0::bytes_per_pixel]
+        pixels[3::4] = data[3::4] if bytes_per_pixel == 4 else b"\xff" * pixel_count
+        self._writer.write_bytes(pixels)
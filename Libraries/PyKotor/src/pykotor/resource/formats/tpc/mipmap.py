@@ -0,0 +1,229 @@
+"""This module downsamples RGBA pixel data and builds mipmap chains.
+
+Like the DXT codec, whole images are filtered as arrays when NumPy is installed and a pure-Python implementation producing
+identical results is used otherwise.
+"""
+
+from __future__ import annotations
+
+import math
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import types
+
+np: types.ModuleType | None = None
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_LANCZOS_LOBES = 3
+
+
+class MipmapFilter(IntEnum):
+    Box = 0
+    Lanczos = 1
+
+
+def mipmap_sizes(
+    width: int,
+    height: int,
+) -> list[tuple[int, int]]:
+    """Returns the dimensions of every mipmap in a full chain, from the full size image down to 1x1.
+
+    Args:
+    ----
+        width: Width of the largest mipmap.
+        height: Height of the largest mipmap.
+
+    Returns:
+    -------
+        A list of (width, height) tuples.
+    """
+    sizes = [(width, height)]
+    while width > 1 or height > 1:
+        width, height = max(1, width >> 1), max(1, height >> 1)
+        sizes.append((width, height))
+    return sizes
+
+
+def downsample(
+    data: bytes,
+    width: int,
+    height: int,
+    mipmap_filter: MipmapFilter = MipmapFilter.Box,
+) -> bytes:
+    """Halves the dimensions of an RGBA image. Dimensions that are already 1 are left as-is.
+
+    Args:
+    ----
+        data: The RGBA pixel data, row by row.
+        width: Width of the image in pixels.
+        height: Height of the image in pixels.
+        mipmap_filter: The resampling filter.
+
+    Returns:
+    -------
+        The RGBA pixel data of the downsampled image.
+    """
+    if np is not None:
+        image = np.frombuffer(data, dtype=np.uint8, count=width * height * 4).reshape(height, width, 4)
+        return _downsample_numpy(image, mipmap_filter).tobytes()
+    return bytes(_downsample_python(data, width, height, mipmap_filter))
+
+
+def generate_mipmaps(
+    data: bytes,
+    width: int,
+    height: int,
+    mipmap_filter: MipmapFilter = MipmapFilter.Box,
+    count: int | None = None,
+) -> list[bytes]:
+    """Builds a mipmap chain from an RGBA image. Each level is filtered from the previous one.
+
+    Args:
+    ----
+        data: The RGBA pixel data of the largest mipmap.
+        width: Width of the largest mipmap.
+        height: Height of the largest mipmap.
+        mipmap_filter: The resampling filter.
+        count: The number of mipmaps to build, including the largest one. Defaults to a full chain down to 1x1.
+
+    Returns:
+    -------
+        The RGBA pixel data of each mipmap, largest first.
+    """
+    sizes = mipmap_sizes(width, height)[:count]
+    if np is not None:
+        image = np.frombuffer(data, dtype=np.uint8, count=width * height * 4).reshape(height, width, 4)
+        images = [image]
+        for _ in sizes[1:]:
+            images.append(_downsample_numpy(images[-1], mipmap_filter))
+        return [image.tobytes() for image in images]
+
+    mipmaps = [bytes(data)]
+    for mm_width, mm_height in sizes[:-1]:
+        mipmaps.append(bytes(_downsample_python(mipmaps[-1], mm_width, mm_height, mipmap_filter)))
+    return mipmaps
+
+
+def _lanczos_kernel() -> list[tuple[int, float]]:
+    """Returns (source offset, weight) pairs that downsample by two around output pixel 2*i.
+
+    The output pixel center lies between source pixels 2*i and 2*i+1, and the kernel is stretched by two to avoid aliasing.
+    """
+    taps = []
+    for offset in range(1 - 2 * _LANCZOS_LOBES, 2 * _LANCZOS_LOBES + 1):
+        distance = (offset - 0.5) / 2
+        weight = _sinc(distance) * _sinc(distance / _LANCZOS_LOBES)
+        taps.append((offset, weight))
+    total = sum(weight for _, weight in taps)
+    return [(offset, weight / total) for offset, weight in taps]
+
+
+def _sinc(
+    x: float,
+) -> float:
+    if x == 0:
+        return 1.0
+    return math.sin(math.pi * x) / (math.pi * x)
+
+
+_LANCZOS_KERNEL = _lanczos_kernel()
+
+
+# region Pure-Python
+def _downsample_python(
+    data: bytes,
+    width: int,
+    height: int,
+    mipmap_filter: MipmapFilter,
+) -> bytearray:
+    if mipmap_filter == MipmapFilter.Lanczos:
+        rows = [data[y * width * 4 : (y + 1) * width * 4] for y in range(height)]
+        if width > 1:
+            rows = [_lanczos_python(row, width, 4) for row in rows]
+            width >>= 1
+        if height > 1:
+            # filter the columns by treating each row as one very wide pixel
+            return _lanczos_python(b"".join(rows), height, width * 4)
+        return bytearray(b"".join(rows))
+
+    new_width, new_height = max(1, width >> 1), max(1, height >> 1)
+    x_step = 4 if width > 1 else 0
+    y_step = width * 4 if height > 1 else 0
+    downsampled = bytearray(new_width * new_height * 4)
+    index = 0
+    for y in range(new_height):
+        for x in range(new_width):
+            source = (2 * y * width + 2 * x) * 4
+            for channel in range(4):
+                top = source + channel
+                downsampled[index] = (data[top] + data[top + x_step] + data[top + y_step] + data[top + x_step + y_step] + 2) >> 2
+                index += 1
+    return downsampled
+
+
+def _lanczos_python(
+    data: bytes,
+    length: int,
+    stride: int,
+) -> bytearray:
+    """Downsamples a line of `length` elements, each `stride` bytes wide, by two."""
+    new_length = length >> 1
+    filtered = bytearray(new_length * stride)
+    index = 0
+    for i in range(new_length):
+        taps = [(min(max(2 * i + offset, 0), length - 1) * stride, weight) for offset, weight in _LANCZOS_KERNEL]
+        for byte in range(stride):
+            value = 0.0
+            for source, weight in taps:
+                value += data[source + byte] * weight
+            filtered[index] = min(255, max(0, math.floor(value + 0.5)))
+            index += 1
+    return filtered
+
+
+# endregion
+
+
+# region NumPy
+def _downsample_numpy(
+    image,
+    mipmap_filter: MipmapFilter,
+):
+    height, width = image.shape[:2]
+    if mipmap_filter == MipmapFilter.Lanczos:
+        if width > 1:
+            image = _lanczos_numpy(image, axis=1)
+        if height > 1:
+            image = _lanczos_numpy(image, axis=0)
+        return image
+
+    total = image.astype(np.uint16)
+    if width > 1:
+        total = total[:, 0 : width & ~1 : 2] + total[:, 1 : width & ~1 : 2]
+    else:
+        total = total * 2
+    if height > 1:
+        total = total[0 : height & ~1 : 2] + total[1 : height & ~1 : 2]
+    else:
+        total = total * 2
+    return ((total + 2) >> 2).astype(np.uint8)
+
+
+def _lanczos_numpy(
+    image,
+    axis: int,
+):
+    length = image.shape[axis]
+    centers = np.arange(length >> 1) * 2
+    value = np.zeros(image.shape[:axis] + (length >> 1,) + image.shape[axis + 1 :], dtype=np.float64)
+    for offset, weight in _LANCZOS_KERNEL:
+        value += np.take(image, np.clip(centers + offset, 0, length - 1), axis=axis) * weight
+    return np.clip(np.floor(value + 0.5), 0, 255).astype(np.uint8)
+
+
+# endregion
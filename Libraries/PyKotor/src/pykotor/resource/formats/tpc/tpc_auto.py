@@ -53,8 +53,8 @@ def detect_tpc(
         if isinstance(source, (str, CaseAwarePath)):
             with BinaryReader.from_file(source, offset) as reader:
                 file_format = do_check(reader.read_bytes(100))
-        elif isinstance(source, (bytes, bytearray)):
-            file_format = do_check(source[:100])
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            file_format = do_check(bytes(source[:100]))
         elif isinstance(source, BinaryReader):
             file_format = do_check(source.read_bytes(100))
             source.skip(-100)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import struct
+
 from pykotor.resource.formats.twoda.twoda_data import TwoDA
 from pykotor.resource.type import SOURCE_TYPES, TARGET_TYPES, ResourceReader, ResourceWriter, autoclose
 
@@ -33,9 +35,9 @@ class TwoDABinaryReader(ResourceReader):
         ----------------
             - Read file header and validate type and version
             - Read column headers
-            - Read row count and populate rows
-            - Read cell offsets
-            - Seek to cell data and populate cells
+            - Read the rest of the file in one go
+            - Split out the row labels and unpack the cell offsets in bulk
+            - Decode each unique cell value once and fill the columns directly
         """
         self._twoda = TwoDA()
 
@@ -63,25 +65,31 @@ class TwoDABinaryReader(ResourceReader):
         row_count = self._reader.read_uint32()
         column_count = self._twoda.get_width()
         cell_count = row_count * column_count
-        for _ in range(row_count):
-            row_header = self._reader.read_terminated_string("\t")
-            row_label = row_header
-            self._twoda.add_row(row_label)
-
-        cell_offsets: list[int] = [0] * cell_count
-        for i in range(cell_count):
-            cell_offsets[i] = self._reader.read_uint16()
-
-        self._reader.read_uint16()
-        cell_data_offset = self._reader.position()
-
-        for i in range(cell_count):
-            column_id = i % column_count
-            row_id = i // column_count
-            column_header = columns[column_id]
-            self._reader.seek(cell_data_offset + cell_offsets[i])
-            cell_value = self._reader.read_terminated_string("\0")
-            self._twoda.set_cell(row_id, column_header, cell_value)
+        data: bytes = self._reader.read_bytes(self._reader.remaining())
+
+        try:
+            position = 0
+            row_labels: list[str] = []
+            for _ in range(row_count):
+                end = data.index(b"\t", position)
+                row_labels.append(data[position:end].decode("ascii", errors="ignore"))
+                position = end + 1
+
+            cell_offsets: tuple[int, ...] = struct.unpack_from(f"<{cell_count}H", data, position)
+            cell_data_offset = position + cell_count * 2 + 2  # skip the cell data size
+
+            cell_values: dict[int, str] = {}
+            for cell_offset in set(cell_offsets):
+                start = cell_data_offset + cell_offset
+                cell_values[cell_offset] = data[start : data.index(b"\0", start)].decode("ascii", errors="ignore")
+        except (ValueError, struct.error) as e:
+            msg = "The 2DA file is truncated or corrupted."
+            raise ValueError(msg) from e
+
+        self._twoda.load_columns(
+            row_labels,
+            {header: [cell_values[cell_offset] for cell_offset in cell_offsets[i::column_count]] for i, header in enumerate(columns)},
+        )
 
         return self._twoda
 
@@ -110,13 +118,18 @@ class TwoDABinaryWriter(ResourceWriter):
         -------
             None: {Nothing is returned}
 
+        Raises:
+        ------
+            ValueError: The unique cell values take up more than 65535 bytes, which cannot be addressed by the
+                16-bit cell offsets of the format.
+
         Processing Logic:
         ----------------
             - Get the headers and row labels from the 2DA
             - Write the header string and version
             - Write the headers and row labels
-            - Loop through each cell and writes the value offsets and data
-            - Close the writer if auto_close is True
+            - Pool the unique cell values, mapping each one to its offset in the cell data
+            - Write the cell offsets and the cell data in bulk
         """
         headers = self._twoda.get_headers()
 
@@ -132,25 +145,25 @@ class TwoDABinaryWriter(ResourceWriter):
         for row_label in self._twoda.get_labels():
             self._writer.write_string(str(row_label) + "\t")
 
-        values: list[str] = []
-        value_offsets: list[int] = []
+        values: list[bytes] = []
+        value_offsets: dict[str, int] = {}
         cell_offsets: list[int] = []
         data_size = 0
 
-        for row in self._twoda:
-            for header in self._twoda.get_headers():
-                value = row.get_string(header) + "\0"
-                if value not in values:
-                    value_offset = len(values[-1]) + value_offsets[-1] if value_offsets else 0
-                    values.append(value)
-                    value_offsets.append(value_offset)
-                    data_size += len(value)
-                cell_offset = value_offsets[values.index(value)]
+        for row in zip(*[self._twoda.get_column(header) for header in headers]):
+            for value in row:
+                cell_offset = value_offsets.get(value)
+                if cell_offset is None:
+                    encoded = value.encode("windows-1252") + b"\0"
+                    cell_offset = value_offsets[value] = data_size
+                    values.append(encoded)
+                    data_size += len(encoded)
                 cell_offsets.append(cell_offset)
 
-        for cell_offset in cell_offsets:
-            self._writer.write_uint16(cell_offset)
-        self._writer.write_uint16(data_size)
+        if data_size > 0xFFFF:
+            msg = f"The cell data of the 2DA is {data_size} bytes, exceeding the 65535 bytes that can be addressed by the file format."
+            raise ValueError(msg)
 
-        for value in values:
-            self._writer.write_string(value)
+        self._writer.write_bytes(struct.pack(f"<{len(cell_offsets)}H", *cell_offsets))
+        self._writer.write_uint16(data_size)
+        self._writer.write_bytes(b"".join(values))
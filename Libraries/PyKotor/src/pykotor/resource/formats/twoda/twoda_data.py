@@ -12,7 +12,11 @@ if TYPE_CHECKING:
 
 
 class TwoDA:
-    """Represents a 2DA file."""
+    """Represents a 2DA file.
+
+    Cells are stored column by column, one list of strings per header, and rows are looked up by label through a hash
+    map that is built on first use.
+    """
 
     BINARY_TYPE = ResourceType.TwoDA
 
@@ -20,16 +24,17 @@ class TwoDA:
         self,
         headers: list[str] | None = None,
     ):
-        self._rows: list[dict[str, str]] = []
         self._headers: list[str] = [] if headers is None else headers  # for columns
+        self._columns: dict[str, list[str]] = {header: [] for header in self._headers}
         self._labels: list[str] = []  # for rows
+        self._label_indices: dict[str, int] | None = None  # first row index of each label, built on demand
 
     def __iter__(
         self,
     ):
         """Iterates through each row yielding a new linked TwoDARow instance."""
-        for i, row in enumerate(self._rows):
-            yield TwoDARow(self.get_label(i), row)
+        for i, label in enumerate(self._labels):
+            yield TwoDARow(label, self._columns, i)
 
     def get_headers(
         self,
@@ -60,11 +65,7 @@ class TwoDA:
         -------
             A list of cells.
         """
-        if header not in self._headers:
-            msg = f"The header '{header}' does not exist."
-            raise KeyError(msg)
-
-        return [self._rows[i][header] for i in range(self.get_height())]
+        return list(self._column(header))
 
     def add_column(
         self,
@@ -85,8 +86,7 @@ class TwoDA:
             raise KeyError(msg)
 
         self._headers.append(header)
-        for row in self._rows:
-            row[header] = ""
+        self._columns[header] = [""] * self.get_height()
 
     def remove_column(
         self,
@@ -101,8 +101,7 @@ class TwoDA:
             header: The column header.
         """
         if header in self._headers:
-            for row in self._rows:
-                row.pop(header)
+            self._columns.pop(header)
 
         self._headers.remove(header)
 
@@ -146,6 +145,7 @@ class TwoDA:
             value: The new row label.
         """
         self._labels[row_index] = value
+        self._label_indices = None
 
     def get_row(
         self,
@@ -165,7 +165,8 @@ class TwoDA:
         -------
             A new TwoDARow instance.
         """
-        return TwoDARow(self.get_label(row_index), self._rows[row_index])
+        row_index = range(self.get_height())[row_index]
+        return TwoDARow(self._labels[row_index], self._columns, row_index)
 
     def find_row(
         self,
@@ -183,12 +184,39 @@ class TwoDA:
 
         Processing Logic:
         ----------------
-            - Iterate through each row in the 2D array
-            - Check if the row's label matches the given label
-            - If a match is found, return the row
-            - If no match is found after iterating all rows, return None.
+            - Look up the index of the first row with the label in the label map
+            - Return the row at that index, or None if the label is not in the map.
+        """
+        if self._label_indices is None:
+            self._label_indices = {}
+            for i, label in enumerate(self._labels):
+                self._label_indices.setdefault(label, i)
+        row_index: int | None = self._label_indices.get(row_label)
+        return None if row_index is None else TwoDARow(row_label, self._columns, row_index)
+
+    def filter_rows(
+        self,
+        header: str,
+        value: Any,
+    ) -> list[TwoDARow]:
+        """Returns every row whose cell under the specified column equals the value, in table order.
+
+        Args:
+        ----
+            header: The column header.
+            value: The value to match, converted to a string.
+
+        Raises:
+        ------
+            KeyError: If the specified column header does not exist.
+
+        Returns:
+        -------
+            A list of new TwoDARow instances.
         """
-        return next((row for row in self if row.label() == row_label), None)
+        value = str(value)
+        labels: list[str] = self._labels
+        return [TwoDARow(labels[i], self._columns, i) for i, cell in enumerate(self._column(header)) if cell == value]
 
     def row_index(
         self,
@@ -206,11 +234,14 @@ class TwoDA:
 
         Processing Logic:
         ----------------
-            - Iterate through the 2D array and enumerate the rows.
+            - If the row was taken from this table and still points at a row with its label, return its index.
+            - Otherwise iterate through the 2D array and enumerate the rows.
             - Check if the current row equals the searching row.
             - If a match is found, return the index i.
             - If no match is found after full iteration, return None.
         """
+        if row._columns is self._columns and row._index < self.get_height() and self._labels[row._index] == row.label():
+            return row._index
         return next((i for i, searching in enumerate(self) if searching == row), None)
 
     def add_row(
@@ -233,19 +264,47 @@ class TwoDA:
         -------
             The id of the new row.
         """
-        self._rows.append({})
-        self._labels.append(str(len(self._rows)) if row_label is None else row_label)
+        row_index: int = self.get_height()
+        self._add_label(str(row_index + 1) if row_label is None else row_label)
 
         if cells is None:
             cells = {}
 
-        for header in cells:
-            cells[header] = str(cells[header])
+        for header in self._headers:
+            self._columns[header].append(str(cells[header]) if header in cells else "")
+
+        return row_index
+
+    def load_columns(
+        self,
+        labels: list[str],
+        columns: dict[str, list[str]],
+    ) -> None:
+        """Appends rows to the end of the table in bulk, taking the cells column by column.
+
+        Headers in the columns parameter that do not exist in the table are ignored and columns of the table that are
+        not specified are filled with blank cells. The cells must already be strings.
+
+        Args:
+        ----
+            labels: The row labels of the new rows.
+            columns: A dictionary mapping a header to the cells of the new rows under that column.
 
+        Raises:
+        ------
+            ValueError: If a column does not have exactly one cell for each label.
+        """
+        row_count: int = len(labels)
         for header in self._headers:
-            self._rows[-1][header] = cells.get(header, "")
+            if header in columns and len(columns[header]) != row_count:
+                msg = f"The column '{header}' has {len(columns[header])} cells but {row_count} rows are being added."
+                raise ValueError(msg)
 
-        return len(self._rows) - 1
+        self._labels.extend(labels)
+        self._label_indices = None
+        for header in self._headers:
+            cells: list[str] | None = columns.get(header)
+            self._columns[header].extend([""] * row_count if cells is None else cells)
 
     def copy_row(
         self,
@@ -264,21 +323,16 @@ class TwoDA:
         -------
             The id of the new row.
         """
-        source_index = self.row_index(source_row)
-
-        self._rows.append({})
-        self._labels.append(str(len(self._rows)) if row_label is None else row_label)
+        row_index: int = self.get_height()
+        self._add_label(str(row_index + 1) if row_label is None else row_label)
 
         if override_cells is None:
             override_cells = {}
 
-        for header in override_cells:
-            override_cells[header] = str(override_cells[header])
-
         for header in self._headers:
-            self._rows[-1][header] = override_cells[header] if header in override_cells else self.get_cell(source_index, header)
+            self._columns[header].append(str(override_cells[header]) if header in override_cells else source_row.get_string(header))
 
-        return len(self._rows) - 1
+        return row_index
 
     def get_cell(
         self,
@@ -301,7 +355,7 @@ class TwoDA:
         -------
             The cell value.
         """
-        return self._rows[row_index][column]
+        return self._columns[column][row_index]
 
     def set_cell(
         self,
@@ -323,7 +377,7 @@ class TwoDA:
             IndexError: If the specified row does not exist.
         """
         value = "" if value is None else value
-        self._rows[row_index][column] = str(value)
+        self._columns[column][row_index] = str(value)
 
     def get_height(
         self,
@@ -334,7 +388,7 @@ class TwoDA:
         -------
             The number of rows.
         """
-        return len(self._rows)
+        return len(self._labels)
 
     def get_width(
         self,
@@ -366,11 +420,14 @@ class TwoDA:
         if self.get_height() < 0:
             msg = "The height of the table cannot be negative."
             raise ValueError(msg)
-        current_height = len(self._rows)
+        current_height = self.get_height()
 
         if row_count < current_height:
-            # trim the _rows list
-            self._rows = self._rows[:row_count]
+            # trim the labels and every column
+            del self._labels[row_count:]
+            for column in self._columns.values():
+                del column[row_count:]
+            self._label_indices = None
         else:
             # insert the new rows with each cell filled in blank
             for _ in range(row_count - current_height):
@@ -387,7 +444,7 @@ class TwoDA:
             Highest numerical value underneath the column.
         """
         max_found = -1
-        for cell in self.get_column(header):
+        for cell in set(self._column(header)):
             with suppress(ValueError):
                 max_found = max(int(cell), max_found)
 
@@ -414,12 +471,30 @@ class TwoDA:
             - Return max_found + 1 to get the next integer label.
         """
         max_found = -1
-        for label in self.get_labels():
+        for label in set(self._labels):
             with suppress(ValueError):
                 max_found = max(int(label), max_found)
 
         return max_found + 1
 
+    def _column(
+        self,
+        header: str,
+    ) -> list[str]:
+        column: list[str] | None = self._columns.get(header)
+        if column is None:
+            msg = f"The header '{header}' does not exist."
+            raise KeyError(msg)
+        return column
+
+    def _add_label(
+        self,
+        row_label: str,
+    ) -> None:
+        if self._label_indices is not None:
+            self._label_indices.setdefault(row_label, len(self._labels))
+        self._labels.append(row_label)
+
     def compare(self, other: TwoDA, log_func: Callable = print) -> bool:
         """Compares two TwoDA objects.
 
@@ -488,24 +563,42 @@ class TwoDA:
 
 
 class TwoDARow:
+    """A view of a single row of a TwoDA; reads and writes go straight to the columns of the table."""
+
     def __init__(
         self,
         row_label: str,
-        row_data: dict[str, str],
+        columns: dict[str, list[str]],
+        row_index: int,
     ):
         self._row_label: str = row_label
-        self._data: dict[str, str] = row_data
+        self._columns: dict[str, list[str]] = columns
+        self._index: int = row_index
 
     def __repr__(
         self,
     ):
-        return f"{self.__class__.__name__}(row_label={self._row_label}, row_data={self._data})"
+        return f"{self.__class__.__name__}(row_label={self._row_label}, row_data={self._data()})"
 
     def __eq__(self, other: TwoDARow | object):
         if isinstance(other, TwoDARow):
-            return self._row_label == other._row_label and self._data == other._data
+            return self._row_label == other._row_label and self._data() == other._data()
         return NotImplemented
 
+    def _data(
+        self,
+    ) -> dict[str, str]:
+        return {header: column[self._index] for header, column in self._columns.items()}
+
+    def _cell(
+        self,
+        header: str,
+    ) -> str:
+        if header not in self._columns:
+            msg = f"The header '{header}' does not exist."
+            raise KeyError(msg)
+        return self._columns[header][self._index]
+
     def label(
         self,
     ) -> str:
@@ -554,10 +647,7 @@ class TwoDARow:
         -------
             The cell value.
         """
-        if header not in self._data:
-            msg = f"The header '{header}' does not exist."
-            raise KeyError(msg)
-        return self._data[header]
+        return self._cell(header)
 
     def get_integer(
         self,
@@ -579,13 +669,10 @@ class TwoDARow:
         -------
             The cell value as an integer or a default value.
         """
-        if header not in self._data:
-            msg = f"The header '{header}' does not exist."
-            raise KeyError(msg)
+        cell = self._cell(header)
 
         value = default
         with suppress(ValueError):  # FIXME: this should not be suppressed
-            cell = self._data[header]
             return int(cell, 16) if cell.startswith("0x") else int(cell)
         return value
 
@@ -609,12 +696,9 @@ class TwoDARow:
         -------
             The cell value as a float or default value.
         """
-        if header not in self._data:
-            msg = f"The header '{header}' does not exist."
-            raise KeyError(msg)
+        cell = self._cell(header)
 
         with suppress(ValueError):  # FIXME: this should not be suppressed
-            cell = self._data[header]
             return float(cell)
 
     def get_enum(
@@ -639,13 +723,11 @@ class TwoDARow:
         -------
             The cell value as a enum or default value.
         """
-        if header not in self._data:
-            msg = f"The header '{header}' does not exist."
-            raise KeyError(msg)
+        cell = self._cell(header)
 
         value = default
-        if enum_type(self._data[header]) != "":
-            value = enum_type(self._data[header])
+        if enum_type(cell) != "":
+            value = enum_type(cell)
         return value
 
     def set_string(
@@ -721,8 +803,8 @@ class TwoDARow:
         self._set_value(header, value)
 
     def _set_value(self, header: str, value: object):
-        if header not in self._data:
+        if header not in self._columns:
             msg = f"The header '{header}' does not exist."
             raise KeyError(msg)
         value_str = "" if value is None else str(value)
-        self._data[header] = value_str
+        self._columns[header][self._index] = value_str
@@ -9,7 +9,7 @@ from xml.etree.ElementTree import ParseError
 
 from pykotor.common.stream import BinaryReader, BinaryWriter
 
-SOURCE_TYPES = Union[os.PathLike, str, bytes, bytearray, BinaryReader]
+SOURCE_TYPES = Union[os.PathLike, str, bytes, bytearray, memoryview, BinaryReader]
 TARGET_TYPES = Union[os.PathLike, str, bytearray, BinaryWriter]
 
 
@@ -3,7 +3,8 @@ from __future__ import annotations
 import os
 import pathlib
 import platform
-from typing import TYPE_CHECKING, Any, Callable, Generator
+import time
+from typing import TYPE_CHECKING, Any, Callable, Generator, NamedTuple
 
 from pykotor.tools.registry import winreg_key
 from utility.misc import is_instance_or_subinstance
@@ -15,6 +16,83 @@ from utility.registry import resolve_reg_key_to_path
 if TYPE_CHECKING:
     from pykotor.common.misc import Game
 
+
+class _DirectoryListing(NamedTuple):
+    mtime: int
+    racy: bool
+    entries: dict[str, list[tuple[str, bool]]]  # lowercase name -> [(name, is_dir)]
+
+
+class DirectoryListingCache:
+    """Caches directory entries by lowercase name so resolving the case of a path is a dict lookup rather than a scan.
+
+    A listing is reused for as long as the directory's modification time is unchanged, which catches entries being
+    added, removed or renamed by any process. Listings scanned within RACY_WINDOW_NS of the directory's last change are
+    rescanned on the next lookup, since a filesystem with a coarse mtime could otherwise hide a change made in that same
+    tick. Code that creates, renames or deletes files should still call invalidate() so the next lookup sees the change
+    even on such filesystems.
+    """
+
+    RACY_WINDOW_NS = 2_000_000_000
+
+    def __init__(self):
+        self._listings: dict[str, _DirectoryListing] = {}
+
+    def entries(
+        self,
+        directory: str,
+    ) -> dict[str, list[tuple[str, bool]]] | None:
+        """Returns the entries of a directory keyed by lowercase name, or None if it is not an accessible directory."""
+        try:
+            mtime: int = os.stat(directory).st_mtime_ns
+        except OSError:
+            self._listings.pop(directory, None)
+            return None
+
+        listing: _DirectoryListing | None = self._listings.get(directory)
+        if listing is not None and listing.mtime == mtime and not listing.racy:
+            return listing.entries
+
+        entries: dict[str, list[tuple[str, bool]]] = {}
+        try:
+            with os.scandir(directory) as scanner:
+                for entry in scanner:
+                    try:
+                        is_dir: bool = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    entries.setdefault(entry.name.lower(), []).append((entry.name, is_dir))
+        except OSError:
+            self._listings.pop(directory, None)
+            return None
+
+        racy: bool = time.time_ns() - mtime < self.RACY_WINDOW_NS
+        self._listings[directory] = _DirectoryListing(mtime, racy, entries)
+        return entries
+
+    def invalidate(
+        self,
+        path: os.PathLike | str | None = None,
+    ) -> None:
+        """Drops the cached listings of a path and its parent folder, or every listing if no path is given.
+
+        Args:
+        ----
+            path: A file or folder that was created, renamed or deleted. Matched case-insensitively.
+        """
+        if path is None:
+            self._listings.clear()
+            return
+        path_obj = pathlib.Path(path)
+        stale: set[str] = {str(path_obj).lower(), str(path_obj.parent).lower()}
+        # list() copies the keys in one step, so loaders inserting listings from other threads cannot break the scan
+        for directory in [directory for directory in list(self._listings) if directory.lower() in stale]:
+            self._listings.pop(directory, None)
+
+
+DIRECTORY_LISTINGS = DirectoryListingCache()
+
+
 def simple_wrapper(fn_name, wrapped_class_type) -> Callable[..., Any]:
     """Wraps a function to handle case-sensitive pathlib.PurePath arguments.
 
@@ -179,39 +257,44 @@ class CaseAwarePath(InternalPath):  # type: ignore[misc]
         ----------------
             - Convert the path to a pathlib Path object
             - Iterate through each path part starting from index 1
-            - Check if the current path part and the path up to that part exist
-            - If not, find the closest matching file/folder name in the existing path
+            - Keep the part if the path up to that part exists as-is
+            - Otherwise look up its lowercase name in the cached listing of the parent folder and use the closest match
+            - Stop at the first part that has no case-insensitive match
             - Return a CaseAwarePath instance with case sensitivity resolved.
         """
         pathlib_path: pathlib.Path = pathlib.Path(path)
         parts = list(pathlib_path.parts)
 
         for i in range(1, len(parts)):  # ignore the root (/, C:\\, etc)
-            base_path: InternalPath = InternalPath(*parts[:i])
-            next_path: InternalPath = InternalPath(*parts[: i + 1])
+            last_part: bool = i == len(parts) - 1
+            next_path: str = os.path.join(*parts[: i + 1])
+            if os.path.isdir(next_path) or (last_part and os.path.exists(next_path)):
+                continue
 
             # Find the first non-existent case-sensitive file/folder in hierarchy
-            if not next_path.safe_isdir() and base_path.safe_isdir():
-
-                # if multiple are found, use the one that most closely matches our case
-                # A closest match is defined in this context as the file/folder's name which has the most case-sensitive positional character matches
-                # If two closest matches are identical (e.g. we're looking for TeST and we find TeSt and TesT), it's random.
-                last_part: bool = i == len(parts) - 1
-                parts[i] = CaseAwarePath.find_closest_match(
-                    parts[i],
-                    (
-                        item
-                        for item in base_path.safe_iterdir()
-                        if last_part or item.safe_isdir()
-                    ),
-                )
-
-            elif not next_path.safe_exists():
+            entries = DIRECTORY_LISTINGS.entries(os.path.join(*parts[:i]))
+            if entries is None:
                 break
 
+            # if multiple are found, use the one that most closely matches our case
+            # A closest match is defined in this context as the file/folder's name which has the most case-sensitive positional character matches
+            # If two closest matches are identical (e.g. we're looking for TeST and we find TeSt and TesT), the first one listed is used.
+            candidates = [name for name, is_dir in entries.get(parts[i].lower(), ()) if last_part or is_dir]
+            if not candidates:
+                break
+            if parts[i] not in candidates:
+                parts[i] = max(candidates, key=lambda name, target=parts[i]: CaseAwarePath.get_matching_characters_count(name, target))
+
         # return a CaseAwarePath instance
         return CaseAwarePath._create_instance(*parts)  # noqa: SLF001
 
+    @staticmethod
+    def invalidate_cache(
+        path: os.PathLike | str | None = None,
+    ) -> None:
+        """Tells case resolution that a file or folder was created, renamed or deleted. See DirectoryListingCache.invalidate()."""
+        DIRECTORY_LISTINGS.invalidate(path)
+
     @classmethod
     def find_closest_match(cls, target: str, candidates: Generator[InternalPath, None, None]) -> str:
         max_matching_chars: int = -1
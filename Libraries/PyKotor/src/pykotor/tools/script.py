@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from pykotor.common.misc import Game
+from pykotor.common.scriptlib import KOTOR_LIBRARY, TSL_LIBRARY
+from pykotor.resource.formats.ncs import compile_nss, write_ncs
+from pykotor.resource.formats.ncs.compiler.parser import INCLUDE_CACHE
+from pykotor.tools.path import CaseAwarePath
+from utility.error_handling import universal_simplify_exception
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+MANIFEST_FILENAME = "nss_manifest.json"
+
+_INCLUDE_PATTERN = re.compile(rb'#include\s+"([^"]+)"')
+_ENTRY_POINT_PATTERN = re.compile(rb"\b(?:void\s+main|int\s+StartingConditional)\s*\(")
+
+
+class ScriptCompileResult(NamedTuple):
+    source: str
+    target: str | None
+    seconds: float  # spent compiling, 0.0 if the script was up to date
+    up_to_date: bool
+    include_hits: int  # of the include cache of the worker
+    include_misses: int
+    error: str | None
+
+
+class ScriptBatchStats:
+    """Totals of a batch script compilation, with how often compiled scripts and parsed includes were reused."""
+
+    def __init__(
+        self,
+    ):
+        self.scripts: int = 0
+        self.compiled: int = 0
+        self.up_to_date: int = 0
+        self.failed: list[ScriptCompileResult] = []
+        self.compile_time: float = 0.0
+        self.script_times: dict[str, float] = {}
+        self.include_hits: int = 0
+        self.include_misses: int = 0
+        self.elapsed: float = 0.0
+
+    def add(
+        self,
+        result: ScriptCompileResult,
+    ):
+        self.scripts += 1
+        self.compile_time += result.seconds
+        self.script_times[result.source] = result.seconds
+        self.include_hits += result.include_hits
+        self.include_misses += result.include_misses
+        if result.error is not None:
+            self.failed.append(result)
+        elif result.up_to_date:
+            self.up_to_date += 1
+        else:
+            self.compiled += 1
+
+    def hit_rate(
+        self,
+    ) -> float:
+        """Returns the fraction of scripts that were skipped because they and their includes were unchanged."""
+        return self.up_to_date / self.scripts if self.scripts else 0.0
+
+    def include_hit_rate(
+        self,
+    ) -> float:
+        """Returns the fraction of include lookups served from the parsed include cache of the workers."""
+        lookups = self.include_hits + self.include_misses
+        return self.include_hits / lookups if lookups else 0.0
+
+    def report(
+        self,
+        slowest: int = 5,
+    ) -> str:
+        lines = [
+            f"Compiled {self.compiled} of {self.scripts} scripts in {self.elapsed:.2f}s, {len(self.failed)} failed",
+            f"  up to date: {self.up_to_date} ({self.hit_rate():.0%})",
+            f"  include cache: {self.include_hits} hits, {self.include_misses} misses ({self.include_hit_rate():.0%})",
+            f"  compile time: {self.compile_time:.2f}s",
+        ]
+        times = sorted(self.script_times.items(), key=lambda item: item[1], reverse=True)[:slowest]
+        lines.extend(f"  {os.path.basename(source)}: {seconds:.3f}s" for source, seconds in times if seconds)
+        return "\n".join(lines)
+
+
+def compile_script(
+    source: os.PathLike | str,
+    target: os.PathLike | str,
+    game: Game,
+    library_lookup: list[str],
+    optimization_level: int = 0,
+) -> ScriptCompileResult:
+    """Compiles a single NSS script with the built-in compiler, recording the time spent and the include cache use.
+
+    Errors are returned in the result rather than raised so one bad script does not stop a batch.
+
+    Args:
+    ----
+        source: Path of the NSS file to read.
+        target: Path of the NCS file to write.
+        game: The game to compile the script for.
+        library_lookup: Folders searched for included scripts before the built-in library.
+        optimization_level: See compile_nss().
+
+    Returns:
+    -------
+        A ScriptCompileResult describing the compilation.
+    """
+    hits, misses = INCLUDE_CACHE.hits, INCLUDE_CACHE.misses
+    start = time.perf_counter()
+    try:
+        with open(source, "rb") as file:
+            ncs = compile_nss(file.read().decode(errors="ignore"), game, library_lookup=library_lookup, optimization_level=optimization_level)
+        write_ncs(ncs, target)
+        error = None
+    except Exception as e:  # noqa: BLE001
+        error = str(universal_simplify_exception(e))
+    seconds = time.perf_counter() - start
+    hits, misses = INCLUDE_CACHE.hits - hits, INCLUDE_CACHE.misses - misses
+    return ScriptCompileResult(str(source), None if error else str(target), seconds, False, hits, misses, error)
+
+
+def compile_scripts(
+    sources: os.PathLike | str | Iterable[os.PathLike | str],
+    output_folder: os.PathLike | str,
+    game: Game,
+    library_lookup: list[str] | None = None,
+    optimization_level: int = 0,
+    max_workers: int | None = None,
+    manifest_path: os.PathLike | str | None = None,
+    callback: Callable[[ScriptCompileResult], None] | None = None,
+) -> ScriptBatchStats:
+    """Compiles a batch of NSS scripts across a pool of processes, skipping scripts that have not changed.
+
+    The include graph of every script is read before compiling, and the script is hashed together with all of its
+    includes, direct or nested. Scripts whose hash and output file match the manifest from the previous build are
+    skipped. Scripts without a main() or StartingConditional() are treated as include files and not compiled. The
+    manifest is rewritten when the batch ends, also when it is interrupted, and only lists the scripts of this batch.
+
+    Args:
+    ----
+        sources: A folder of NSS files or the paths of the NSS files to compile.
+        output_folder: The folder to write the NCS files to, using the source filename with the new extension.
+        game: The game to compile the scripts for.
+        library_lookup: Folders searched for included scripts. The folder of each script is always searched first.
+        optimization_level: See compile_nss(). Changing it rebuilds every script.
+        max_workers: The number of processes. Defaults to the number of CPUs. With 1, the scripts are compiled in this
+                     process without starting a pool.
+        manifest_path: Where the hashes of the last build are kept. Defaults to a file in the output folder.
+        callback: Called with the result of each script as it completes.
+
+    Returns:
+    -------
+        The totals, per-script timings and cache hit rates of the batch.
+    """
+    if isinstance(sources, (os.PathLike, str)):
+        folder = str(sources)
+        sources = [os.path.join(folder, filename) for filename in sorted(os.listdir(folder)) if filename.lower().endswith(".nss")]
+    os.makedirs(output_folder, exist_ok=True)
+    manifest_path = os.path.join(output_folder, MANIFEST_FILENAME) if manifest_path is None else manifest_path
+    library = KOTOR_LIBRARY if game == Game.K1 else TSL_LIBRARY
+    stats = ScriptBatchStats()
+    start = time.perf_counter()
+
+    previous: dict[str, str] = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as file:
+            previous = json.load(file)
+
+    # only scripts of this batch that are built and up to date are kept, so sources that were removed drop out
+    manifest: dict[str, str] = {}
+
+    def finish(
+        result: ScriptCompileResult,
+        digest: str,
+    ):
+        stats.add(result)
+        if result.error is None:
+            manifest[result.source] = digest
+        if callback is not None:
+            callback(result)
+
+    try:
+        graph = _IncludeGraph(library)
+        pending: list[tuple[str, str, str, list[str]]] = []
+        for source in sources:
+            source = os.path.abspath(source)  # noqa: PLW2901
+            lookup = [os.path.dirname(source), *(library_lookup or [])]
+            data = graph.source(source)
+            if data is not None and not _ENTRY_POINT_PATTERN.search(data):
+                continue
+            target = os.path.join(output_folder, f"{os.path.splitext(os.path.basename(source))[0]}.ncs")
+            digest = graph.digest(source, lookup, game, optimization_level)
+            if previous.get(source) == digest and os.path.exists(target):
+                finish(ScriptCompileResult(source, target, 0.0, True, 0, 0, None), digest)
+            else:
+                pending.append((source, target, digest, lookup))
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        if max_workers == 1:
+            for source, target, digest, lookup in pending:
+                finish(compile_script(source, target, game, lookup, optimization_level), digest)
+        elif pending:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures: dict[Future[ScriptCompileResult], str] = {
+                    executor.submit(compile_script, source, target, game, lookup, optimization_level): digest for source, target, digest, lookup in pending
+                }
+                for future in as_completed(futures):
+                    finish(future.result(), futures[future])
+    finally:
+        # written even if the batch is interrupted, so the scripts compiled so far are not rebuilt next time
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        os.replace(temp_path, manifest_path)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+class _IncludeGraph:
+    """Reads scripts and the includes they reference once each, and hashes scripts together with their includes."""
+
+    def __init__(
+        self,
+        library: dict[str, bytes],
+    ):
+        self._library: dict[str, bytes] = library
+        self._sources: dict[str, bytes | None] = {}
+        self._digests: dict[str, bytes] = {}
+
+    def source(
+        self,
+        path: str,
+    ) -> bytes | None:
+        if path not in self._sources:
+            try:
+                with open(path, "rb") as file:
+                    self._sources[path] = file.read()
+            except OSError:
+                self._sources[path] = None
+        return self._sources[path]
+
+    def digest(
+        self,
+        path: str,
+        lookup: list[str],
+        game: Game,
+        optimization_level: int,
+    ) -> str:
+        """Returns a hash of the build settings, the script and every include it reaches, resolved the same way the compiler does."""
+        hasher = hashlib.sha256(f"{game.name}:{optimization_level}".encode())
+        visited: set[str] = set()
+        stack: list[str] = [path]
+        while stack:
+            key = stack.pop()
+            if key in visited:
+                continue
+            visited.add(key)
+            data = self.source(key) if os.path.isabs(key) else self._library.get(key)
+            hasher.update(key.encode() + b"\0")
+            if key not in self._digests:
+                self._digests[key] = hashlib.sha256(data or b"").digest()
+            hasher.update(self._digests[key])
+            if data is not None:
+                stack.extend(self._resolve(name.decode(errors="ignore"), lookup) for name in reversed(_INCLUDE_PATTERN.findall(data)))
+        return hasher.hexdigest()
+
+    def _resolve(
+        self,
+        name: str,
+        lookup: list[str],
+    ) -> str:
+        """Returns the path of an included script, or its name if it is not in any folder of the lookup."""
+        for folder in lookup:
+            filepath = str(CaseAwarePath(folder, f"{name}.nss").resolve())
+            if self.source(filepath) is not None:
+                return filepath
+        return name
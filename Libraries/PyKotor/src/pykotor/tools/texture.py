@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+
+from pykotor.resource.formats.tpc import TPC, MipmapFilter, TPCTextureFormat, downsample, generate_mipmaps, read_tpc, write_tpc
+from pykotor.resource.type import ResourceType
+from utility.error_handling import universal_simplify_exception
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+TEXTURE_STAGES = ("decode", "resize", "encode", "write")
+
+
+class TextureConversionResult(NamedTuple):
+    source: str
+    target: str | None
+    pixels: int  # of the source texture
+    timings: dict[str, float]
+    error: str | None
+
+
+class TextureBatchStats:
+    """Totals of a batch texture conversion, with the time the workers spent in each stage."""
+
+    def __init__(
+        self,
+    ):
+        self.textures: int = 0
+        self.failed: list[TextureConversionResult] = []
+        self.pixels: int = 0
+        self.stage_times: dict[str, float] = dict.fromkeys(TEXTURE_STAGES, 0.0)
+        self.elapsed: float = 0.0
+
+    def add(
+        self,
+        result: TextureConversionResult,
+    ):
+        if result.error is not None:
+            self.failed.append(result)
+            return
+        self.textures += 1
+        self.pixels += result.pixels
+        for stage, seconds in result.timings.items():
+            self.stage_times[stage] += seconds
+
+    def throughput(
+        self,
+        stage: str | None = None,
+    ) -> float:
+        """Returns the number of megapixels processed per second.
+
+        Args:
+        ----
+            stage: A name from TEXTURE_STAGES to measure the time a single worker spends in that stage, or None to
+                   measure the whole batch against wall clock time.
+
+        Returns:
+        -------
+            Megapixels per second, or 0.0 if nothing was timed.
+        """
+        seconds = self.elapsed if stage is None else self.stage_times[stage]
+        return self.pixels / seconds / 1_000_000 if seconds else 0.0
+
+    def report(
+        self,
+    ) -> str:
+        lines = [f"Converted {self.textures} textures ({self.pixels / 1_000_000:.1f} MP) in {self.elapsed:.2f}s, {len(self.failed)} failed"]
+        lines.extend(f"  {stage}: {self.stage_times[stage]:.2f}s, {self.throughput(stage):.1f} MP/s per worker" for stage in TEXTURE_STAGES)
+        lines.append(f"  total: {self.throughput():.1f} MP/s")
+        return "\n".join(lines)
+
+
+def convert_texture(
+    source: os.PathLike | str,
+    target: os.PathLike | str,
+    texture_format: TPCTextureFormat | None = None,
+    file_format: ResourceType = ResourceType.TPC,
+    max_size: int | None = None,
+    mipmap_filter: MipmapFilter = MipmapFilter.Box,
+) -> TextureConversionResult:
+    """Converts a single TGA or TPC texture, recording the time spent in each stage.
+
+    Errors are returned in the result rather than raised so one bad file does not stop a batch.
+
+    Args:
+    ----
+        source: Path of the TGA or TPC file to read.
+        target: Path of the file to write.
+        texture_format: Format of the written texture. If None, DXT5 is used for textures with transparent pixels and
+                        DXT1 for the rest.
+        file_format: TPC, TGA or BMP. Only TPC files store mipmaps and compressed formats.
+        max_size: Textures larger than this are halved until both dimensions fit.
+        mipmap_filter: The filter used to resize the texture and to build its mipmaps.
+
+    Returns:
+    -------
+        A TextureConversionResult describing the conversion.
+    """
+    timings: dict[str, float] = {}
+    try:
+        start = time.perf_counter()
+        tpc = read_tpc(source)
+        width, height = tpc.dimensions()
+        pixels = width * height
+        rgba: bytes = bytes(tpc.convert(TPCTextureFormat.RGBA, 0).data)
+        timings["decode"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        while max_size is not None and (width > max_size or height > max_size) and (width > 1 or height > 1):
+            rgba = downsample(rgba, width, height, mipmap_filter)
+            width, height = max(1, width >> 1), max(1, height >> 1)
+        mipmaps = generate_mipmaps(rgba, width, height, mipmap_filter) if file_format == ResourceType.TPC else [rgba]
+        timings["resize"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if file_format != ResourceType.TPC:
+            texture_format = TPCTextureFormat.RGBA
+        elif texture_format is None:
+            alpha = rgba[3::4]
+            texture_format = TPCTextureFormat.DXT1 if alpha.count(255) == len(alpha) else TPCTextureFormat.DXT5
+        converted = TPC()
+        converted.txi = tpc.txi
+        converted.set_data(width, height, mipmaps, TPCTextureFormat.RGBA)
+        if texture_format != TPCTextureFormat.RGBA:
+            mipmaps = [bytes(converted.convert(texture_format, i).data) for i in range(converted.mipmap_count())]
+            converted.set_data(width, height, mipmaps, texture_format)
+        timings["encode"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_tpc(converted, target, file_format)
+        timings["write"] = time.perf_counter() - start
+    except Exception as e:  # noqa: BLE001
+        return TextureConversionResult(str(source), None, 0, timings, str(universal_simplify_exception(e)))
+    return TextureConversionResult(str(source), str(target), pixels, timings, None)
+
+
+def convert_textures(
+    sources: Iterable[os.PathLike | str],
+    output_folder: os.PathLike | str,
+    texture_format: TPCTextureFormat | None = None,
+    file_format: ResourceType = ResourceType.TPC,
+    max_size: int | None = None,
+    mipmap_filter: MipmapFilter = MipmapFilter.Box,
+    max_workers: int | None = None,
+    callback: Callable[[TextureConversionResult], None] | None = None,
+) -> TextureBatchStats:
+    """Converts a batch of TGA/TPC textures across a pool of processes.
+
+    Sources are pulled from the iterable only as workers free up, and each worker reads and writes its own files, so
+    at most a few textures per worker are held in memory no matter how many are converted.
+
+    Args:
+    ----
+        sources: Paths of the TGA or TPC files to convert. Any iterable, including a generator, is accepted.
+        output_folder: The folder to write the converted textures to, using the source filename with the new extension.
+        texture_format: See convert_texture().
+        file_format: See convert_texture().
+        max_size: See convert_texture().
+        mipmap_filter: See convert_texture().
+        max_workers: The number of processes. Defaults to the number of CPUs. With 1, the textures are converted in
+                     this process without starting a pool.
+        callback: Called with the result of each texture as it completes.
+
+    Returns:
+    -------
+        The totals and per-stage timings of the batch.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_pending = max_workers * 2
+    stats = TextureBatchStats()
+    start = time.perf_counter()
+
+    def target(source: os.PathLike | str) -> str:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        return os.path.join(output_folder, f"{stem}.{file_format.extension}")
+
+    if max_workers == 1:
+        for source in sources:
+            result = convert_texture(source, target(source), texture_format, file_format, max_size, mipmap_filter)
+            stats.add(result)
+            if callback is not None:
+                callback(result)
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending: set[Future[TextureConversionResult]] = set()
+        source_iter = iter(sources)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                source = next(source_iter, None)
+                if source is None:
+                    exhausted = True
+                    break
+                pending.add(executor.submit(convert_texture, source, target(source), texture_format, file_format, max_size, mipmap_filter))
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                stats.add(result)
+                if callback is not None:
+                    callback(result)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
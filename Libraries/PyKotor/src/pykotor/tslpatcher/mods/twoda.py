@@ -67,9 +67,9 @@ class Target:
             if self.value not in twoda.get_column("label"):
                 msg = f"The value '{self.value}' could not be found in the twoda's columns"
                 raise WarningError(msg)
-            for row in twoda:
-                if row.get_string("label") == self.value:
-                    source_row = row
+            matches: list[TwoDARow] = twoda.filter_rows("label", self.value)
+            if matches:
+                source_row = matches[-1]
 
         return source_row
 
@@ -352,9 +352,9 @@ class AddRow2DA(Modify2DA):
                 twoda,
                 None,
             )
-            for row in twoda:
-                if row.get_string(self.exclusive_column) == exclusive_value:
-                    target_row = row
+            matches: list[TwoDARow] = twoda.filter_rows(self.exclusive_column, exclusive_value)
+            if matches:
+                target_row = matches[-1]
 
         if target_row is None:
             row_label = str(twoda.get_height()) if self.row_label is None else self.row_label
@@ -437,9 +437,9 @@ class CopyRow2DA(Modify2DA):
                 twoda,
                 None,
             )
-            for row in twoda:
-                if row.get_string(self.exclusive_column) == exclusive_value:
-                    target_row = row
+            matches: list[TwoDARow] = twoda.filter_rows(self.exclusive_column, exclusive_value)
+            if matches:
+                target_row = matches[-1]
 
         if target_row is not None:
             # If the row already exists (based on exclusive_column) then we update the cells
@@ -71,6 +71,8 @@ class ModInstaller:
         self._config: PatcherConfig | None = None
         self._backup: CaseAwarePath | None = None
         self._processed_backup_files: set = set()
+        self._capsules: dict[str, Capsule] = {}  # capsules patched by the current install, keyed by path
+        self._staged_patches: dict[str, int] = {}  # patches staged in each capsule, completed once it is written
 
     def config(self) -> PatcherConfig:
         """Returns the PatcherConfig object associated with the mod installer.
@@ -158,7 +160,7 @@ class ModInstaller:
         Processing Logic:
         ----------------
             - Check if patch destination is capsule file
-            - If yes, create Capsule object and backup file
+            - If yes, get the Capsule object shared by every patch to that capsule and backup file
             - Else, backup file directly
             - Return exists flag and capsule object.
         """
@@ -168,7 +170,9 @@ class ModInstaller:
             if not output_container_path.safe_exists():
                 msg = f"The capsule '{patch.destination}' did not exist when attempting to {patch.action.lower().rstrip()} '{patch.sourcefile}'. Skipping file..."
                 raise FileNotFoundError(msg)
-            capsule = Capsule(output_container_path)
+            capsule = self._capsules.get(str(output_container_path))
+            if capsule is None:
+                capsule = self._capsules[str(output_container_path)] = Capsule(output_container_path)
             create_backup(self.log, output_container_path, *self.backup(), PurePath(patch.destination).parent)
             exists = capsule.exists(*ResourceIdentifier.from_path(patch.saveas))
         else:
@@ -253,6 +257,7 @@ class ModInstaller:
                 try:
                     renamed_file_path = renamed_file_path.resolve()
                     shutil.move(str(override_resource_path), str(renamed_file_path))
+                    CaseAwarePath.invalidate_cache(renamed_file_path)
                 except Exception as e:  # noqa: BLE001
                     # Handle exceptions such as permission errors or file in use.
                     self.log.add_error(f"Could not rename '{patch.saveas}' to '{renamed_file_path.name}' in the Override folder: {e!r}")
@@ -325,7 +330,8 @@ class ModInstaller:
             - For each patch:
                 - Get output path and check for existing file/capsule
                 - Apply patch if needed
-                - Save patched data to destination file or add to capsule
+                - Save patched data to destination file or stage it in the capsule
+            - Write every capsule that was patched, once each
             - Log completion.
         """
         if self.game is None:
@@ -351,6 +357,18 @@ class ModInstaller:
                 config.install_list.append(file_install)
 
         memory = PatcherMemory()
+        try:
+            self._apply_patches(patches_list, memory)
+        finally:
+            self.commit_capsules()
+
+        self.log.add_note(f"Successfully completed {self.log.patches_completed} total patches.")
+
+    def _apply_patches(
+        self,
+        patches_list: list[PatcherModifications],
+        memory: PatcherMemory,
+    ) -> None:
         for patch in patches_list:
             output_container_path: CaseAwarePath = self.game_path / patch.destination
             try:
@@ -367,16 +385,36 @@ class ModInstaller:
                 patched_bytes_data: bytes = patch.patch_resource(data_to_patch_bytes, memory, self.log, self.game)
                 if capsule is not None:
                     self.handle_override_type(patch)
-                    capsule.add(*ResourceIdentifier.from_path(patch.saveas), patched_bytes_data)
+                    capsule.stage(*ResourceIdentifier.from_path(patch.saveas), patched_bytes_data)
+                    capsule_key = str(output_container_path)
+                    self._staged_patches[capsule_key] = self._staged_patches.get(capsule_key, 0) + 1
                 else:
-                    output_container_path.mkdir(exist_ok=True, parents=True)  # Create non-existing folders if needed.
+                    if not output_container_path.exists():
+                        output_container_path.mkdir(exist_ok=True, parents=True)  # Create non-existing folders if needed.
+                        CaseAwarePath.invalidate_cache(output_container_path)
                     BinaryWriter.dump(output_container_path / patch.saveas, patched_bytes_data)
-                self.log.complete_patch()
+                    self.log.complete_patch()
             except Exception as e:  # noqa: BLE001
                 self.log.add_error(str(e))
                 continue
 
-        self.log.add_note(f"Successfully completed {self.log.patches_completed} total patches.")
+    def commit_capsules(self) -> None:
+        """Writes the resources staged by the install to their capsules.
+
+        Every capsule is rewritten exactly once no matter how many patches targeted it, and each rewrite goes through
+        a temporary file so an interrupted install never leaves a capsule partially written. The patches staged in a
+        capsule only count as completed once it has been written.
+        """
+        for capsule_key, capsule in self._capsules.items():
+            try:
+                capsule.commit()
+            except Exception as e:  # noqa: BLE001
+                self.log.add_error(f"Could not write the patched resources to '{capsule.filename()}': {universal_simplify_exception(e)}")
+                continue
+            for _ in range(self._staged_patches.get(capsule_key, 0)):
+                self.log.complete_patch()
+        self._capsules.clear()
+        self._staged_patches.clear()
 
     def get_tlk_patches(self, config: PatcherConfig) -> list[ModificationsTLK]:
         tlk_patches: list[ModificationsTLK] = []
@@ -1,4 +1,5 @@
 from pykotor.common.misc import Game
+from pykotor.common.stream import MAPPED_FILES
 from pykotor.extract.installation import Installation
 from pykotor.resource.formats.tlk import read_tlk, write_tlk
 from pykotor.tools.misc import is_mod_file
@@ -27,11 +28,15 @@ def uninstall_all_mods(installation: Installation):
     # This implementation would be required regardless in K2 anyway as this function currently isn't determining if the Aspyr patch and/or TSLRCM is installed.
     write_tlk(dialog_tlk, dialog_tlk_path)
 
-    # Remove all override files
+    # Remove all override files, dropping any map of them first, as Windows does not delete a mapped file
     for file_path in override_path.iterdir():
+        MAPPED_FILES.release(file_path)
         file_path.unlink()
 
     # Remove any .MOD files
     for file_path in modules_path.iterdir():
         if is_mod_file(file_path.name):
+            MAPPED_FILES.release(file_path)
             file_path.unlink()
+    CaseAwarePath.invalidate_cache(override_path)
+    CaseAwarePath.invalidate_cache(modules_path)
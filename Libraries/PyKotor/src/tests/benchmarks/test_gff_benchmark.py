@@ -0,0 +1,73 @@
+import os
+import pathlib
+import sys
+import time
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.common.geometry import Vector3
+from pykotor.common.misc import ResRef
+from pykotor.resource.formats.gff import GFF, GFFBinaryReader, GFFBinaryWriter, GFFList
+
+PYKOTOR_BENCHMARK = os.environ.get("PYKOTOR_BENCHMARK")
+FIELDS_PER_STRUCT = 10
+
+
+def build_gff(field_count: int) -> GFF:
+    gff = GFF()
+    items = gff.root.set_list("ItemList", GFFList())
+    for i in range(field_count // FIELDS_PER_STRUCT):
+        item = items.add(i)
+        item.set_uint8("Dropable", i & 0xFF)
+        item.set_int16("Charges", -(i & 0x7FFF))
+        item.set_uint32("ObjectId", i)
+        item.set_int32("XOffset", -i)
+        item.set_single("Bearing", i / 7)
+        item.set_uint64("Uid", i << 32)
+        item.set_string("Tag", f"item_{i}")
+        item.set_resref("TemplateResRef", ResRef(f"g_i_{i % 1000}"))
+        item.set_vector3("Position", Vector3(i, -i, i / 2))
+        item.set_binary("Data", i.to_bytes(4, "little"))
+    return gff
+
+
+@unittest.skipIf(not PYKOTOR_BENCHMARK, "PYKOTOR_BENCHMARK environment variable is not set.")
+class TestGFFBenchmark(TestCase):
+    def test_binary_throughput(self):
+        for field_count in (10_000, 100_000, 1_000_000):
+            gff = build_gff(field_count)
+
+            data = bytearray()
+            start = time.perf_counter()
+            GFFBinaryWriter(gff, data).write()
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loaded = GFFBinaryReader(data).load()
+            read_time = time.perf_counter() - start
+
+            self.assertEqual(field_count // FIELDS_PER_STRUCT, len(loaded.root.get_list("ItemList")))
+            print(
+                f"GFF {field_count} fields ({len(data)} bytes): "
+                f"write {write_time:.3f}s ({field_count / write_time:,.0f} fields/s), "
+                f"read {read_time:.3f}s ({field_count / read_time:,.0f} fields/s)"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
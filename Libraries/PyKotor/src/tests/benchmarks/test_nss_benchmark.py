@@ -0,0 +1,105 @@
+import os
+import pathlib
+import sys
+import time
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.common.misc import Game
+from pykotor.common.scriptdefs import KOTOR_CONSTANTS, KOTOR_FUNCTIONS
+from pykotor.common.scriptlib import KOTOR_LIBRARY
+from pykotor.resource.formats.ncs import NCS, NCSInstructionType, bytes_ncs, compile_nss
+from pykotor.resource.formats.ncs.compiler.lexer import NssLexer
+from pykotor.resource.formats.ncs.compiler.parser import NssParser
+from pykotor.resource.formats.ncs.optimizers import MergeAdjacentMoveSPOptimizer, RemoveJMPToAdjacentOptimizer
+
+PYKOTOR_BENCHMARK = os.environ.get("PYKOTOR_BENCHMARK")
+SCRIPT_COUNT = 500
+
+
+def build_script(i: int) -> str:
+    return f"""
+        int GetBonus(object oTarget)
+        {{
+            return GetAbilityModifier(ABILITY_STRENGTH, oTarget) + {i % 7};
+        }}
+
+        void main()
+        {{
+            object oPC = GetFirstPC();
+            int nBonus = GetBonus(oPC);
+            if (GetIsObjectValid(oPC) && nBonus > {i % 3})
+            {{
+                SetLocalNumber(oPC, {i % 30}, nBonus);
+                GiveXPToCreature(oPC, nBonus * 10);
+            }}
+        }}
+    """
+
+
+@unittest.skipIf(not PYKOTOR_BENCHMARK, "PYKOTOR_BENCHMARK environment variable is not set.")
+class TestNSSBenchmark(TestCase):
+    def test_compile_throughput(self):
+        scripts = [build_script(i) for i in range(SCRIPT_COUNT)]
+
+        start = time.perf_counter()
+        for script in scripts:
+            # a new lexer and parser per script, as compile_nss() used to do
+            NssLexer()
+            nss_parser = NssParser(KOTOR_FUNCTIONS, KOTOR_CONSTANTS, KOTOR_LIBRARY, None)
+            nss_parser.parser.parse(script, tracking=True).compile(NCS())
+        fresh_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for script in scripts:
+            compile_nss(script, Game.K1)
+        pooled_time = time.perf_counter() - start
+
+        print(f"fresh parser: {SCRIPT_COUNT / fresh_time:,.0f} scripts/s, pooled parser: {SCRIPT_COUNT / pooled_time:,.0f} scripts/s")
+
+    def test_optimization_levels(self):
+        for name in sorted(KOTOR_LIBRARY):
+            sizes = []
+            for level in (0, 1, 2):
+                start = time.perf_counter()
+                try:
+                    ncs = compile_nss(f'#include "{name}"\nvoid main() {{ }}', Game.K1, optimization_level=level)
+                    sizes.append(f"O{level}: {len(ncs.instructions)} instructions, {len(bytes_ncs(ncs))} bytes, {time.perf_counter() - start:.2f}s")
+                except Exception as e:  # noqa: BLE001
+                    sizes.append(f"O{level}: {e}")
+            print(f"{name}: {'; '.join(sizes)}")
+
+    def test_optimizer_scaling(self):
+        timings = []
+        for pairs in (2000, 8000, 32000):
+            ncs = NCS()
+            for _ in range(pairs):
+                movsp = ncs.add(NCSInstructionType.MOVSP, args=[-4])
+                ncs.add(NCSInstructionType.JMP, jump=movsp, index=len(ncs.instructions) - 1)
+            ncs.add(NCSInstructionType.RETN)
+
+            start = time.perf_counter()
+            ncs.optimize([RemoveJMPToAdjacentOptimizer(), MergeAdjacentMoveSPOptimizer()])
+            timings.append(time.perf_counter() - start)
+            print(f"{pairs} JMP/MOVSP pairs: {timings[-1]:.3f}s")
+        # linear growth is 16x from the smallest to the largest program, stale jump links made it quadratic (256x)
+        self.assertLess(timings[-1], timings[0] * 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
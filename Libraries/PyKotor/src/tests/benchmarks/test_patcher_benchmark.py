@@ -0,0 +1,100 @@
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.extract.capsule import Capsule
+from pykotor.resource.formats.erf import ERF, ERFType, write_erf
+from pykotor.resource.type import ResourceType
+from pykotor.tslpatcher.logger import PatchLogger
+from pykotor.tslpatcher.patcher import ModInstaller
+
+PYKOTOR_BENCHMARK = os.environ.get("PYKOTOR_BENCHMARK")
+MODULE_COUNT = 4
+MODULE_RESOURCE_COUNT = 400  # vanilla resources already inside each module
+FILES_PER_MODULE = 300  # resources the mod installs into each module
+FILE_SIZE = 4096
+
+
+def build_game(game_path: str):
+    os.makedirs(os.path.join(game_path, "modules"))
+    with open(os.path.join(game_path, "swkotor.exe"), "wb"):
+        pass
+    for module in range(MODULE_COUNT):
+        erf = ERF(ERFType.MOD)
+        for i in range(MODULE_RESOURCE_COUNT):
+            erf.set_data(f"vanilla{i}", ResourceType.UTC, os.urandom(FILE_SIZE))
+        write_erf(erf, os.path.join(game_path, "modules", f"module{module}.mod"))
+
+
+def build_mod(mod_path: str) -> str:
+    tslpatchdata = os.path.join(mod_path, "tslpatchdata")
+    os.makedirs(tslpatchdata)
+    lines = ["[Settings]", "LookupGameFolder=0", "", "[InstallList]"]
+    lines.extend(f"install_folder{module}=modules\\module{module}.mod" for module in range(MODULE_COUNT))
+    for module in range(MODULE_COUNT):
+        lines.extend(["", f"[install_folder{module}]"])
+        for i in range(FILES_PER_MODULE):
+            filename = f"m{module}_file{i}.utc"
+            lines.append(f"Replace{i}={filename}")
+            with open(os.path.join(tslpatchdata, filename), "wb") as file:
+                file.write(os.urandom(FILE_SIZE))
+    changes_ini = os.path.join(tslpatchdata, "changes.ini")
+    with open(changes_ini, "w") as file:
+        file.write("\n".join(lines))
+    return changes_ini
+
+
+@unittest.skipIf(not PYKOTOR_BENCHMARK, "PYKOTOR_BENCHMARK environment variable is not set.")
+class TestPatcherBenchmark(TestCase):
+    def test_install_multi_module_mod(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            game_path = os.path.join(temp_dir, "game")
+            mod_path = os.path.join(temp_dir, "mod")
+            build_game(game_path)
+            changes_ini = build_mod(mod_path)
+
+            installer = ModInstaller(os.path.dirname(changes_ini), game_path, changes_ini, PatchLogger())
+            start = time.perf_counter()
+            installer.install()
+            install_time = time.perf_counter() - start
+
+            self.assertEqual([], [error.message for error in installer.log.errors])
+            capsule = Capsule(os.path.join(game_path, "modules", "module0.mod"))
+            self.assertEqual(MODULE_RESOURCE_COUNT + FILES_PER_MODULE, len(capsule))
+
+            # The same writes applied one at a time, as the installer used to do them.
+            capsule_path = os.path.join(game_path, "modules", f"module{MODULE_COUNT}.mod")
+            write_erf(ERF(ERFType.MOD), capsule_path)
+            capsule = Capsule(capsule_path)
+            start = time.perf_counter()
+            for i in range(FILES_PER_MODULE):
+                capsule.add(f"file{i}", ResourceType.UTC, os.urandom(FILE_SIZE))
+            single_module_time = time.perf_counter() - start
+
+            print(
+                f"Installed {MODULE_COUNT * FILES_PER_MODULE} files into {MODULE_COUNT} modules in {install_time:.3f}s, "
+                f"adding {FILES_PER_MODULE} files to a single module one at a time takes {single_module_time:.3f}s"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import pathlib
+import sys
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.resource.formats.tpc import TPC, MipmapFilter, TPCTextureFormat, dxt, write_tpc
+from pykotor.resource.type import ResourceType
+from pykotor.tools.texture import convert_textures
+
+PYKOTOR_BENCHMARK = os.environ.get("PYKOTOR_BENCHMARK")
+TEXTURE_SIZES = (256, 512, 1024, 2048)
+PYTHON_MAX_SIZE = 512  # the pure-Python backend takes minutes on the largest textures
+BATCH_SIZE = 32
+BATCH_TEXTURE_SIZE = 1024
+
+
+def build_texture(size: int) -> bytes:
+    """Builds a noisy gradient so blocks are neither flat nor pure noise."""
+    row = bytes((x * 255 // size) for x in range(size))
+    noise = os.urandom(size * size)
+    data = bytearray(size * size * 4)
+    for y in range(size):
+        offset = y * size
+        data[offset * 4 : (offset + size) * 4 : 4] = row
+        data[offset * 4 + 1 : (offset + size) * 4 : 4] = bytes([y * 255 // size]) * size
+        data[offset * 4 + 2 : (offset + size) * 4 : 4] = noise[offset : offset + size]
+        data[offset * 4 + 3 : (offset + size) * 4 : 4] = row[::-1]
+    return bytes(data)
+
+
+@unittest.skipIf(not PYKOTOR_BENCHMARK, "PYKOTOR_BENCHMARK environment variable is not set.")
+class TestTPCBenchmark(TestCase):
+    def benchmark(self, backend: str, size: int, encode, decode):
+        rgba = build_texture(size)
+        for name, dxt5 in (("DXT1", False), ("DXT5", True)):
+            start = time.perf_counter()
+            data = encode(rgba, size, size, dxt5=dxt5)
+            encode_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            decode(data, size, size, 4, dxt5=dxt5)
+            decode_time = time.perf_counter() - start
+
+            pixels = size * size
+            print(
+                f"{name} {size}x{size} ({backend}): "
+                f"encode {encode_time:.3f}s ({pixels / encode_time:,.0f} px/s), "
+                f"decode {decode_time:.3f}s ({pixels / decode_time:,.0f} px/s)"
+            )
+
+    @unittest.skipIf(dxt.np is None, "NumPy is not installed.")
+    def test_numpy(self):
+        for size in TEXTURE_SIZES:
+            self.benchmark("numpy", size, dxt._encode_numpy, dxt._decode_numpy)
+
+    def test_python(self):
+        for size in TEXTURE_SIZES:
+            if size <= PYTHON_MAX_SIZE:
+                self.benchmark("python", size, dxt._encode_python, dxt._decode_python)
+
+    def test_batch_convert(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tpc = TPC()
+            tpc.set_single(BATCH_TEXTURE_SIZE, BATCH_TEXTURE_SIZE, build_texture(BATCH_TEXTURE_SIZE), TPCTextureFormat.RGBA)
+            sources = []
+            for i in range(BATCH_SIZE):
+                sources.append(os.path.join(temp_dir, f"texture{i}.tga"))
+                write_tpc(tpc, sources[-1], ResourceType.TGA)
+
+            for mipmap_filter in MipmapFilter:
+                stats = convert_textures(sources, os.path.join(temp_dir, mipmap_filter.name), max_size=512, mipmap_filter=mipmap_filter)
+                self.assertEqual([], stats.failed)
+                print(f"{mipmap_filter.name}: {stats.report()}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import pathlib
+import sys
+import time
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.extract.installation import Installation
+from pykotor.resource.formats.twoda import TwoDA, TwoDABinaryReader, TwoDABinaryWriter
+from pykotor.resource.type import ResourceType
+
+PYKOTOR_BENCHMARK = os.environ.get("PYKOTOR_BENCHMARK")
+K1_PATH = os.environ.get("K1_PATH")
+LARGEST_VANILLA_2DAS = ["appearance", "spells", "feat", "baseitems", "placeables", "genericdoors", "portraits"]
+
+
+def build_twoda(row_count: int, column_count: int) -> TwoDA:
+    """Builds a table shaped like appearance.2da: mostly repeated short values with a few unique ones per row."""
+    headers = [f"column{i}" for i in range(column_count)]
+    twoda = TwoDA(headers)
+    for row in range(row_count):
+        cells = {header: str((row * i) % 50) for i, header in enumerate(headers)}
+        cells[headers[0]] = f"label_{row}"
+        cells[headers[1]] = "****"
+        twoda.add_row(str(row), cells)
+    return twoda
+
+
+@unittest.skipIf(not PYKOTOR_BENCHMARK, "PYKOTOR_BENCHMARK environment variable is not set.")
+class TestTwoDABenchmark(TestCase):
+    def benchmark_write(self, name: str, twoda: TwoDA):
+        data = bytearray()
+        start = time.perf_counter()
+        TwoDABinaryWriter(twoda, data).write()
+        write_time = time.perf_counter() - start
+
+        cell_count = twoda.get_height() * twoda.get_width()
+        print(f"2DA {name} {twoda.get_height()}x{twoda.get_width()} ({len(data)} bytes): write {write_time:.4f}s ({cell_count / write_time:,.0f} cells/s)")
+
+    def test_binary_write_synthetic(self):
+        for row_count, column_count in ((700, 90), (2000, 90), (5000, 40)):
+            self.benchmark_write("synthetic", build_twoda(row_count, column_count))
+
+    @unittest.skipIf(not K1_PATH, "K1_PATH environment variable is not set.")
+    def test_binary_write_vanilla(self):
+        installation = Installation(K1_PATH)
+        for resname in LARGEST_VANILLA_2DAS:
+            result = installation.resource(resname, ResourceType.TwoDA)
+            if result is None:
+                continue
+            self.benchmark_write(resname, TwoDABinaryReader(result.data).load())
+
+
+if __name__ == "__main__":
+    unittest.main()
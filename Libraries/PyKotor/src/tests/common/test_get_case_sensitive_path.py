@@ -2,6 +2,7 @@ import os
 import pathlib
 import sys
 import tempfile
+import time
 import unittest
 from unittest import TestCase
 
@@ -20,7 +21,7 @@ if UTILITY_PATH.exists():
         sys.path.remove(working_dir)
     sys.path.insert(0, working_dir)
 
-from pykotor.tools.path import CaseAwarePath
+from pykotor.tools.path import CaseAwarePath, DirectoryListingCache
 
 
 class TestCaseAwarePath(TestCase):
@@ -102,6 +103,29 @@ class TestCaseAwarePath(TestCase):
         # Should still exist from case_aware_path perspective
         self.assertTrue(case_aware_path.exists())
 
+    @unittest.skipIf(os.name == "nt", "Test not available on Windows")
+    def test_cached_listing(self):
+        override = self.temp_path / "Override"
+        override.mkdir()
+        (override / "Appearance.2DA").touch()
+        settled = time.time_ns() - 10 * DirectoryListingCache.RACY_WINDOW_NS
+        os.utime(override, ns=(settled, settled))
+        case_aware_path = CaseAwarePath(f"{self.temp_path}/override/appearance.2da")
+        self.assertEqual(str(override / "Appearance.2DA"), str(CaseAwarePath.get_case_sensitive_path(case_aware_path)))
+
+        # An unchanged mtime means the cached listing is trusted, even though the file was renamed.
+        os.rename(override / "Appearance.2DA", override / "APPEARANCE.2da")
+        os.utime(override, ns=(settled, settled))
+        self.assertEqual(str(override / "Appearance.2DA"), str(CaseAwarePath.get_case_sensitive_path(case_aware_path)))
+
+        CaseAwarePath.invalidate_cache(override / "APPEARANCE.2da")
+        self.assertEqual(str(override / "APPEARANCE.2da"), str(CaseAwarePath.get_case_sensitive_path(case_aware_path)))
+
+        # A changed mtime rescans the folder without an explicit invalidation.
+        os.rename(override / "APPEARANCE.2da", override / "appearance.2DA")
+        os.utime(override, ns=(settled + 1, settled + 1))
+        self.assertEqual(str(override / "appearance.2DA"), str(CaseAwarePath.get_case_sensitive_path(case_aware_path)))
+
     def test_complex_case_changes(self):
         path: pathlib.Path = self.temp_path / "Dir1"
         path.mkdir()
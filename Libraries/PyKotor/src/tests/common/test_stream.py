@@ -1,5 +1,7 @@
+import io
 import os
 import pathlib
+import struct
 import sys
 import unittest
 from unittest import TestCase
@@ -19,7 +21,9 @@ if UTILITY_PATH.exists():
         sys.path.remove(working_dir)
     sys.path.insert(0, working_dir)
 
-from pykotor.common.stream import BinaryReader
+import tempfile
+
+from pykotor.common.stream import MAPPED_FILES, BinaryReader, BinaryWriter, MappedFilePool
 
 
 class TestBinaryReader(TestCase):
@@ -140,6 +144,100 @@ class TestBinaryReader(TestCase):
 
         self.assertEqual(b"\x03", self.reader1c.peek(1))
 
+    def test_memoryview(self):
+        reader = BinaryReader.from_bytes(memoryview(self.data1))
+        self.assertEqual(1, reader.read_uint8())
+        self.assertEqual(2, reader.read_uint16())
+        self.assertEqual(3, reader.read_uint32())
+        self.assertEqual(4, reader.read_uint64())
+
+        reader = BinaryReader.from_bytes(memoryview(self.data1), 3, 4)
+        self.assertEqual(4, reader.size())
+        self.assertEqual(3, reader.read_uint32())
+        self.assertRaises(OSError, reader.read_uint8)
+
+    def test_read_struct(self):
+        self.assertEqual((1, 2, 3), self.reader1.read_struct("BHI"))
+        self.assertEqual((4,), self.reader1.read_struct("Q"))
+        self.assertRaises(OSError, self.reader1.read_struct, "B")
+
+        reader = BinaryReader.from_bytes(b"\x00\x01\x00\x00\x00\x02")
+        self.assertEqual((1, 2), reader.read_struct("HI", big=True))
+
+        stream_reader = BinaryReader(io.BytesIO(self.data1))
+        self.assertEqual((1, 2, 3), stream_reader.read_struct("BHI"))
+        self.assertEqual([(4, 0)], stream_reader.read_struct_array("II", 1))
+
+    def test_read_arrays(self):
+        data = b"\x01\x00\x02\x00\x03\x00\x00\x00\xFF\xFF\xFF\xFF"
+        for reader in (BinaryReader.from_bytes(data), BinaryReader(io.BytesIO(data))):
+            self.assertEqual([1, 2], list(reader.read_uint16_array(2)))
+            self.assertEqual([3], list(reader.read_uint32_array(1)))
+            self.assertEqual([-1], list(reader.read_int32_array(1)))
+            self.assertRaises(OSError, reader.read_uint16_array, 1)
+
+        reader = BinaryReader.from_bytes(b"\x00\x01\x00\x02\x00\x00\x00\x03")
+        self.assertEqual([1, 2], list(reader.read_uint16_array(2, big=True)))
+        self.assertEqual([3], list(reader.read_uint32_array(1, big=True)))
+
+        reader = BinaryReader.from_bytes(struct.pack("<6f", 1.0, 2.0, 3.0, 4.0, 5.0, 6.0))
+        self.assertEqual([1.0, 2.0], list(reader.read_single_array(2)))
+        reader.seek(0)
+        vectors = reader.read_vector3_array(2)
+        self.assertEqual((1.0, 2.0, 3.0), (vectors[0].x, vectors[0].y, vectors[0].z))
+        self.assertEqual((4.0, 5.0, 6.0), (vectors[1].x, vectors[1].y, vectors[1].z))
+
+
+class TestMappedFilePool(TestCase):
+    def setUp(self):
+        self.temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".bin")  # noqa: SIM115
+        self.temp_file.write(b"0123456789")
+        self.temp_file.close()
+
+    def tearDown(self):
+        os.remove(self.temp_file.name)
+
+    def test_view(self):
+        pool = MappedFilePool(max_open=1)
+        self.assertEqual(b"2345", pool.view(self.temp_file.name, 2, 4).tobytes())
+        self.assertEqual(b"89", pool.read(self.temp_file.name, 8))
+        self.assertEqual(1, len(pool))
+        self.assertRaises(OSError, pool.view, self.temp_file.name, 8, 4)
+        pool.release()
+        self.assertEqual(0, len(pool))
+
+    def test_remap_after_write(self):
+        pool = MappedFilePool()
+        self.assertEqual(b"0123", pool.read(self.temp_file.name, 0, 4))
+        BinaryWriter.dump(self.temp_file.name, b"abcdefghijklmnop")
+        self.assertEqual(b"abcdefghijklmnop", pool.read(self.temp_file.name))
+
+    def test_read_keeps_no_map(self):
+        pool = MappedFilePool()
+        self.assertEqual(b"2345", pool.read(self.temp_file.name, 2, 4))
+        self.assertRaises(OSError, pool.read, self.temp_file.name, 8, 4)
+        self.assertEqual(0, len(pool))
+
+        os.remove(self.temp_file.name)  # fails on Windows while the file is mapped
+        self.assertFalse(os.path.exists(self.temp_file.name))
+        BinaryWriter.dump(self.temp_file.name, b"")  # for tearDown
+
+    def test_release_with_views(self):
+        pool = MappedFilePool(max_open=1)
+        view = pool.view(self.temp_file.name, 2, 4)
+        self.assertFalse(pool.release(self.temp_file.name))
+        self.assertEqual(0, len(pool))
+        self.assertEqual(b"2345", view.tobytes())  # the dropped map stays open while the view is in use
+        view.release()
+        self.assertTrue(pool.release(self.temp_file.name))
+
+        view = MAPPED_FILES.view(self.temp_file.name, 2, 4)
+        self.assertRaises(BufferError, BinaryWriter.dump, self.temp_file.name, b"")
+        self.assertEqual(b"2345", view.tobytes())
+        view.release()
+        BinaryWriter.dump(self.temp_file.name, b"")
+        self.assertEqual(0, os.path.getsize(self.temp_file.name))
+
 
 if __name__ == "__main__":
     unittest.main()
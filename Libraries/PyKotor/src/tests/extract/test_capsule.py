@@ -1,6 +1,8 @@
 import os
 import pathlib
+import shutil
 import sys
+import tempfile
 import unittest
 from unittest import TestCase
 
@@ -19,7 +21,10 @@ if UTILITY_PATH.exists():
         sys.path.remove(working_dir)
     sys.path.insert(0, working_dir)
 
-from pykotor.extract.capsule import Capsule
+from pykotor.extract.capsule import Capsule, write_capsule
+from pykotor.extract.file import ResourceIdentifier
+from pykotor.resource.formats.erf import ERFType, read_erf
+from pykotor.resource.formats.rim import read_rim
 from pykotor.resource.type import ResourceType
 
 TEST_ERF_FILE = "src/tests/files/capsule.mod"
@@ -61,6 +66,127 @@ class TestCapsule(TestCase):
         self.assertEqual(1655, len(rim_capsule.resource("module", ResourceType.IFO)))
         self.assertEqual("IFO ", rim_capsule.resource("module", ResourceType.IFO)[:4].decode())
 
+    def test_batch(self):
+        erf_capsule = Capsule(TEST_ERF_FILE)
+
+        pth_query = ResourceIdentifier("001EBO", ResourceType.PTH)
+        are_query = ResourceIdentifier("001ebo", ResourceType.ARE)
+        missing_query = ResourceIdentifier("xxx", ResourceType.ARE)
+        results = erf_capsule.batch([pth_query, are_query, missing_query])
+
+        self.assertEqual(3, len(results))
+        self.assertEqual(erf_capsule.resource("001ebo", ResourceType.PTH), results[pth_query].data)
+        self.assertEqual(erf_capsule.resource("001ebo", ResourceType.ARE), results[are_query].data)
+        self.assertIsNone(results[missing_query])
+
+    def test_add(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            capsule_path = os.path.join(tmpdirname, "capsule.mod")
+            shutil.copy(TEST_ERF_FILE, capsule_path)
+            erf_capsule = Capsule(capsule_path)
+
+            erf_capsule.add("added", ResourceType.UTC, b"added data")
+            self.assertEqual(4, len(erf_capsule))
+            self.assertEqual(b"added data", erf_capsule.resource("added", ResourceType.UTC))
+            self.assertEqual(4865, len(erf_capsule.resource("001ebo", ResourceType.ARE)))
+
+            erf_capsule.reload()
+            self.assertEqual(4, len(erf_capsule))
+
+    def test_stage_commit(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            capsule_path = os.path.join(tmpdirname, "capsule.mod")
+            shutil.copy(TEST_ERF_FILE, capsule_path)
+            erf_capsule = Capsule(capsule_path)
+            original_data = erf_capsule.resource("001ebo", ResourceType.ARE)
+
+            erf_capsule.stage("added", ResourceType.UTC, b"first")
+            erf_capsule.stage("ADDED", ResourceType.UTC, b"second")
+            erf_capsule.stage("001ebo", ResourceType.ARE, b"replaced")
+            self.assertEqual(3, len(erf_capsule))
+            self.assertTrue(erf_capsule.exists("added", ResourceType.UTC))
+            self.assertEqual(b"second", erf_capsule.resource("added", ResourceType.UTC))
+            self.assertEqual(b"replaced", erf_capsule.resource("001ebo", ResourceType.ARE))
+            self.assertEqual(original_data, Capsule(capsule_path).resource("001ebo", ResourceType.ARE))
+
+            erf_capsule.commit()
+            self.assertEqual([], erf_capsule.staged())
+            self.assertEqual(4, len(erf_capsule))
+            self.assertEqual(["capsule.mod"], os.listdir(tmpdirname))
+
+            reloaded = Capsule(capsule_path)
+            self.assertEqual(b"second", reloaded.resource("added", ResourceType.UTC))
+            self.assertEqual(b"replaced", reloaded.resource("001ebo", ResourceType.ARE))
+
+    def test_write_capsule(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            source_path = os.path.join(tmpdirname, "source.utc")
+            with open(source_path, "wb") as file:
+                file.write(b"from a file")
+            erf_capsule = Capsule(TEST_ERF_FILE)
+            git = erf_capsule.info("001ebo", ResourceType.GIT)
+            sources = [
+                ("bytes", ResourceType.UTC, b"from bytes"),
+                ("file", ResourceType.UTC, source_path),
+                ("001ebo", ResourceType.GIT, git),
+                ("BYTES", ResourceType.UTC, b"replaced"),
+            ]
+
+            for filename in ("written.mod", "written.rim"):
+                target = os.path.join(tmpdirname, filename)
+                self.assertEqual(3, write_capsule(target, iter(sources)))
+                container = read_rim(target) if filename.endswith(".rim") else read_erf(target)
+                self.assertEqual(["BYTES", "file", "001ebo"], [str(resource.resref) for resource in container])
+                self.assertEqual(b"replaced", container.get("bytes", ResourceType.UTC))
+                self.assertEqual(b"from a file", container.get("file", ResourceType.UTC))
+                self.assertEqual(git.data(), container.get("001ebo", ResourceType.GIT))
+
+            # rewriting a capsule from its own resources
+            target = os.path.join(tmpdirname, "written.mod")
+            write_capsule(target, [(resource.resname(), resource.restype(), resource) for resource in Capsule(target)][::-1], ERFType.ERF)
+            self.assertEqual(ERFType.ERF, read_erf(target).erf_type)
+            self.assertEqual(git.data(), Capsule(target).resource("001ebo", ResourceType.GIT))
+            self.assertEqual(["source.utc", "written.mod", "written.rim"], sorted(os.listdir(tmpdirname)))
+
+    def test_commit_in_place(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            for test_file, resname in ((TEST_ERF_FILE, "001ebo"), (TEST_RIM_FILE, "m13aa")):
+                capsule_path = os.path.join(tmpdirname, os.path.basename(test_file))
+                shutil.copy(test_file, capsule_path)
+                capsule = Capsule(capsule_path)
+                size = os.path.getsize(capsule_path)
+                git_data = capsule.resource(resname, ResourceType.GIT)
+
+                capsule.stage(resname, ResourceType.ARE, b"smaller")
+                capsule.commit(in_place=True)
+                self.assertEqual(size, os.path.getsize(capsule_path))
+                self.assertEqual(b"smaller", Capsule(capsule_path).resource(resname, ResourceType.ARE))
+
+                capsule.stage(resname, ResourceType.ARE, b"larger" * 2000)
+                capsule.stage("added", ResourceType.UTC, b"added data")
+                capsule.commit(in_place=True)
+                self.assertEqual(size + 12000 + 10 + 4 * 32, os.path.getsize(capsule_path))
+                self.assertLess(0, capsule.dead_space())
+                for reloaded in (capsule, Capsule(capsule_path)):
+                    self.assertEqual(4, len(reloaded))
+                    self.assertEqual(b"larger" * 2000, reloaded.resource(resname, ResourceType.ARE))
+                    self.assertEqual(b"added data", reloaded.resource("added", ResourceType.UTC))
+                    self.assertEqual(git_data, reloaded.resource(resname, ResourceType.GIT))
+
+                # shrinking the largest resource in place would leave the capsule mostly dead space, so it is rewritten
+                capsule.stage(resname, ResourceType.GIT, b"tiny")
+                capsule.commit(in_place=True)
+                self.assertEqual(0, capsule.dead_space())
+                self.assertEqual(b"tiny", Capsule(capsule_path).resource(resname, ResourceType.GIT))
+
+                capsule.stage(resname, ResourceType.ARE, b"larger" * 1500)
+                capsule.commit(in_place=True)
+                self.assertEqual(3000, capsule.dead_space())
+                self.assertEqual(3000, capsule.compact())
+                self.assertEqual(0, capsule.dead_space())
+                self.assertEqual(b"larger" * 1500, Capsule(capsule_path).resource(resname, ResourceType.ARE))
+            self.assertEqual(["capsule.mod", "capsule.rim"], sorted(os.listdir(tmpdirname)))
+
 
 if __name__ == "__main__":
     unittest.main()
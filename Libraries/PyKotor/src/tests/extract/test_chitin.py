@@ -1,6 +1,10 @@
+from __future__ import annotations
+
 import os
 import pathlib
+import struct
 import sys
+import tempfile
 import unittest
 from unittest import TestCase
 
@@ -21,7 +25,9 @@ if UTILITY_PATH.exists():
         sys.path.remove(working_dir)
     sys.path.insert(0, working_dir)
 
-from pykotor.extract.chitin import Chitin
+from pykotor.common.stream import MAPPED_FILES
+from pykotor.extract.chitin import Chitin, ChitinWriter
+from pykotor.resource.type import ResourceType
 
 
 NWN_BASE_PATH = r"C:\Program Files (x86)\Steam\steamapps\common\Neverwinter Nights"
@@ -29,7 +35,139 @@ NWN_KEY_PATH = r"C:\Program Files (x86)\Steam\steamapps\common\Neverwinter Night
 K1_PATH = os.environ.get("K1_PATH")
 K2_PATH = os.environ.get("K2_PATH")
 
+
+def write_chitin(folder: str, bifs: dict[str, list[tuple[str, ResourceType, bytes]]]):
+    """Writes a chitin.key and its BIF files, numbering the resource ids the way the game does."""
+    keys = b""
+    filenames = b""
+    file_table = b""
+    file_table_offset = 64
+    names_offset = file_table_offset + 12 * len(bifs)
+    for bif_index, (bif_name, resources) in enumerate(bifs.items()):
+        table = b""
+        data = b""
+        data_offset = 20 + 16 * len(resources)
+        for index, (resref, restype, payload) in enumerate(resources):
+            res_id = (bif_index << 20) | index
+            table += struct.pack("<IIII", res_id, data_offset + len(data), len(payload), restype.type_id)
+            data += payload
+            keys += struct.pack("<16sHI", resref.encode(), restype.type_id, res_id)
+        os.makedirs(os.path.join(folder, "data"), exist_ok=True)
+        with open(os.path.join(folder, "data", bif_name), "wb") as file:
+            file.write(b"BIFFV1  " + struct.pack("<III", len(resources), 0, 20) + table + data)
+        name = f"data\\{bif_name}".encode() + b"\0"
+        file_table += struct.pack("<IIHH", 0, names_offset + len(filenames), len(name), 0)
+        filenames += name
+    key_count = len(keys) // 22
+    header = b"KEY V1  " + struct.pack("<IIII", len(bifs), key_count, file_table_offset, names_offset + len(filenames))
+    with open(os.path.join(folder, "chitin.key"), "wb") as file:
+        file.write(header.ljust(file_table_offset, b"\0") + file_table + filenames + keys)
+
 class TestCapsule(TestCase):
+    def test_compact_table(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_chitin(
+                temp_dir,
+                {
+                    "a.bif": [("first", ResourceType.UTC, b"utc"), ("second", ResourceType.TwoDA, b"2da data")],
+                    "b.bif": [("third", ResourceType.NSS, b"void main() {}"), ("first", ResourceType.UTC, b"duplicate")],
+                },
+            )
+            chitin = Chitin(os.path.join(temp_dir, "chitin.key"), max_workers=2)
+
+            self.assertEqual(4, len(chitin))
+            self.assertEqual(["data\\a.bif", "data\\b.bif"], chitin.bifs())
+            self.assertEqual(["first", "second", "third", "first"], [resource.resname() for resource in chitin])
+            self.assertEqual(b"void main() {}", chitin[2].data())
+            self.assertEqual(b"duplicate", chitin[-1].data())
+            self.assertEqual(["second", "third"], [resource.resname() for resource in chitin[1:3]])
+            self.assertEqual(2, len(chitin.bif_resources("data\\b.bif")))
+            self.assertEqual(b"utc", chitin.resource("FIRST", ResourceType.UTC))
+            self.assertTrue(chitin.exists("second", ResourceType.TwoDA))
+            self.assertFalse(chitin.exists("second", ResourceType.UTC))
+            with self.assertRaises(IndexError):
+                chitin[4]
+
+    def test_writer(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            override = os.path.join(temp_dir, "override")
+            os.makedirs(os.path.join(override, "sub"))
+            for filename, data in (("a.utc", b"same data"), ("b.utc", b"same data"), ("sub/c.2da", b"2DA V2.b"), ("readme.txt.bak", b"")):
+                with open(os.path.join(override, filename), "wb") as file:
+                    file.write(data)
+
+            key_path = os.path.join(temp_dir, "chitin.key")
+            writer = ChitinWriter(key_path)
+            self.assertEqual(3, writer.add_folder("data/override.bif", override))
+            writer.add("data\\scripts.bif", "k_main", ResourceType.NCS, b"NCS V1.0")
+            result = writer.write()
+            self.assertEqual((4, 1, 25), tuple(result))
+
+            chitin = Chitin(key_path)
+            self.assertEqual(["data\\override.bif", "data\\scripts.bif"], chitin.bifs())
+            self.assertEqual(chitin.bif_resources("data\\override.bif")[0].offset(), chitin.bif_resources("data\\override.bif")[1].offset())
+            self.assertEqual(b"2DA V2.b", chitin.resource("c", ResourceType.TwoDA))
+
+            writer = ChitinWriter(key_path, append=True)
+            writer.add("data\\scripts.bif", "k_main", ResourceType.NCS, b"replaced")
+            writer.add("data\\scripts.bif", "k_other", ResourceType.NCS, b"NCS V1.0")
+            writer.add("data\\new.bif", "n_new", ResourceType.UTC, b"new")
+            self.assertEqual((3, 1, 11), tuple(writer.write()))
+
+            chitin = Chitin(key_path)
+            self.assertEqual(6, len(chitin))
+            self.assertEqual(b"replaced", chitin.resource("k_main", ResourceType.NCS))
+            self.assertEqual(b"NCS V1.0", chitin.resource("k_other", ResourceType.NCS))
+            self.assertEqual(b"new", chitin.resource("n_new", ResourceType.UTC))
+            self.assertEqual(b"same data", chitin.resource("b", ResourceType.UTC))
+
+    def test_writer_failed_append(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            key_path = os.path.join(temp_dir, "chitin.key")
+            bif_path = os.path.join(temp_dir, "data", "templates.bif")
+            for resname in ("one", "two"):
+                writer = ChitinWriter(key_path, append=True)
+                writer.add("data\\templates.bif", resname, ResourceType.UTC, f"{resname} data".encode())
+                writer.write()
+            size = os.path.getsize(bif_path)
+
+            # the table of the BIF is at the end of the file, a failed append must not have overwritten it
+            writer = ChitinWriter(key_path, append=True)
+            writer.add("data\\templates.bif", "three", ResourceType.UTC, b"three data")
+            writer.add("data\\templates.bif", "four", ResourceType.UTC, os.path.join(temp_dir, "missing.utc"))
+            self.assertRaises(FileNotFoundError, writer.write)
+            self.assertEqual(size, os.path.getsize(bif_path))
+
+            chitin = Chitin(key_path)
+            self.assertEqual(["one", "two"], [resource.resname() for resource in chitin])
+            self.assertEqual(b"two data", chitin.resource("two", ResourceType.UTC))
+            MAPPED_FILES.release()
+
+    def test_writer_with_views(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            key_path = os.path.join(temp_dir, "chitin.key")
+            writer = ChitinWriter(key_path)
+            writer.add("data\\templates.bif", "first", ResourceType.UTC, b"first data")
+            writer.write()
+
+            view = Chitin(key_path)[0].view()
+            writer = ChitinWriter(key_path)
+            writer.add("data\\templates.bif", "first", ResourceType.UTC, b"other data, longer than before")
+            writer.write()
+            self.assertEqual(b"first data", bytes(view))
+
+            writer = ChitinWriter(key_path, append=True)
+            writer.add("data\\templates.bif", "second", ResourceType.UTC, b"second data")
+            writer.write()
+            self.assertEqual(b"first data", bytes(view))
+            view.release()
+
+            chitin = Chitin(key_path)
+            self.assertEqual(b"other data, longer than before", chitin.resource("first", ResourceType.UTC))
+            self.assertEqual(b"second data", chitin.resource("second", ResourceType.UTC))
+            self.assertEqual(["templates.bif"], os.listdir(os.path.join(temp_dir, "data")))
+            MAPPED_FILES.release()
+
     def test_nwn_chitin(self):
         chitin = Chitin(NWN_KEY_PATH, NWN_BASE_PATH)
     @unittest.skipIf(
@@ -0,0 +1,86 @@
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.common.stream import MAPPED_FILES
+from pykotor.extract.capsule import Capsule
+from pykotor.extract.file import FileResource
+from pykotor.resource.type import ResourceType
+from utility.misc import generate_sha256_hash
+
+TEST_ERF_FILE = "src/tests/files/capsule.mod"
+
+
+class TestFileResource(TestCase):
+    def test_hash_is_lazy(self):
+        resource = Capsule(TEST_ERF_FILE).info("001ebo", ResourceType.GIT)
+        data = resource.data()
+        self.assertEqual("", resource._sha256_hash)
+        self.assertEqual(generate_sha256_hash(data), resource.get_sha256_hash())
+
+    def test_streaming_hash(self):
+        resource = Capsule(TEST_ERF_FILE).info("001ebo", ResourceType.GIT)
+        expected = generate_sha256_hash(resource.data())
+        resource.HASH_CHUNK_SIZE = 1000
+        self.assertEqual(expected, resource.get_sha256_hash(reload=True))
+
+    def test_equality(self):
+        capsule = Capsule(TEST_ERF_FILE)
+        are = capsule.info("001ebo", ResourceType.ARE)
+        git = capsule.info("001ebo", ResourceType.GIT)
+        are_copy = FileResource("copy", ResourceType.ARE, are.size(), are.offset(), are.filepath())
+
+        self.assertTrue(are.same_location(are_copy))
+        self.assertEqual(are, are_copy)
+        self.assertNotEqual(are, git)
+        self.assertEqual(are, are.data())
+        self.assertNotEqual(are, git.data())
+        self.assertEqual("", git._sha256_hash)  # sizes differ, so nothing had to be hashed
+
+    def test_hash_after_rewrite(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "file.utc")
+            with open(filepath, "wb") as file:
+                file.write(b"first")
+            resource = FileResource("file", ResourceType.UTC, 5, 0, filepath)
+            self.assertEqual(generate_sha256_hash(b"first"), resource.get_sha256_hash())
+
+            with open(filepath, "wb") as file:
+                file.write(b"other")
+            os.utime(filepath, ns=(0, 0))
+            self.assertEqual(generate_sha256_hash(b"other"), resource.get_sha256_hash())
+
+    def test_delete_after_read(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath = os.path.join(temp_dir, "capsule.mod")
+            shutil.copy(TEST_ERF_FILE, filepath)
+            resource = Capsule(filepath).info("001ebo", ResourceType.GIT)
+            MAPPED_FILES.release()
+            self.assertEqual(resource.size(), len(resource.data()))
+            self.assertEqual(0, len(MAPPED_FILES))
+
+            os.remove(filepath)  # a map kept by data() would make this fail on Windows
+            self.assertFalse(os.path.exists(filepath))
+
+
+if __name__ == "__main__":
+    unittest.main()
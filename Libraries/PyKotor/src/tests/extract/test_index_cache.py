@@ -0,0 +1,106 @@
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import TestCase
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[2].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[4].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.extract.capsule import Capsule
+from pykotor.extract.file import FileResource
+from pykotor.extract.index_cache import InstallationIndexCache
+from pykotor.resource.type import ResourceType
+
+TEST_ERF_FILE = "src/tests/files/capsule.mod"
+
+
+class TestInstallationIndexCache(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.capsule_path = os.path.join(self.temp_dir, "capsule.mod")
+        self.cache_path = os.path.join(self.temp_dir, "cache", "installation.idx")
+        shutil.copy(TEST_ERF_FILE, self.capsule_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_roundtrip(self):
+        resources = list(Capsule(self.capsule_path))
+        cache = InstallationIndexCache(self.cache_path)
+        self.assertIsNone(cache.get(self.capsule_path))
+        cache.put(self.capsule_path, resources)
+        cache.save()
+
+        cached = InstallationIndexCache(self.cache_path).get(self.capsule_path)
+        self.assertIsNotNone(cached)
+        self.assertEqual(len(resources), len(cached))
+        for expected, actual in zip(resources, cached):
+            self.assertEqual(expected.identifier(), actual.identifier())
+            self.assertEqual(expected.offset(), actual.offset())
+            self.assertEqual(expected.size(), actual.size())
+            self.assertEqual(str(expected.filepath()), str(actual.filepath()))
+        self.assertEqual(b"ARE ", cached[0].data()[:4])
+
+    def test_stale_entry(self):
+        cache = InstallationIndexCache(self.cache_path)
+        cache.put(self.capsule_path, list(Capsule(self.capsule_path)))
+        with open(self.capsule_path, "ab") as file:
+            file.write(b"\0")
+        self.assertIsNone(cache.get(self.capsule_path))
+
+    def test_folder(self):
+        folder = os.path.join(self.temp_dir, "override")
+        os.makedirs(os.path.join(folder, "sub"))
+        with open(os.path.join(folder, "sub", "Nested.UTC"), "wb") as file:
+            file.write(b"utc")
+        listing = {
+            folder: [FileResource("capsule", ResourceType.MOD, 4, 0, os.path.join(folder, "capsule.mod"))],
+            os.path.join(folder, "sub"): [FileResource("Nested", ResourceType.UTC, 3, 0, os.path.join(folder, "sub", "Nested.UTC"))],
+        }
+        cache = InstallationIndexCache(self.cache_path)
+        cache.put_folder(folder, listing, recurse=True)
+        self.assertIsNone(cache.get_folder(folder, recurse=True))  # just changed, so the mtime cannot be trusted yet
+
+        for directory in listing:
+            os.utime(directory, ns=(0, 0))
+        cache.put_folder(folder, listing, recurse=True)
+        cache.save()
+
+        cache = InstallationIndexCache(self.cache_path)
+        self.assertIsNone(cache.get_folder(folder))
+        cached = cache.get_folder(folder, recurse=True)
+        self.assertEqual(list(listing), list(cached))
+        for expected, actual in zip(listing.values(), cached.values()):
+            self.assertEqual([(resource.identifier(), resource.size(), str(resource.filepath())) for resource in expected],
+                             [(resource.identifier(), resource.size(), str(resource.filepath())) for resource in actual])
+        self.assertEqual("Nested", cached[os.path.join(folder, "sub")][0].resname())
+
+        with open(os.path.join(folder, "sub", "added.utc"), "wb"):
+            pass
+        self.assertIsNone(cache.get_folder(folder, recurse=True))
+
+    def test_corrupted_file(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "wb") as file:
+            file.write(b"PKICV1.0\xff\xff")
+        cache = InstallationIndexCache(self.cache_path)
+        self.assertEqual(0, len(cache))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import pathlib
 import sys
+import tempfile
 import unittest
 from unittest import TestCase
 
@@ -22,14 +23,51 @@ if UTILITY_PATH.exists():
     sys.path.insert(0, working_dir)
 
 from pykotor.common.language import LocalizedString
-from pykotor.extract.capsule import Capsule
+from pykotor.extract.capsule import Capsule, write_capsule
+from pykotor.extract.chitin import ChitinWriter
 from pykotor.extract.file import ResourceIdentifier, ResourceResult
+from pykotor.extract.index_cache import InstallationIndexCache
 from pykotor.extract.installation import Installation, SearchLocation
+from pykotor.resource.formats.tlk import TLK, write_tlk
 from pykotor.resource.type import ResourceType
 
 K1_PATH = os.environ.get("K1_PATH")
 
 
+def build_installation(path: str) -> None:
+    """Writes a small K1 installation with a chitin, capsules in every capsule folder and loose files."""
+    for folder in ("modules", "Override/sub", "lips", "rims", "texturepacks", "streammusic", "streamsounds", "streamwaves/sub"):
+        os.makedirs(os.path.join(path, folder))
+    write_tlk(TLK(), os.path.join(path, "dialog.tlk"))
+
+    writer = ChitinWriter(os.path.join(path, "chitin.key"))
+    writer.add("data\\templates.bif", "c_bantha", ResourceType.UTC, b"chitin c_bantha")
+    writer.add("data\\templates.bif", "shared", ResourceType.UTC, b"chitin shared")
+    writer.write()
+
+    write_capsule(os.path.join(path, "modules", "danm13.rim"), [("m13aa", ResourceType.ARE, b"are"), ("shared", ResourceType.UTC, b"module shared")])
+    write_capsule(os.path.join(path, "modules", "danm13_s.rim"), [("m13aa", ResourceType.GIT, b"git")])
+    write_capsule(os.path.join(path, "lips", "global.mod"), [("n_gendro_coms1", ResourceType.LIP, b"lip")])
+    write_capsule(os.path.join(path, "rims", "darkjedi.rim"), [("darkjedi", ResourceType.SSF, b"ssf")])
+    write_capsule(os.path.join(path, "texturepacks", "swpc_tex_tpa.erf"), [("blood", ResourceType.TPC, b"tpc")])
+    loose_files = (
+        ("Override/shared.utc", b"override shared"),
+        ("Override/sub/nested.2da", b"2DA V2.b"),
+        ("Override/readme.txt.bak", b""),
+        ("streammusic/mus_theme_carth.wav", b"music"),
+        ("streamsounds/P_hk47_POIS.wav", b"sound"),
+        ("streamwaves/sub/NM03ABCITI06004_.wav", b"voice"),
+        ("swkotor.exe", b""),
+    )
+    for filename, data in loose_files:
+        with open(os.path.join(path, filename), "wb") as file:
+            file.write(data)
+
+
+def describe(installation: Installation) -> list[tuple[str, ResourceType, str, int, int]]:
+    return [(resource.resname(), resource.restype(), str(resource.filepath()), resource.offset(), resource.size()) for resource in installation]
+
+
 @unittest.skipIf(
     not K1_PATH or not pathlib.Path(K1_PATH).joinpath("chitin.key").exists(),
     "K1_PATH environment variable is not set or not found on disk.",
@@ -288,6 +326,35 @@ class TestInstallation(TestCase):
         self._assert_from_path_tests(capsules_results, "m13aa.are", "xyz.ifo")
         folders = [installation.override_path()]
 
+    def test_location_index_reload(self):
+        installation = self.installation
+
+        before = installation.location("m13aa", ResourceType.ARE, [SearchLocation.MODULES])
+        installation.reload_module("danm13.rim")
+        after = installation.location("m13aa", ResourceType.ARE, [SearchLocation.MODULES])
+        self.assertEqual(before, after)
+
+        installation.reload_override(".")
+        self.assertFalse(installation.location("xxx", ResourceType.NSS, [SearchLocation.OVERRIDE]))
+
+    def test_concurrent_load(self):
+        assert K1_PATH  # noqa: S101
+        installation = Installation(K1_PATH, max_workers=8)
+
+        self.assertEqual(list(Installation(K1_PATH)), list(installation))
+        self.assertIn("chitin", installation.load_timings())
+        self.assertIn("location_indexes", installation.load_timings())
+
+    def test_lazy_load(self):
+        assert K1_PATH  # noqa: S101
+        installation = Installation(K1_PATH, lazy=True)
+        self.assertEqual({}, installation.load_timings())
+
+        self.assertIsNotNone(installation.resource("c_bantha", ResourceType.UTC, [SearchLocation.CHITIN]))
+        self.assertEqual(["chitin"], list(installation.load_timings()))
+        self.assertEqual(self.installation.modules_list(), installation.modules_list())
+        self.assertEqual(list(self.installation), list(installation))
+
     def _assert_from_path_tests(self, arg0, arg1, arg2):
         self.assertTrue(arg0[ResourceIdentifier.from_path(arg1)])
         self.assertFalse(arg0[ResourceIdentifier.from_path(arg2)])
@@ -401,5 +468,75 @@ class TestInstallation(TestCase):
         )  # this test will fail on non-english versions of the game
 
 
+class TestSyntheticInstallation(TestCase):
+    QUERIES = [
+        ResourceIdentifier("c_bantha", ResourceType.UTC),
+        ResourceIdentifier("shared", ResourceType.UTC),
+        ResourceIdentifier("m13aa", ResourceType.GIT),
+        ResourceIdentifier("nested", ResourceType.TwoDA),
+        ResourceIdentifier("NM03ABCITI06004_", ResourceType.WAV),
+        ResourceIdentifier("xxx", ResourceType.UTC),
+    ]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.temp_dir.name, "swkotor")
+        build_installation(cls.path)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.temp_dir.cleanup()
+
+    def test_concurrent_load(self):
+        serial = Installation(self.path, max_workers=1)
+        concurrent = Installation(self.path, max_workers=4)
+        self.assertEqual(14, len(describe(serial)))
+        self.assertEqual(describe(serial), describe(concurrent))
+        self.assertEqual(serial.modules_list(), concurrent.modules_list())
+        self.assertEqual(serial.override_list(), concurrent.override_list())
+        self.assertEqual(serial.locations(self.QUERIES), concurrent.locations(self.QUERIES))
+        self.assertEqual(b"override shared", concurrent.resource("shared", ResourceType.UTC).data)
+
+    def test_lazy_load(self):
+        eager = Installation(self.path)
+        lazy = Installation(self.path, lazy=True)
+        self.assertEqual({}, lazy.load_timings())
+
+        self.assertEqual(eager.location("c_bantha", ResourceType.UTC, [SearchLocation.CHITIN]), lazy.location("c_bantha", ResourceType.UTC, [SearchLocation.CHITIN]))
+        self.assertEqual(["chitin"], list(lazy.load_timings()))
+
+        order = [SearchLocation.MODULES, SearchLocation.VOICE]
+        self.assertEqual(eager.resources(self.QUERIES, order), lazy.resources(self.QUERIES, order))
+        self.assertEqual({"chitin", "modules", "streamwaves"}, set(lazy.load_timings()))
+
+        lazy.load_override()  # loaded directly, so looking it up must not load it again
+        self.assertEqual(eager.location("nested", ResourceType.TwoDA), lazy.location("nested", ResourceType.TwoDA))
+        self.assertNotIn("override", lazy.load_timings())
+        self.assertEqual(eager.resources(self.QUERIES), lazy.resources(self.QUERIES))
+        self.assertEqual({"chitin", "modules", "streamwaves"}, set(lazy.load_timings()))
+        self.assertEqual(describe(eager), describe(lazy))
+
+    def test_broken_symlinks(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "swkotor")
+            build_installation(path)
+            override = os.path.join(path, "Override")
+            for i in range(20):
+                with open(os.path.join(override, f"table{i:02}.2da"), "wb") as file:
+                    file.write(b"2DA V2.b")
+            try:
+                for name in ("broken1.2da", "broken2.2da"):
+                    os.symlink(os.path.join(temp_dir, "missing.2da"), os.path.join(override, name))
+            except (OSError, NotImplementedError):
+                self.skipTest("symbolic links are not supported")
+
+            # only the broken links are skipped, and the incomplete listing is not cached
+            cache_path = os.path.join(temp_dir, "index.cache")
+            installation = Installation(path, index_cache_path=cache_path)
+            self.assertEqual(21, len(installation.override_resources(".")))
+            self.assertIsNone(InstallationIndexCache(cache_path).get_folder(installation.override_path(), recurse=True))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -21,7 +21,7 @@ if UTILITY_PATH.exists():
 
 from pykotor.common.geometry import Vector3, Vector4
 from pykotor.common.language import Gender, Language
-from pykotor.resource.formats.gff import GFF, GFFBinaryReader, GFFXMLReader, read_gff, write_gff
+from pykotor.resource.formats.gff import GFF, GFFBinaryReader, GFFList, GFFXMLReader, read_gff, write_gff
 from pykotor.resource.type import ResourceType
 
 BINARY_TEST_FILE = "src/tests/files/test.gff"
@@ -41,6 +41,29 @@ class TestGFF(TestCase):
         gff = read_gff(data)
         self.validate_io(gff)
 
+    def test_binary_nested_lists(self):
+        gff = GFF()
+        outer = gff.root.set_list("outer", GFFList())
+        for i in range(100):
+            child = outer.add(i)
+            child.set_int16("int16", -i)
+            child.set_string("string", f"child{i}")
+            inner = child.set_list("inner", GFFList())
+            for j in range(i % 3):
+                inner.add(j).set_int8("int8", -j)
+
+        data = bytearray()
+        write_gff(gff, data, ResourceType.GFF)
+        gff = GFFBinaryReader(data).load()
+
+        outer = gff.root.get_list("outer")
+        self.assertEqual(100, len(outer))
+        for i, child in enumerate(outer):
+            self.assertEqual(i, child.struct_id)
+            self.assertEqual(-i, child.get_int16("int16"))
+            self.assertEqual(f"child{i}", child.get_string("string"))
+            self.assertEqual([-j for j in range(i % 3)], [inner.get_int8("int8") for inner in child.get_list("inner")])
+
     def test_xml_io(self):
         gff = GFFXMLReader(XML_TEST_FILE).load()
         self.validate_io(gff)
@@ -1,7 +1,11 @@
+import hashlib
+import json
 import os
 import pathlib
 import sys
+import tempfile
 import unittest
+from unittest.mock import patch
 
 THIS_SCRIPT_PATH = pathlib.Path(__file__)
 PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[3].resolve()
@@ -19,12 +23,14 @@ if UTILITY_PATH.exists():
     sys.path.insert(0, working_dir)
 
 from pykotor.common.geometry import Vector3
+from pykotor.common.misc import Game
 from pykotor.common.scriptdefs import KOTOR_CONSTANTS, KOTOR_FUNCTIONS
-from pykotor.resource.formats.ncs import NCS, NCSInstructionType
+from pykotor.resource.formats.ncs import NCS, NCSInstructionType, compile_nss
 from pykotor.resource.formats.ncs.compiler.classes import CompileException
 from pykotor.resource.formats.ncs.compiler.interpreter import Interpreter
 from pykotor.resource.formats.ncs.compiler.lexer import NssLexer
-from pykotor.resource.formats.ncs.compiler.parser import NssParser
+from pykotor.resource.formats.ncs.compiler.parser import INCLUDE_CACHE, NssParser, pooled_parser
+from pykotor.tools.script import MANIFEST_FILENAME, _IncludeGraph, compile_scripts
 from utility.path import Path
 
 
@@ -1946,6 +1952,121 @@ class TestNSSCompiler(unittest.TestCase):
 
         self.assertRaises(CompileException, self.compile, source)
 
+    def test_pooled_parser(self):
+        with pooled_parser(KOTOR_FUNCTIONS, KOTOR_CONSTANTS, {}, None) as first:
+            with pooled_parser(KOTOR_FUNCTIONS, KOTOR_CONSTANTS, {}, None) as nested:
+                self.assertIsNot(first, nested)
+        with pooled_parser(KOTOR_FUNCTIONS, KOTOR_CONSTANTS, {}, None) as reused:
+            self.assertIn(reused, (first, nested))
+
+        # line numbers and include folders must not carry over from the previous script
+        source = """
+            #include "includetest"
+
+            void main()
+            {
+                TestFunc(;
+            }
+        """
+        for _ in range(2):
+            with self.assertRaisesRegex(CompileException, "line 6"):
+                compile_nss(source, Game.K1, library_lookup="./src/tests/files/")
+        compile_nss(source.replace("TestFunc(;", "TestFunc();"), Game.K1, library_lookup="./src/tests/files/")
+        self.assertRaises(CompileException, compile_nss, source.replace("TestFunc(;", "TestFunc();"), Game.K1)
+
+    def test_include_cache(self):
+        source = """
+            #include "cachetest"
+
+            void main()
+            {
+                TestFunc();
+            }
+        """
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            include_path = os.path.join(tmpdirname, "cachetest.nss")
+            with open(include_path, "w") as file:
+                file.write("void TestFunc() { PrintInteger(123); }")
+
+            hits, misses = INCLUDE_CACHE.hits, INCLUDE_CACHE.misses
+            for _ in range(2):
+                interpreter = Interpreter(self.compile(source, library_lookup=tmpdirname))
+                interpreter.run()
+                self.assertEqual([123], interpreter.action_snapshots[-1].arg_values)
+            self.assertEqual((hits + 1, misses + 1), (INCLUDE_CACHE.hits, INCLUDE_CACHE.misses))
+
+            with open(include_path, "w") as file:
+                file.write("void TestFunc() { PrintInteger(456); }")
+            interpreter = Interpreter(self.compile(source, library_lookup=tmpdirname))
+            interpreter.run()
+            self.assertEqual([456], interpreter.action_snapshots[-1].arg_values)
+            self.assertEqual(misses + 2, INCLUDE_CACHE.misses)
+
+    def test_compile_scripts(self):
+        scripts = {
+            "a.nss": '#include "inc"\nvoid main() { TestFunc(); }',
+            "b.nss": "void main() { PrintInteger(1); }",
+            "bad.nss": "void main() { PrintInteger(; }",
+            "inc.nss": '#include "inc_nested"\nvoid TestFunc() { NestedFunc(); }',
+            "inc_nested.nss": "void NestedFunc() { PrintInteger(2); }",
+        }
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            source_folder = os.path.join(tmpdirname, "source")
+            output_folder = os.path.join(tmpdirname, "output")
+            os.makedirs(source_folder)
+            for filename, script in scripts.items():
+                with open(os.path.join(source_folder, filename), "w") as file:
+                    file.write(script)
+
+            stats = compile_scripts(source_folder, output_folder, Game.K1, max_workers=1)
+            self.assertEqual((3, 2, 0), (stats.scripts, stats.compiled, stats.up_to_date))
+            self.assertEqual(["bad.nss"], [os.path.basename(result.source) for result in stats.failed])
+            self.assertEqual(["a.ncs", "b.ncs"], sorted(filename for filename in os.listdir(output_folder) if filename.endswith(".ncs")))
+
+            stats = compile_scripts(source_folder, output_folder, Game.K1, max_workers=1)
+            self.assertEqual((0, 2, 1), (stats.compiled, stats.up_to_date, len(stats.failed)))
+
+            # a change to a nested include rebuilds the scripts that reach it
+            with open(os.path.join(source_folder, "inc_nested.nss"), "w") as file:
+                file.write("void NestedFunc() { PrintInteger(3); }")
+            compiled = []
+            stats = compile_scripts(source_folder, output_folder, Game.K1, max_workers=1, callback=compiled.append)
+            self.assertEqual((1, 1), (stats.compiled, stats.up_to_date))
+            self.assertEqual(["a.nss", "b.nss", "bad.nss"], sorted(os.path.basename(result.source) for result in compiled))
+
+            # the manifest of an interrupted batch keeps the scripts finished so far, and drops removed sources
+            manifest_path = os.path.join(output_folder, MANIFEST_FILENAME)
+            os.remove(os.path.join(source_folder, "b.nss"))
+            with open(os.path.join(source_folder, "c.nss"), "w") as file:
+                file.write("void main() { PrintInteger(4); }")
+            with open(os.path.join(source_folder, "d.nss"), "w") as file:
+                file.write("void main() { PrintInteger(5); }")
+
+            def interrupt(result):
+                if os.path.basename(result.source) == "c.nss":
+                    raise KeyboardInterrupt
+
+            self.assertRaises(KeyboardInterrupt, compile_scripts, source_folder, output_folder, Game.K1, max_workers=1, callback=interrupt)
+            with open(manifest_path, encoding="utf-8") as file:
+                self.assertEqual(["a.nss", "c.nss"], sorted(os.path.basename(source) for source in json.load(file)))
+            stats = compile_scripts(source_folder, output_folder, Game.K1, max_workers=1)
+            self.assertEqual((1, 2), (stats.compiled, stats.up_to_date))
+
+    def test_include_digest_is_memoized(self):
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            paths = []
+            for filename, script in (("a.nss", '#include "inc"'), ("b.nss", '#include "inc"'), ("inc.nss", "void f() {}")):
+                paths.append(os.path.join(tmpdirname, filename))
+                with open(paths[-1], "w") as file:
+                    file.write(script)
+
+            graph = _IncludeGraph({})
+            with patch("pykotor.tools.script.hashlib.sha256", wraps=hashlib.sha256) as sha256:
+                graph.digest(paths[0], [tmpdirname], Game.K1, 0)
+                calls = sha256.call_count
+                graph.digest(paths[1], [tmpdirname], Game.K1, 0)
+                self.assertEqual(calls + 2, sha256.call_count)  # the settings hash and b.nss, not inc.nss again
+
     def test_global_int_addition_assignment(self):
         ncs = self.compile(
             """
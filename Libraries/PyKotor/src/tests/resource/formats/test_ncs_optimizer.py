@@ -4,6 +4,7 @@ import os
 import pathlib
 import sys
 import unittest
+from unittest.mock import patch
 
 THIS_SCRIPT_PATH = pathlib.Path(__file__)
 PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[3].resolve()
@@ -20,12 +21,32 @@ if UTILITY_PATH.exists():
         sys.path.remove(working_dir)
     sys.path.insert(0, working_dir)
 
+from pykotor.common.misc import Game
 from pykotor.common.scriptdefs import KOTOR_CONSTANTS, KOTOR_FUNCTIONS
-from pykotor.resource.formats.ncs import NCS
+from pykotor.resource.formats.ncs import NCS, NCSInstruction, NCSInstructionType, bytes_ncs, compile_nss
 from pykotor.resource.formats.ncs.compiler.interpreter import Interpreter
 from pykotor.resource.formats.ncs.compiler.lexer import NssLexer
 from pykotor.resource.formats.ncs.compiler.parser import NssParser
-from pykotor.resource.formats.ncs.optimizers import RemoveNopOptimizer
+from pykotor.resource.formats.ncs.optimizers import (
+    FoldConstantsOptimizer,
+    MergeAdjacentMoveSPOptimizer,
+    NCSPassManager,
+    RemoveJMPToAdjacentOptimizer,
+    RemoveNopOptimizer,
+    RemoveUnusedBlocksOptimizer,
+    ThreadJumpsOptimizer,
+    build_cfg,
+)
+
+# (instructions, bytes) of an empty main() including each script at optimization levels 0, 1 and 2
+LIBRARY_SIZES = {
+    "k_inc_cheat": ((290, 1859), (209, 1373), (3, 23)),
+    "k_inc_debug": ((60, 354), (46, 270), (3, 23)),
+    "k_inc_drop": ((585, 3935), (489, 3359), (8, 49)),
+    "k_inc_endgame": ((112, 622), (93, 508), (3, 23)),
+    "k_inc_lev": ((5333, 32784), (4364, 26970), (31, 187)),
+    "k_inc_switch": ((34, 205), (33, 199), (33, 199)),
+}
 
 
 class TestNCSOptimizers(unittest.TestCase):
@@ -79,6 +100,232 @@ class TestNCSOptimizers(unittest.TestCase):
         self.assertEqual(2, interpreter.action_snapshots[1].arg_values[0])
         self.assertEqual(1, interpreter.action_snapshots[2].arg_values[0])
 
+    def test_jump_links(self):
+        ncs = NCS()
+        nop = ncs.add(NCSInstructionType.NOP)
+        retn = ncs.add(NCSInstructionType.RETN)
+        jmp = ncs.add(NCSInstructionType.JMP, jump=nop, index=0)
+        jz = ncs.add(NCSInstructionType.JZ, jump=nop, index=0)
+        self.assertEqual([jz, jmp], ncs.links_to(nop))
+        self.assertEqual(2, ncs.index(nop))
+
+        jz.jump = retn
+        self.assertEqual([jmp], ncs.links_to(nop))
+        self.assertEqual([jz], ncs.links_to(retn))
+
+        ncs.remove({nop})
+        self.assertEqual([jz, jmp, retn], ncs.instructions)
+        self.assertEqual([jz, jmp], ncs.links_to(retn))
+        self.assertEqual(2, ncs.index(retn))
+        self.assertRaises(ValueError, ncs.index, nop)
+
+        replacement = NCSInstruction(NCSInstructionType.RETN)
+        ncs.instructions[2] = replacement  # replaced in place, the length of the program is unchanged
+        jmp.jump = replacement
+        self.assertEqual(2, ncs.index(replacement))
+        self.assertIn(replacement, ncs)
+        self.assertNotIn(retn, ncs)
+        self.assertEqual([jmp], ncs.links_to(replacement))
+        self.assertEqual([jz], ncs.links_to(retn))
+
+        # the jump to the removed RETN has nothing after it to go to
+        instructions = list(ncs.instructions)
+        self.assertRaises(ValueError, ncs.remove, {replacement})
+        self.assertEqual(instructions, ncs.instructions)
+        self.assertIs(replacement, jmp.jump)
+        ncs.remove({jmp, replacement})
+        self.assertEqual([jz], ncs.instructions)
+
+    def test_merge_adjacent_movsp(self):
+        ncs = NCS()
+        first = ncs.add(NCSInstructionType.MOVSP, args=[-4])
+        ncs.add(NCSInstructionType.MOVSP, args=[-8])
+        target = ncs.add(NCSInstructionType.MOVSP, args=[-4])
+        ncs.add(NCSInstructionType.MOVSP, args=[-4])
+        ncs.add(NCSInstructionType.JMP, jump=target)
+
+        optimizer = MergeAdjacentMoveSPOptimizer()
+        ncs.optimize([optimizer])
+        self.assertEqual([-12, -8], [inst.args[0] for inst in ncs.instructions[:2]])
+        self.assertEqual([first, target], ncs.instructions[:2])
+        self.assertEqual(2, optimizer.instructions_cleared)
+
+    def test_remove_jmp_to_adjacent(self):
+        ncs = NCS()
+        retn = NCSInstructionType.RETN
+        ncs.add(NCSInstructionType.JMP, jump=ncs.add(retn))
+        jmp = ncs.add(NCSInstructionType.JMP, index=0)
+        jsr = ncs.add(NCSInstructionType.JSR, jump=jmp, index=0)
+        jmp.jump = ncs.instructions[2]
+
+        ncs.optimize([RemoveJMPToAdjacentOptimizer()])
+        self.assertEqual([NCSInstructionType.JSR, NCSInstructionType.RETN, NCSInstructionType.JMP], [inst.ins_type for inst in ncs.instructions])
+        self.assertIs(ncs.instructions[1], jsr.jump)
+
+    def test_removed_jumps_are_unlinked(self):
+        ncs = NCS()
+        for _ in range(3):
+            movsp = ncs.add(NCSInstructionType.MOVSP, args=[-4])
+            ncs.add(NCSInstructionType.JMP, jump=movsp, index=len(ncs.instructions) - 1)
+        ncs.add(NCSInstructionType.RETN)
+        jmps = ncs.instructions[0:6:2]
+        movsps = ncs.instructions[1:6:2]
+
+        # a stale link made every links_to() rebuild the index map, see test_optimizer_scaling in the benchmarks
+        ncs.optimize([RemoveJMPToAdjacentOptimizer(), MergeAdjacentMoveSPOptimizer()])
+        self.assertEqual([-12], ncs.instructions[0].args)
+        self.assertTrue(all(jmp.jump is None for jmp in jmps))
+        self.assertEqual([], [link for movsp in movsps for link in movsp.links])
+        self.assertEqual([], ncs.links_to(ncs.instructions[0]))
+
+    def test_remove_unused_blocks(self):
+        ncs = self.compile(
+            """
+            void main()
+            {
+                int value = 3;
+                return;
+                PrintInteger(value);
+            }
+        """
+        )
+        count = len(ncs.instructions)
+
+        optimizer = RemoveUnusedBlocksOptimizer()
+        ncs.optimize([RemoveNopOptimizer(), optimizer])
+        self.assertLess(len(ncs.instructions), count)
+        self.assertNotIn(NCSInstructionType.ACTION, [inst.ins_type for inst in ncs.instructions])
+
+        interpreter = Interpreter(ncs)
+        interpreter.run()
+        self.assertEqual([], interpreter.action_snapshots)
+
+        # an unreachable JMP into the program no longer counts as a link to its target
+        ncs = NCS()
+        retn = ncs.add(NCSInstructionType.RETN)
+        unreachable = ncs.add(NCSInstructionType.JMP, jump=retn)
+        ncs.optimize([RemoveUnusedBlocksOptimizer()])
+        self.assertEqual([retn], ncs.instructions)
+        self.assertIsNone(unreachable.jump)
+        self.assertEqual([], ncs.links_to(retn))
+
+    def test_fold_constants(self):
+        ncs = self.compile(
+            """
+            void main()
+            {
+                int value = 2 + 3 * 4 - -7 / 2 + -7 % 3;
+                float scale = 1.5 * 2.0 / 4.0;
+                int zero = 1 / 0;
+            }
+        """
+        )
+        optimizer = FoldConstantsOptimizer()
+        ncs.optimize([RemoveNopOptimizer(), optimizer])
+
+        constants = [inst.args[0] for inst in ncs.instructions if inst.ins_type in (NCSInstructionType.CONSTI, NCSInstructionType.CONSTF)]
+        self.assertEqual([2 + 3 * 4 + 3 - 1, 0.75, 1, 0], constants)
+        self.assertEqual(1, [inst.ins_type for inst in ncs.instructions].count(NCSInstructionType.DIVII))
+        self.assertEqual(18, optimizer.instructions_cleared)
+
+    def test_fold_float_constants(self):
+        ncs = NCS()
+        ncs.add(NCSInstructionType.CONSTF, args=[1.34])
+        ncs.add(NCSInstructionType.CONSTF, args=[8.47])
+        ncs.add(NCSInstructionType.MULFF)
+        ncs.add(NCSInstructionType.CONSTF, args=[0.1])
+        ncs.add(NCSInstructionType.CONSTF, args=[0.2])
+        ncs.add(NCSInstructionType.ADDFF)
+
+        ncs.optimize([FoldConstantsOptimizer()])
+        # the operands are stored as 32-bit floats, so they are rounded before the operation as they are in the game
+        self.assertEqual([11.349801063537598, 0.30000001192092896], [inst.args[0] for inst in ncs.instructions])
+
+    def test_thread_jumps(self):
+        ncs = NCS()
+        retn = ncs.add(NCSInstructionType.RETN)
+        second = ncs.add(NCSInstructionType.JMP, jump=retn, index=0)
+        first = ncs.add(NCSInstructionType.JMP, jump=second, index=0)
+        jz = ncs.add(NCSInstructionType.JZ, jump=first, index=0)
+        loop = ncs.add(NCSInstructionType.JMP)
+        loop.jump = loop
+
+        ncs.optimize([ThreadJumpsOptimizer()])
+        self.assertIs(retn, jz.jump)
+        self.assertIs(retn, first.jump)
+        self.assertIs(loop, loop.jump)
+        self.assertEqual([[3, 1], [3], [3], [], [4]], [[successor.start for successor in block.successors] for block in build_cfg(ncs)])
+
+    def test_optimization_levels(self):
+        source = """
+            int Triple(int value)
+            {
+                return value * 3;
+            }
+
+            void Unused()
+            {
+                PrintInteger(999);
+            }
+
+            void main()
+            {
+                int total = 4 * 5;
+                int i;
+                for (i = 0; i < 3; i++)
+                {
+                    if (i == 0)
+                    {
+                        total += Triple(i + 1);
+                    }
+                    else if (i == 1)
+                    {
+                        total -= 2;
+                    }
+                    else
+                    {
+                        total *= 2;
+                    }
+                }
+                while (total > 40)
+                {
+                    total -= 7;
+                }
+                PrintInteger(total);
+                DelayCommand(1.0 + 0.5, PrintInteger(total + 1));
+            }
+        """
+        snapshots = []
+        sizes = []
+        for level in (0, 1, 2):
+            ncs = compile_nss(source, Game.K1, optimization_level=level)
+            sizes.append((len(ncs.instructions), len(bytes_ncs(ncs))))
+            interpreter = Interpreter(ncs)
+            interpreter.run()
+            snapshots.append([snap.arg_values[0].value for snap in interpreter.action_snapshots if snap.function_name == "PrintInteger"])
+
+        self.assertEqual([35], snapshots[0])
+        self.assertEqual(snapshots[0], snapshots[1])
+        self.assertEqual(snapshots[0], snapshots[2])
+        self.assertGreater(sizes[0], sizes[1])
+        self.assertGreater(sizes[1], sizes[2])
+
+    def test_no_passes(self):
+        ncs = self.compile("void main() { int value = 2 + 3; }")
+        instructions = list(ncs.instructions)
+        with patch("pykotor.resource.formats.ncs.optimizers._fingerprint") as fingerprint:
+            ncs.optimize([NCSPassManager.for_level(0)])
+        fingerprint.assert_not_called()
+        self.assertEqual(instructions, ncs.instructions)
+
+    def test_library_sizes(self):
+        for name, expected in LIBRARY_SIZES.items():
+            sizes = []
+            for level in (0, 1, 2):
+                ncs = compile_nss(f'#include "{name}"\nvoid main() {{ }}', Game.K1, optimization_level=level)
+                sizes.append((len(ncs.instructions), len(bytes_ncs(ncs))))
+            self.assertEqual(expected, tuple(sizes), name)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,165 @@
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+
+THIS_SCRIPT_PATH = pathlib.Path(__file__)
+PYKOTOR_PATH = THIS_SCRIPT_PATH.parents[3].resolve()
+UTILITY_PATH = THIS_SCRIPT_PATH.parents[5].joinpath("Utility", "src").resolve()
+if PYKOTOR_PATH.exists():
+    working_dir = str(PYKOTOR_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+        os.chdir(PYKOTOR_PATH.parent)
+    sys.path.insert(0, working_dir)
+if UTILITY_PATH.exists():
+    working_dir = str(UTILITY_PATH)
+    if working_dir in sys.path:
+        sys.path.remove(working_dir)
+    sys.path.insert(0, working_dir)
+
+from pykotor.resource.formats.tpc import (
+    TPC,
+    MipmapFilter,
+    TPCBinaryReader,
+    TPCBinaryWriter,
+    TPCTextureFormat,
+    dxt,
+    generate_mipmaps,
+    mipmap,
+    read_tpc,
+    write_tpc,
+)
+from pykotor.resource.type import ResourceType
+from pykotor.tools.texture import convert_textures
+
+
+def gradient(width: int, height: int) -> bytes:
+    data = bytearray()
+    for y in range(height):
+        for x in range(width):
+            data += bytes(((x * 255) // width, (y * 255) // height, ((x + y) * 127) // (width + height), 255 - (x * 255) // width))
+    return bytes(data)
+
+
+class TestTPC(unittest.TestCase):
+    def test_dxt1_block(self):
+        # c0 = pure red, c1 = pure blue, one row per palette index
+        data = bytes((0x00, 0xF8, 0x1F, 0x00, 0x00, 0x55, 0xAA, 0xFF))
+        pixels = dxt.decode_dxt1(data, 4, 4)
+        self.assertEqual(bytes((248, 0, 0, 255)), pixels[0:4])
+        self.assertEqual(bytes((0, 0, 248, 255)), pixels[16:20])
+        self.assertEqual(bytes((165, 0, 82, 255)), pixels[32:36])
+        self.assertEqual(bytes((82, 0, 165, 255)), pixels[48:52])
+        self.assertEqual(pixels[0:3], dxt.decode_dxt1(data, 4, 4, 3)[0:3])
+
+    def test_dxt5_block(self):
+        # alpha0 <= alpha1 selects the six-alpha palette with explicit 0 and 255 entries
+        data = bytes((0, 255, 0x88, 0x2F, 0, 0, 0, 0)) + bytes((0x00, 0xF8, 0x1F, 0x00, 0, 0, 0, 0))
+        pixels = dxt.decode_dxt5(data, 4, 4)
+        self.assertEqual([0, 255, 0, 255, 51, 0], list(pixels[3::4][:6]))
+        self.assertEqual(bytes((248, 0, 0)), pixels[0:3])
+
+    def test_dxt1_solid_block(self):
+        # equal endpoints decode in the three-colour mode, where index 3 is black or transparent
+        for color in ((0, 0, 0), (4, 2, 4), (128, 64, 32), (255, 255, 255)):
+            rgba = bytes((*color, 255)) * 16
+            for encode in (dxt._encode_python, dxt._encode_numpy) if dxt.np is not None else (dxt._encode_python,):
+                data = encode(rgba, 4, 4, dxt5=False)
+                self.assertEqual(data[0:2], data[2:4])
+                self.assertEqual(bytes(4), data[4:8])
+                self.assertEqual(dxt.decode_dxt1(data, 4, 4)[0:4] * 16, dxt.decode_dxt1(data, 4, 4))
+                self.assertEqual(255, dxt.decode_dxt1(data, 4, 4)[3])
+
+    def test_small_mipmap(self):
+        data = dxt.encode_dxt5(gradient(2, 2), 2, 2)
+        self.assertEqual(16, len(data))
+        self.assertEqual(2 * 2 * 4, len(dxt.decode_dxt5(data, 2, 2)))
+        self.assertEqual(1 * 1 * 3, len(dxt.decode_dxt1(dxt.encode_dxt1(gradient(1, 1), 1, 1), 1, 1, 3)))
+
+    def test_convert_to_dxt(self):
+        rgba = gradient(32, 16)
+        tpc = TPC()
+        tpc.set_single(32, 16, rgba, TPCTextureFormat.RGBA)
+
+        for texture_format in (TPCTextureFormat.DXT1, TPCTextureFormat.DXT5):
+            width, height, data = tpc.convert(texture_format)
+            self.assertEqual((32, 16, 32 * 16 // (2 if texture_format == TPCTextureFormat.DXT1 else 1)), (width, height, len(data)))
+
+            compressed = TPC()
+            compressed.set_single(width, height, data, texture_format)
+            written = bytearray()
+            TPCBinaryWriter(compressed, written).write()
+            loaded = TPCBinaryReader(written).load()
+            self.assertEqual(texture_format, loaded.format())
+
+            decoded = loaded.convert(TPCTextureFormat.RGBA).data
+            channels = 4 if texture_format == TPCTextureFormat.DXT5 else 3
+            errors = [abs(a - b) for i, (a, b) in enumerate(zip(rgba, decoded)) if i % 4 < channels]
+            self.assertLessEqual(max(errors), 24)
+
+    def test_read_tga_24bit(self):
+        header = bytes((0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0)) + bytes((2, 0, 1, 0, 24, 0))
+        tpc = read_tpc(header + bytes((1, 2, 3, 4, 5, 6)))
+        self.assertEqual((2, 1), tpc.dimensions())
+        self.assertEqual(bytes((3, 2, 1, 255, 6, 5, 4, 255)), tpc.get().data)
+
+    def test_generate_mipmaps(self):
+        rgba = bytes((10, 20, 30, 40)) * 8 * 4
+        for mipmap_filter in MipmapFilter:
+            chain = generate_mipmaps(rgba, 8, 4, mipmap_filter)
+            self.assertEqual([8 * 4 * 4, 4 * 2 * 4, 2 * 1 * 4, 1 * 1 * 4], [len(data) for data in chain])
+            self.assertEqual(bytes((10, 20, 30, 40)), chain[-1])
+
+        tpc = TPC()
+        tpc.set_single(8, 4, rgba, TPCTextureFormat.RGBA)
+        tpc.set_single(8, 4, tpc.convert(TPCTextureFormat.DXT1).data, TPCTextureFormat.DXT1)
+        tpc.generate_mipmaps()
+        self.assertEqual(4, tpc.mipmap_count())
+        self.assertEqual((1, 1, 8), (*tpc.get(3)[:2], len(tpc.get(3).data)))
+
+    def test_convert_textures(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sources = []
+            for name, alpha in (("opaque", 255), ("transparent", 0)):
+                rgba = bytearray(gradient(16, 8))
+                rgba[3::4] = bytes((255,)) * (16 * 8 - 1) + bytes((alpha,))
+                tpc = TPC()
+                tpc.set_single(16, 8, rgba, TPCTextureFormat.RGBA)
+                sources.append(os.path.join(temp_dir, f"{name}.tga"))
+                write_tpc(tpc, sources[-1], ResourceType.TGA)
+            sources.append(os.path.join(temp_dir, "missing.tga"))
+
+            output_folder = os.path.join(temp_dir, "output")
+            stats = convert_textures(sources, output_folder, max_size=8, max_workers=1)
+            self.assertEqual(2, stats.textures)
+            self.assertEqual(["missing.tga"], [os.path.basename(result.source) for result in stats.failed])
+
+            opaque = read_tpc(os.path.join(output_folder, "opaque.tpc"))
+            transparent = read_tpc(os.path.join(output_folder, "transparent.tpc"))
+            self.assertEqual((TPCTextureFormat.DXT1, (8, 4), 4), (opaque.format(), opaque.dimensions(), opaque.mipmap_count()))
+            self.assertEqual(TPCTextureFormat.DXT5, transparent.format())
+
+    @unittest.skipIf(dxt.np is None, "NumPy is not installed.")
+    def test_backends_match(self):
+        for width, height in ((64, 64), (12, 20), (3, 5)):
+            rgba = bytes(os.urandom(width * height * 4))
+            for dxt5 in (False, True):
+                python_data = dxt._encode_python(rgba, width, height, dxt5=dxt5)
+                self.assertEqual(python_data, dxt._encode_numpy(rgba, width, height, dxt5=dxt5))
+                for channels in (3, 4):
+                    self.assertEqual(
+                        dxt._decode_python(python_data, width, height, channels, dxt5=dxt5),
+                        dxt._decode_numpy(python_data, width, height, channels, dxt5=dxt5),
+                    )
+            image = dxt.np.frombuffer(rgba, dtype=dxt.np.uint8).reshape(height, width, 4)
+            for mipmap_filter in MipmapFilter:
+                self.assertEqual(
+                    bytes(mipmap._downsample_python(rgba, width, height, mipmap_filter)),
+                    mipmap._downsample_numpy(image, mipmap_filter).tobytes(),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -94,6 +94,78 @@ class TestTwoDA(unittest.TestCase):
             self.assertRaises(IsADirectoryError, write_2da, TwoDA(), ".", ResourceType.TwoDA)
         self.assertRaises(ValueError, write_2da, TwoDA(), ".", ResourceType.INVALID)
 
+    def test_binary_write_string_pool(self):
+        twoda = TwoDA(["col1", "col2"])
+        for i in range(1000):
+            twoda.add_row(str(i), {"col1": str(i % 10), "col2": "****"})
+
+        data = bytearray()
+        write_2da(twoda, data, ResourceType.TwoDA)
+        twoda = read_2da(data)
+        self.assertEqual(1000, twoda.get_height())
+        self.assertEqual("7", twoda.get_cell(997, "col1"))
+        self.assertEqual("****", twoda.get_cell(997, "col2"))
+        self.assertTrue(data.endswith(b"\x19\x000\x00****\x001\x002\x003\x004\x005\x006\x007\x008\x009\x00"))
+
+    def test_binary_write_overflow(self):
+        twoda = TwoDA(["col1"])
+        for i in range(7000):
+            twoda.add_row(str(i), {"col1": f"value{i:04d}"})
+        self.assertRaises(ValueError, write_2da, twoda, bytearray(), ResourceType.TwoDA)
+
+    def test_find_row(self):
+        twoda = TwoDA(["col1"])
+        twoda.add_row("a", {"col1": "1"})
+        twoda.add_row("b", {"col1": "2"})
+        twoda.add_row("a", {"col1": "3"})
+
+        self.assertEqual("1", twoda.find_row("a").get_string("col1"))
+        self.assertEqual("2", twoda.find_row("b").get_string("col1"))
+        self.assertIsNone(twoda.find_row("c"))
+
+        twoda.set_label(0, "c")
+        self.assertEqual("3", twoda.find_row("a").get_string("col1"))
+        self.assertEqual("1", twoda.find_row("c").get_string("col1"))
+
+        twoda.resize(1)
+        self.assertIsNone(twoda.find_row("a"))
+        self.assertEqual(["c"], twoda.get_labels())
+
+    def test_row_view(self):
+        twoda = TwoDA(["col1"])
+        twoda.add_row("0", {"col1": "abc"})
+        row = twoda.get_row(0)
+
+        row.set_string("col1", "def")
+        self.assertEqual("def", twoda.get_cell(0, "col1"))
+        twoda.add_column("col2")
+        twoda.set_cell(0, "col2", 5)
+        self.assertEqual(5, row.get_integer("col2"))
+        self.assertEqual(0, twoda.row_index(row))
+        self.assertRaises(KeyError, row.get_string, "col3")
+
+    def test_filter_rows(self):
+        twoda = TwoDA(["label", "value"])
+        for i in range(10):
+            twoda.add_row(str(i), {"label": f"label{i % 3}", "value": i})
+
+        self.assertEqual(["0", "3", "6", "9"], [row.label() for row in twoda.filter_rows("label", "label0")])
+        self.assertEqual(["4"], [row.label() for row in twoda.filter_rows("value", 4)])
+        self.assertEqual([], twoda.filter_rows("value", "10"))
+        self.assertRaises(KeyError, twoda.filter_rows, "missing", "")
+        self.assertEqual(10, twoda.column_max("value"))
+
+    def test_load_columns(self):
+        twoda = TwoDA(["col1", "col2"])
+        twoda.add_row("0", {"col1": "a", "col2": "b"})
+        twoda.load_columns(["1", "2"], {"col1": ["c", "d"], "unknown": ["e", "f"]})
+
+        self.assertEqual(3, twoda.get_height())
+        self.assertEqual(["a", "c", "d"], twoda.get_column("col1"))
+        self.assertEqual(["b", "", ""], twoda.get_column("col2"))
+        self.assertEqual("d", twoda.find_row("2").get_string("col1"))
+        self.assertRaises(ValueError, twoda.load_columns, ["3"], {"col1": ["g", "h"]})
+
     def test_row_max(self):
         twoda = TwoDA()
         twoda.add_row("0")
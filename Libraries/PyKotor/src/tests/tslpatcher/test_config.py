@@ -1,6 +1,7 @@
 import os
 import pathlib
 import sys
+import tempfile
 import unittest
 from unittest.mock import MagicMock, Mock, patch
 
@@ -20,6 +21,9 @@ if UTILITY_PATH.exists():
     sys.path.insert(0, working_dir)
 
 from pykotor.extract.capsule import Capsule
+from pykotor.resource.type import ResourceType
+from pykotor.tslpatcher.logger import PatchLogger
+from pykotor.tslpatcher.memory import PatcherMemory
 from pykotor.tslpatcher.patcher import ModInstaller
 from utility.path import Path
 
@@ -33,9 +37,11 @@ class TestLookupResourceFunction(unittest.TestCase):
         self.config = ModInstaller("", "", "")
         self.config.mod_path = Path("test_mod_path")
         self.output_container_path = Path("test_output_container_path")
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.capsule_path = os.path.join(self.temp_dir.name, "test.mod")
 
     def tearDown(self):
-        pass
+        self.temp_dir.cleanup()
 
     def test_lookup_resource_replace_file_true(self):
         # Arrange
@@ -58,7 +64,7 @@ class TestLookupResourceFunction(unittest.TestCase):
         mock_binary_reader = MagicMock()
         mock_binary_reader.read_all.return_value = "BinaryReader read_all result"
         
-        capsule = Capsule("test.mod", create_nonexisting=True)
+        capsule = Capsule(self.capsule_path, create_nonexisting=True)
         with patch("pykotor.common.stream.BinaryReader.from_auto", return_value=mock_binary_reader):
             result = self.config.lookup_resource(
                 self.patch,
@@ -106,7 +112,7 @@ class TestLookupResourceFunction(unittest.TestCase):
         mock_binary_reader = MagicMock()
         mock_binary_reader.read_all.return_value = "BinaryReader read_all result"
         
-        capsule = Capsule("test.mod", create_nonexisting=True)
+        capsule = Capsule(self.capsule_path, create_nonexisting=True)
         with patch("pykotor.common.stream.BinaryReader.from_auto", return_value=mock_binary_reader):
             result = self.config.lookup_resource(
                 self.patch,
@@ -129,7 +135,7 @@ class TestLookupResourceFunction(unittest.TestCase):
     def test_lookup_resource_capsule_exists_true_no_file(self):
         # Arrange
         self.patch.replace_file = False
-        capsule = Capsule("test.mod", create_nonexisting=True)
+        capsule = Capsule(self.capsule_path, create_nonexisting=True)
 
         with patch("pykotor.extract.capsule.Capsule.resource") as mock_resource:
             mock_resource.side_effect = FileNotFoundError
@@ -304,5 +310,36 @@ class TestShouldPatchFunction(unittest.TestCase):
         self.assertTrue(result)
 
 
+class TestCommitCapsules(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.patcher = ModInstaller("", self.temp_dir.name, "", PatchLogger())
+        self.capsule = Capsule(os.path.join(self.temp_dir.name, "test.mod"), create_nonexisting=True)
+        self.patcher.handle_capsule_and_backup = lambda _, path: (False, self.patcher._capsules.setdefault(str(path), self.capsule))
+        self.patcher.should_patch = MagicMock(return_value=True)
+        self.patcher.lookup_resource = MagicMock(return_value=b"data")
+        self.patcher.handle_override_type = MagicMock()
+        self.patches = [MagicMock(destination="test.mod", saveas=f"file{i}.utc") for i in range(3)]
+        for patch_mock in self.patches:
+            patch_mock.patch_resource.return_value = b"patched"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_completed_after_commit(self):
+        self.patcher._apply_patches(self.patches, PatcherMemory())
+        self.assertEqual(0, self.patcher.log.patches_completed)
+        self.patcher.commit_capsules()
+        self.assertEqual(3, self.patcher.log.patches_completed)
+        self.assertEqual(b"patched", Capsule(self.capsule.path()).resource("file2", ResourceType.UTC))
+
+    def test_failed_commit(self):
+        self.patcher._apply_patches(self.patches, PatcherMemory())
+        with patch.object(self.capsule, "commit", side_effect=OSError("disk full")):
+            self.patcher.commit_capsules()
+        self.assertEqual(0, self.patcher.log.patches_completed)
+        self.assertEqual(1, len(self.patcher.log.errors))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,7 @@ import shutil
 from datetime import datetime
 from tkinter import messagebox
 
+from pykotor.common.stream import MAPPED_FILES
 from pykotor.tslpatcher.logger import PatchLogger
 from utility.error_handling import universal_simplify_exception
 from utility.path import Path
@@ -119,6 +120,7 @@ class ModUninstaller:
 
         Processing Logic:
         ----------------
+            - Drop every map of the shared MAPPED_FILES pool
             - Remove any existing files not in the backup
             - Copy each file from the backup folder to the destination restoring the file structure
             - Log each file operation
@@ -127,6 +129,8 @@ class ModUninstaller:
         --------
             restore_backup(Path('backup'), {'file1.txt', 'file2.txt'}, [Path('backup/file1.txt'), Path('backup/file2.txt')])
         """
+        # Files read through views of the shared map pool are unmapped first, as Windows cannot delete or overwrite them
+        MAPPED_FILES.release()
         for file in existing_files:
             file_path = Path.pathify(file)
             rel_filepath = file_path.relative_to(self.game_path)  # type: ignore[attr-defined]